@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Adaptive Request Rate (AIMD)
+Finds the highest request rate Yahoo tolerates instead of relying on a hand-tuned delay
+- Additive increase: every healthy response nudges the rate up a little
+- Multiplicative decrease: a 429, 5xx or empty frame cuts the rate (at most once per cooldown)
+- The learned rate is saved to disk so a restart doesn't have to re-learn it
+"""
+
+import os
+import json
+import time
+import threading
+import logging
+from typing import Optional, Dict, Any
+
+from request_scheduler import get_request_scheduler
+
+logger = logging.getLogger(__name__)
+
+# Markers of throttling/server trouble in exception text (yfinance doesn't always expose the status)
+THROTTLE_MARKERS = ("429", "too many requests", "rate limit", "500", "502", "503", "504")
+
+def is_throttle_error(error: Exception) -> bool:
+    """True if an exception looks like a 429 or 5xx from Yahoo"""
+    response = getattr(error, "response", None)
+    status = getattr(response, "status_code", None)
+    if status is not None:
+        return status == 429 or status >= 500
+    
+    message = str(error).lower()
+    return any(marker in message for marker in THROTTLE_MARKERS)
+
+class AdaptiveRateController:
+    """AIMD controller that drives a RequestScheduler's refill rate"""
+
+    def __init__(self, scheduler, min_rate: float = 0.1, max_rate: float = 2.0,
+                 increase_step: float = 0.01, decrease_factor: float = 0.5,
+                 cooldown: float = 10.0, state_file: Optional[str] = None,
+                 save_interval: float = 60.0):
+        self.scheduler = scheduler
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step      # req/s added per healthy response
+        self.decrease_factor = decrease_factor  # Rate multiplier on throttling
+        self.cooldown = cooldown                # Seconds between cuts (one burst of 429s = one cut)
+        self.state_file = state_file
+        self.save_interval = save_interval
+        
+        self._lock = threading.Lock()
+        self._last_cut = 0.0
+        self._last_save = 0.0
+        
+        self.increases = 0
+        self.decreases = 0
+        self.last_throttle_reason = None
+        
+        self.rate = self._clamp(self._load_rate() or scheduler.rate)
+        self.scheduler.set_rate(self.rate)
+        
+        logger.info(f"✅ Adaptive rate initialized ({self.rate:.3f} req/s, range {min_rate}-{max_rate})")
+
+    def _clamp(self, rate: float) -> float:
+        """Keep a rate within the configured bounds"""
+        return max(self.min_rate, min(self.max_rate, rate))
+
+    def _load_rate(self) -> Optional[float]:
+        """Rate learned by a previous run, if saved"""
+        if not self.state_file or not os.path.exists(self.state_file):
+            return None
+        
+        try:
+            with open(self.state_file, 'r') as f:
+                state = json.load(f)
+            rate = float(state["rate"])
+            logger.info(f"📂 Restored adaptive rate {rate:.3f} req/s from {self.state_file}")
+            return rate
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read adaptive rate state {self.state_file}: {e}")
+            return None
+
+    def _save(self, force: bool = False):
+        """Persist the current rate (throttled unless forced; caller holds the lock)"""
+        if not self.state_file:
+            return
+        
+        now = time.time()
+        if not force and now - self._last_save < self.save_interval:
+            return
+        
+        state = {
+            "rate": self.rate,
+            "updated_at": now,
+            "last_throttle_reason": self.last_throttle_reason
+        }
+        try:
+            tmp_path = f"{self.state_file}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(state, f, indent=2)
+            os.replace(tmp_path, self.state_file)
+            self._last_save = now
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save adaptive rate state {self.state_file}: {e}")
+
+    def record_success(self):
+        """A healthy response: raise the rate additively"""
+        with self._lock:
+            new_rate = self._clamp(self.rate + self.increase_step)
+            if new_rate == self.rate:
+                return
+            self.rate = new_rate
+            self.increases += 1
+            self.scheduler.set_rate(new_rate)
+            self._save()
+
+    def record_throttle(self, reason: str):
+        """A 429/5xx or empty frame: cut the rate multiplicatively"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_cut < self.cooldown:
+                return  # Same throttling episode, already cut
+            
+            old_rate = self.rate
+            self.rate = self._clamp(self.rate * self.decrease_factor)
+            self._last_cut = now
+            self.decreases += 1
+            self.last_throttle_reason = reason
+            self.scheduler.set_rate(self.rate)
+            self._save(force=True)
+        
+        logger.warning(f"🐢 Throttled ({reason}): request rate {old_rate:.3f} -> {self.rate:.3f} req/s")
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current rate and adjustment counters for monitoring"""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 4),
+                "min_rate": self.min_rate,
+                "max_rate": self.max_rate,
+                "increases": self.increases,
+                "decreases": self.decreases,
+                "last_throttle_reason": self.last_throttle_reason
+            }
+
+_shared_controller = None
+_shared_controller_lock = threading.Lock()
+
+def get_rate_controller() -> AdaptiveRateController:
+    """Process-wide controller for the shared request scheduler (bounds/state file from env vars)"""
+    global _shared_controller
+    with _shared_controller_lock:
+        if _shared_controller is None:
+            _shared_controller = AdaptiveRateController(
+                get_request_scheduler(),
+                min_rate=float(os.getenv("YAHOO_MIN_REQUESTS_PER_SECOND", "0.1")),
+                max_rate=float(os.getenv("YAHOO_MAX_REQUESTS_PER_SECOND", "2.0")),
+                state_file=os.getenv("ADAPTIVE_RATE_STATE", "adaptive_rate_state.json")
+            )
+        return _shared_controller
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+Per-Symbol Analysis Cache
+Keeps the bar-dependent part of a symbol's analysis (zones, ATR, momentum, zone strengths)
+keyed by (symbol, last closed bar)
+- Scans run more often than bars close (15-minute scans on 1-hour bars), so most
+  scans only need the cheap current-price-versus-zone check
+- An entry is current until the next bar of its interval closes; the scan can tell
+  that from the clock without downloading anything
+- Hit/miss counters are logged by the scan loop
+"""
+
+import time
+import threading
+import logging
+from typing import Optional, Dict, Any, List, Union
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars, epoch_ns
+
+logger = logging.getLogger(__name__)
+
+# Bar length per interval
+INTERVAL_SECONDS = {
+    "1m": 60,
+    "2m": 120,
+    "5m": 300,
+    "15m": 900,
+    "30m": 1800,
+    "60m": 3600,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+def last_closed_bar(df: Union[Bars, pd.DataFrame], interval: str, now: Optional[float] = None) -> Optional[pd.Timestamp]:
+    """
+    Timestamp of the newest bar whose period has ended (bar start + interval <= now)
+    Yahoo returns the still-forming bar (and sometimes a live tick row) last;
+    those are skipped. Naive timestamps are taken as UTC (Bars give UTC timestamps).
+    """
+    if df is None or df.empty:
+        return None
+    
+    now = time.time() if now is None else now
+    cutoff_ns = int((now - INTERVAL_SECONDS[interval]) * 1_000_000_000)
+    position = int(np.searchsorted(epoch_ns(df), cutoff_ns, side="right")) - 1
+    if position < 0:
+        return None
+    return df.timestamp(position) if isinstance(df, Bars) else df.index[position]
+
+class SymbolAnalysis:
+    """Bar-dependent analysis of one symbol, valid until its next bar closes"""
+
+    def __init__(self, symbol: str, last_closed: pd.Timestamp, zones: List[Dict[str, Any]],
+                 zone_index, scores: Optional[Dict[str, Any]] = None):
+        self.symbol = symbol
+        self.last_closed = last_closed
+        self.zones = zones
+        self.zone_index = zone_index  # SymbolZoneIndex for the price check
+        self.scores = scores          # Optimizer bar scores (ATR, momentum, zone strengths)
+        self.created_at = time.time()
+
+class AnalysisCache:
+    """Thread-safe per-symbol analyses keyed by the last closed bar"""
+
+    def __init__(self, interval: str = "1h"):
+        self.interval = interval
+        self.bar_seconds = INTERVAL_SECONDS[interval]
+        self._entries: Dict[str, SymbolAnalysis] = {}
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+
+    def expected_last_closed(self, now: Optional[float] = None) -> float:
+        """Start (epoch seconds) of the newest bar that has closed by now, for aligned bars"""
+        now = time.time() if now is None else now
+        return (now // self.bar_seconds) * self.bar_seconds - self.bar_seconds
+
+    def _is_current(self, entry: SymbolAnalysis, last_closed: Optional[pd.Timestamp], now: Optional[float]) -> bool:
+        if last_closed is None:
+            return entry.last_closed.timestamp() >= self.expected_last_closed(now)
+        return entry.last_closed == last_closed
+
+    def is_current(self, symbol: str, now: Optional[float] = None) -> bool:
+        """True if no bar has closed since the symbol was analysed (no download needed)"""
+        with self._lock:
+            entry = self._entries.get(symbol)
+        return entry is not None and self._is_current(entry, None, now)
+
+    def get(self, symbol: str, last_closed: Optional[pd.Timestamp] = None,
+            now: Optional[float] = None) -> Optional[SymbolAnalysis]:
+        """
+        Cached analysis for the symbol's last closed bar, or None
+        Without last_closed the clock decides (see is_current). A None result
+        isn't counted; the caller counts a miss when it stores a fresh analysis.
+        """
+        with self._lock:
+            entry = self._entries.get(symbol)
+        if entry is None or not self._is_current(entry, last_closed, now):
+            return None
+        
+        with self._lock:
+            self.hits += 1
+        return entry
+
+    def put(self, analysis: SymbolAnalysis) -> SymbolAnalysis:
+        """Store a freshly computed analysis (counts as a miss)"""
+        with self._lock:
+            self._entries[analysis.symbol] = analysis
+            self.misses += 1
+        return analysis
+
+    def invalidate(self, symbol: str):
+        with self._lock:
+            self._entries.pop(symbol, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "symbols": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+    def log_stats(self):
+        stats = self.get_stats()
+        logger.info(f"🧠 Analysis cache: {stats['hits']} hits, {stats['misses']} misses "
+                    f"(hit rate {stats['hit_rate']:.0%}, {stats['symbols']} symbols)")
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Session-Aware Bar Resampler
+Derives higher timeframes (5m/15m/1h/4h/1d) locally from one fine-grained download
+- Intraday bins are anchored at the session open (US 1h bars start 09:30, not 09:00)
+- Daily bars follow the trading day: exchange date for stocks, 17:00 New York roll for forex
+- Binning is done on exchange wall-clock time, so DST changes don't shift the bins
+"""
+
+import logging
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Exchange timezone and session open used to anchor bins
+SESSIONS = {
+    "US": {"tz": "America/New_York", "open": pd.Timedelta(hours=9, minutes=30)},
+    "UK": {"tz": "Europe/London", "open": pd.Timedelta(hours=8)},
+    # 24h markets: the trading day (and the week, on Sunday) opens at 17:00 New York
+    "FOREX": {"tz": "America/New_York", "open": pd.Timedelta(hours=17)},
+}
+
+# Bar length for each supported target interval
+INTERVAL_LENGTHS = {
+    "1m": pd.Timedelta(minutes=1),
+    "2m": pd.Timedelta(minutes=2),
+    "5m": pd.Timedelta(minutes=5),
+    "15m": pd.Timedelta(minutes=15),
+    "30m": pd.Timedelta(minutes=30),
+    "60m": pd.Timedelta(hours=1),
+    "1h": pd.Timedelta(hours=1),
+    "4h": pd.Timedelta(hours=4),
+    "1d": pd.Timedelta(days=1),
+}
+
+# How each OHLCV column combines into a coarser bar
+AGGREGATION = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+
+FOREX_COMMODITY_SYMBOLS = ("GOLD", "SILVER", "OIL", "BITCOIN", "ETHEREUM")
+
+def session_for_symbol(symbol: str) -> str:
+    """Pick the session calendar for a symbol (London listings, forex/24h markets, else US)"""
+    if symbol.endswith(".L"):
+        return "UK"
+    if "/" in symbol or symbol.endswith("=X") or symbol.endswith("=F") or symbol in FOREX_COMMODITY_SYMBOLS:
+        return "FOREX"
+    return "US"
+
+def _bin_labels(wall: pd.DatetimeIndex, interval: str, session: str) -> pd.DatetimeIndex:
+    """Wall-clock start of the target bar each source bar belongs to"""
+    length = INTERVAL_LENGTHS[interval]
+    session_open = SESSIONS[session]["open"]
+    
+    if interval == "1d":
+        if session == "FOREX":
+            # Bars from 17:00 onwards belong to the next trading day (Sunday evening -> Monday)
+            return (wall + (pd.Timedelta(days=1) - session_open)).normalize()
+        return wall.normalize()
+    
+    # Most recent session open at or before each bar, then whole bar lengths from there
+    anchor = (wall - session_open).normalize() + session_open
+    elapsed = (wall - anchor).asi8 // length.value
+    return anchor + pd.to_timedelta(elapsed * length.value, unit="ns")
+
+def resample_bars(bars: pd.DataFrame, interval: str, session: str = "US") -> Optional[pd.DataFrame]:
+    """
+    Aggregate OHLCV bars into a coarser interval aligned to the session
+    The result keeps the input's timezone; the last bar may still be forming.
+    """
+    if bars is None or bars.empty:
+        return bars
+    if interval not in INTERVAL_LENGTHS:
+        raise ValueError(f"Unsupported resample interval: {interval}")
+    if session not in SESSIONS:
+        raise ValueError(f"Unknown session: {session}")
+    
+    index = bars.index
+    source_tz = index.tz
+    if source_tz is None:
+        index = index.tz_localize("UTC")
+    
+    session_tz = SESSIONS[session]["tz"]
+    wall = index.tz_convert(session_tz).tz_localize(None).as_unit("ns")
+    labels = _bin_labels(wall, interval, session)
+    
+    columns = {column: how for column, how in AGGREGATION.items() if column in bars.columns}
+    frame = bars[list(columns)]
+    resampled = frame.groupby(labels, sort=True).agg(columns)
+    
+    # Rebuild a timezone-aware index from the wall-clock labels
+    result_index = pd.DatetimeIndex(resampled.index).tz_localize(
+        session_tz,
+        ambiguous=np.zeros(len(resampled), dtype=bool),
+        nonexistent="shift_forward"
+    )
+    resampled.index = result_index.tz_convert(source_tz or "UTC")
+    if source_tz is None:
+        resampled.index = resampled.index.tz_localize(None)
+    
+    return resampled.dropna(subset=["Close"]) if "Close" in resampled else resampled
+
+def resample_timeframes(bars: pd.DataFrame, intervals: Iterable[str], session: str = "US") -> Dict[str, pd.DataFrame]:
+    """Derive several timeframes from the same source bars"""
+    frames = {}
+    for interval in intervals:
+        resampled = resample_bars(bars, interval, session)
+        if resampled is not None and not resampled.empty:
+            frames[interval] = resampled
+    return frames
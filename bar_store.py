@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Persistent OHLCV Bar Store
+Keeps downloaded candles on disk so fetchers only request bars they don't have yet
+- One columnar .npz file per symbol and interval
+- Rows indexed by epoch nanoseconds (UTC), exchange timezone kept alongside
+"""
+
+import os
+import re
+import threading
+import logging
+from pathlib import Path
+from datetime import timedelta
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Columns persisted for every bar (yfinance extras like Dividends are dropped)
+BAR_COLUMNS = ("Open", "High", "Low", "Close", "Volume")
+
+# How far back Yahoo serves each intraday interval (days); None = no limit
+INTERVAL_LOOKBACK_DAYS = {
+    "1m": 7,
+    "2m": 60,
+    "5m": 60,
+    "15m": 60,
+    "30m": 60,
+    "60m": 730,
+    "90m": 60,
+    "1h": 730,
+    "1d": None,
+    "5d": None,
+    "1wk": None,
+    "1mo": None,
+}
+
+# Allowed gap at the start of a stored window (weekends, holidays, first-bar alignment)
+COVERAGE_SLACK_DAYS = 4
+
+_PERIOD_RE = re.compile(r"^(\d+)(d|wk|mo|y)$")
+
+def parse_period(period: str):
+    """Split a yfinance period like '5d' or '1mo' into (count, unit), or None if unsupported"""
+    match = _PERIOD_RE.match(period or "")
+    if not match:
+        return None
+    return int(match.group(1)), match.group(2)
+
+def _calendar_offset(count: int, unit: str) -> pd.DateOffset:
+    """Calendar offset for the 'wk', 'mo' and 'y' period units"""
+    return {
+        "wk": pd.DateOffset(weeks=count),
+        "mo": pd.DateOffset(months=count),
+        "y": pd.DateOffset(years=count),
+    }[unit]
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Trim stored bars to what a fresh yfinance download of `period` would return
+    - 'Nd' periods keep the last N trading dates (so '1d' is today's session)
+    - 'Nwk', 'Nmo', 'Ny' keep a calendar window ending at the last bar
+    """
+    if df is None or df.empty:
+        return df
+    
+    parsed = parse_period(period)
+    if parsed is None:
+        return df
+    
+    count, unit = parsed
+    if unit == "d":
+        dates = df.index.normalize()
+        unique_dates = dates.unique()
+        if len(unique_dates) <= count:
+            return df
+        return df[dates >= unique_dates[-count]]
+    
+    start = df.index[-1] - _calendar_offset(count, unit)
+    return df[df.index > start]
+
+class BarStore:
+    """On-disk OHLCV bar store with append-only incremental updates"""
+
+    def __init__(self, directory: Optional[str] = None, max_bars: int = 20000):
+        self.directory = Path(directory or os.getenv("BAR_STORE_DIR", "bar_store"))
+        self.max_bars = max_bars  # Per symbol/interval retention cap
+        self._lock = threading.Lock()
+        
+        self.directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"✅ Bar Store initialized ({self.directory})")
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        """File holding one symbol/interval series"""
+        safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        return self.directory / f"{safe_symbol}__{interval}.npz"
+
+    def load(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """Load all stored bars for a symbol/interval, or None if nothing is stored"""
+        path = self._path(symbol, interval)
+        if not path.exists():
+            return None
+        
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                epoch = data["epoch"]
+                columns = {column: data[column] for column in BAR_COLUMNS}
+                tz = str(data["tz"])
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read bar store file {path}: {e}")
+            return None
+        
+        if len(epoch) == 0:
+            return None
+        
+        index = pd.to_datetime(epoch, utc=True)
+        if tz and tz != "None":
+            index = index.tz_convert(tz)
+        return pd.DataFrame(columns, index=index)
+
+    def last_timestamp(self, symbol: str, interval: str) -> Optional[pd.Timestamp]:
+        """Timestamp of the newest stored bar"""
+        stored = self.load(symbol, interval)
+        if stored is None:
+            return None
+        return stored.index[-1]
+
+    def append(self, symbol: str, interval: str, bars: pd.DataFrame) -> Optional[pd.DataFrame]:
+        """
+        Merge newly downloaded bars into the store and return the full series
+        Bars that already exist are replaced, so a re-downloaded (still forming)
+        last candle overwrites the stale copy.
+        """
+        with self._lock:
+            stored = self.load(symbol, interval)
+            if bars is None or bars.empty:
+                return stored
+            
+            new_bars = bars.reindex(columns=list(BAR_COLUMNS)).astype("float64")
+            if stored is not None:
+                if new_bars.index.tz is not None and stored.index.tz is not None:
+                    new_bars.index = new_bars.index.tz_convert(stored.index.tz)
+                merged = pd.concat([stored, new_bars])
+            else:
+                merged = new_bars
+            
+            merged = merged[~merged.index.duplicated(keep="last")].sort_index()
+            if len(merged) > self.max_bars:
+                merged = merged.iloc[-self.max_bars:]
+            
+            self._save(symbol, interval, merged)
+            return merged
+
+    def _save(self, symbol: str, interval: str, df: pd.DataFrame):
+        """Write a series atomically so a crash never leaves a half-written file"""
+        path = self._path(symbol, interval)
+        tmp_path = path.with_suffix(".tmp")
+        
+        index = df.index
+        tz = str(index.tz) if index.tz is not None else "None"
+        if index.tz is None:
+            index = index.tz_localize("UTC")
+        
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(
+                    f,
+                    epoch=index.tz_convert("UTC").as_unit("ns").asi8,
+                    tz=np.array(tz),
+                    **{column: df[column].to_numpy(dtype="float64") for column in BAR_COLUMNS}
+                )
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.error(f"❌ Error saving bar store file {path}: {e}")
+
+    def covers(self, stored: Optional[pd.DataFrame], period: str, interval: str) -> bool:
+        """
+        Check if stored bars can serve `period` with only an incremental top-up
+        The store must reach back far enough, and its newest bar must still be
+        inside the window Yahoo serves for this interval.
+        """
+        if stored is None or stored.empty:
+            return False
+        
+        parsed = parse_period(period)
+        if parsed is None or interval not in INTERVAL_LOOKBACK_DAYS:
+            return False
+        
+        now = pd.Timestamp.now(tz="UTC")
+        first_bar = stored.index[0]
+        last_bar = stored.index[-1]
+        if first_bar.tzinfo is None:
+            first_bar = first_bar.tz_localize("UTC")
+            last_bar = last_bar.tz_localize("UTC")
+        
+        count, unit = parsed
+        if unit == "d":
+            # Day periods count trading dates, so weekends and holidays don't matter
+            if len(stored.index.normalize().unique()) < count:
+                return False
+        elif first_bar > now - _calendar_offset(count, unit) + timedelta(days=COVERAGE_SLACK_DAYS):
+            return False
+        
+        lookback_days = INTERVAL_LOOKBACK_DAYS[interval]
+        if lookback_days is not None and last_bar < now - timedelta(days=lookback_days - 1):
+            return False
+        
+        return True
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Compact OHLCV Bars
+Slim read-only bar container for the analysis hot path
+- One contiguous [field, bar] array (float64, or float32 to halve memory) plus an
+  int64 epoch-nanosecond (UTC) index; yfinance extras like Dividends are dropped
+- Built once by the fetcher; every field, tail() and until() is a view, so
+  analysis functions read it without allocating Series or copying bars
+- field()/epoch_ns() accept a Bars or a DataFrame, so callers can pass either
+"""
+
+from typing import Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+FIELDS = ("Open", "High", "Low", "Close", "Volume")
+
+# Nanoseconds per tick of a DatetimeIndex unit
+UNIT_NANOSECONDS = {"s": 1_000_000_000, "ms": 1_000_000, "us": 1_000, "ns": 1}
+
+class Bars:
+    """Read-only OHLCV bars: values[field, bar] and epoch[bar] (ns since 1970, UTC)"""
+    
+    __slots__ = ("epoch", "values", "fields", "tz", "_positions")
+
+    def __init__(self, epoch: np.ndarray, values: np.ndarray, fields: Sequence[str] = FIELDS,
+                 tz: Optional[str] = None):
+        self.epoch = epoch
+        self.values = values
+        self.fields = tuple(fields)
+        self.tz = tz  # Exchange timezone, only used when converting back to a frame
+        self._positions = {name: i for i, name in enumerate(self.fields)}
+        
+        self.epoch.flags.writeable = False
+        self.values.flags.writeable = False
+
+    @classmethod
+    def from_frame(cls, df: Optional[pd.DataFrame], dtype="float64") -> "Bars":
+        """
+        Copy the OHLCV columns of a frame into one compact block (missing columns are NaN)
+        Naive timestamps are taken as UTC; the frame itself can be dropped afterwards.
+        """
+        if df is None or df.empty:
+            return cls(np.array([], dtype="int64"), np.empty((len(FIELDS), 0), dtype=dtype))
+        
+        index = pd.DatetimeIndex(df.index)
+        values = np.full((len(FIELDS), len(df)), np.nan, dtype=dtype)
+        for i, name in enumerate(FIELDS):
+            if name in df:
+                values[i] = df[name].to_numpy(dtype=dtype)
+        return cls(index.asi8 * UNIT_NANOSECONDS[index.unit], values,
+                   tz=str(index.tz) if index.tz is not None else None)
+
+    @property
+    def empty(self) -> bool:
+        return len(self.epoch) == 0
+
+    def __len__(self) -> int:
+        return len(self.epoch)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """One field as a read-only view"""
+        return self.values[self._positions[name]]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._positions
+
+    @property
+    def open(self) -> np.ndarray:
+        return self.values[0]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self.values[1]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self.values[2]
+
+    @property
+    def close(self) -> np.ndarray:
+        return self.values[3]
+
+    @property
+    def volume(self) -> np.ndarray:
+        return self.values[4]
+
+    @property
+    def nbytes(self) -> int:
+        return self.epoch.nbytes + self.values.nbytes
+
+    def _slice(self, start: int, stop: int) -> "Bars":
+        return Bars(self.epoch[start:stop], self.values[:, start:stop], self.fields, self.tz)
+
+    def tail(self, n: int) -> "Bars":
+        """Last n bars (view)"""
+        return self._slice(max(len(self) - n, 0), len(self))
+
+    def until(self, timestamp) -> "Bars":
+        """Bars up to and including `timestamp` (view); naive timestamps are taken as UTC"""
+        stop = int(np.searchsorted(self.epoch, to_epoch_ns(timestamp), side="right"))
+        return self._slice(0, stop)
+
+    def timestamp(self, position: int) -> pd.Timestamp:
+        """Bar time at a position as a UTC Timestamp"""
+        return pd.Timestamp(int(self.epoch[position]), unit="ns", tz="UTC")
+
+    @property
+    def index(self) -> pd.DatetimeIndex:
+        """Bar times as a DatetimeIndex in the original timezone (allocates, avoid in hot loops)"""
+        index = pd.DatetimeIndex(pd.to_datetime(self.epoch, unit="ns", utc=True))
+        return index.tz_convert(self.tz) if self.tz else index
+
+    def to_frame(self) -> pd.DataFrame:
+        """Back to a pandas frame (copies)"""
+        return pd.DataFrame(self.values.T.copy(), index=self.index, columns=list(self.fields))
+
+def to_epoch_ns(timestamp) -> int:
+    """Epoch nanoseconds of a timestamp; naive timestamps are taken as UTC"""
+    timestamp = pd.Timestamp(timestamp)
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.tz_localize("UTC")
+    return int(timestamp.value)
+
+def as_bars(data: Union["Bars", pd.DataFrame, None], dtype="float64") -> "Bars":
+    """A Bars as-is, or a frame converted once"""
+    return data if isinstance(data, Bars) else Bars.from_frame(data, dtype=dtype)
+
+def field(data: Union["Bars", pd.DataFrame], name: str) -> np.ndarray:
+    """One OHLCV field of a Bars or DataFrame as a float64 array (no copy when already float64)"""
+    if isinstance(data, Bars):
+        return np.asarray(data[name], dtype="float64")
+    return data[name].to_numpy(dtype="float64")
+
+def epoch_ns(data: Union["Bars", pd.DataFrame]) -> np.ndarray:
+    """Bar times of a Bars or DataFrame as int64 epoch nanoseconds (UTC)"""
+    if isinstance(data, Bars):
+        return data.epoch
+    index = pd.DatetimeIndex(data.index)
+    return index.asi8 * UNIT_NANOSECONDS[index.unit]
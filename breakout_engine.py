@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+Cross-Sectional Breakout Engine
+Opening ranges for the whole ORB universe held in NumPy arrays and checked against
+every symbol's latest price in one pass, instead of one symbol at a time
+- LONG/SHORT crossings of ORH/ORL for the whole price vector at once
+- Volume surge: the current 5-minute volume against the session's last 20 bars
+- Bias alignment: the 15-minute close against its 20 EMA, in the breakout direction
+- Crossings are dispatched to the full entry confirmation; ORB_BREAKOUT_MIN_FLAGS > 0
+  pre-filters them on those flags
+5m/15m bars are bucketed from the 1-minute panel on the UTC grid, which matches the
+session-anchored bars for UK (08:00) and US (09:30) opens.
+"""
+
+import os
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from bars import UNIT_NANOSECONDS
+from panel import BarPanel
+
+# Breakout directions
+LONG, SHORT = 1, -1
+
+# Same thresholds as the full confirmation (EnhancedORBStockTradingBot.enhanced_volume_analysis)
+VOLUME_SURGE_RATIO = 1.5
+VOLUME_BUCKET_SECONDS = 300
+VOLUME_WINDOW = 20
+
+# Higher-timeframe bias: 20 EMA of 15-minute closes over the last 2 sessions
+BIAS_BUCKET_SECONDS = 900
+BIAS_EMA_SPAN = 20
+BIAS_SESSIONS = 2
+
+# A gap this long between two bars of a symbol starts a new session
+SESSION_GAP_SECONDS = 12 * 3600
+
+# Flags (volume surge, bias alignment) a crossing needs before it is dispatched; 0 = every crossing.
+# Opt-in: bias alignment here is stricter than the confirmation's (any clear 15m trend counts there)
+MIN_FLAGS = int(os.getenv("ORB_BREAKOUT_MIN_FLAGS", "0"))
+
+def panel_epoch(panel: BarPanel) -> np.ndarray:
+    """Panel bar times as int64 epoch nanoseconds (UTC)"""
+    return panel.index.asi8 * UNIT_NANOSECONDS[panel.index.unit]
+
+def _pack(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """End-align each row's valid cells (NaN padding in front), like BarPanel.packed()"""
+    order = np.argsort(valid, axis=1, kind="stable")
+    return np.where(np.take_along_axis(valid, order, axis=1), np.take_along_axis(values, order, axis=1), np.nan)
+
+def session_numbers(panel: BarPanel, gap_seconds: float = SESSION_GAP_SECONDS) -> np.ndarray:
+    """[symbol, bar] session count of every present bar (1 = a symbol's first session), 0 where absent"""
+    present = panel.present
+    if present.shape[1] == 0:
+        return np.zeros(present.shape, dtype="int64")
+    
+    epoch = panel_epoch(panel)
+    positions = np.where(present, np.arange(present.shape[1]), -1)
+    last_seen = np.maximum.accumulate(positions, axis=1)
+    previous = np.concatenate([np.full((len(present), 1), -1), last_seen[:, :-1]], axis=1)
+    gaps = epoch - epoch[np.clip(previous, 0, None)]
+    new_session = present & ((previous < 0) | (gaps > gap_seconds * 1e9))
+    return np.where(present, np.cumsum(new_session, axis=1), 0)
+
+def bucket_bars(panel: BarPanel, mask: np.ndarray, seconds: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Coarser bars from the 1-minute cells selected by mask, on the UTC grid of `seconds`
+    Returns [symbol, bucket] (volume sum, last close), both NaN where a bucket is empty.
+    """
+    if mask.shape[1] == 0:
+        empty = np.full((len(mask), 0), np.nan)
+        return empty, empty
+    
+    buckets = panel_epoch(panel) // int(seconds * 1e9)
+    starts = np.flatnonzero(np.concatenate([[True], buckets[1:] != buckets[:-1]]))
+    
+    volume = panel.field('Volume')
+    close = panel.field('Close')
+    counts = np.add.reduceat(mask.astype("int64"), starts, axis=1)
+    volumes = np.add.reduceat(np.where(mask & ~np.isnan(volume), volume, 0.0), starts, axis=1)
+    volumes[counts == 0] = np.nan
+    
+    # Last close in each bucket, skipping NaN (like groupby().last())
+    positions = np.where(mask & ~np.isnan(close), np.arange(mask.shape[1]), -1)
+    last = np.maximum.reduceat(positions, starts, axis=1)
+    closes = np.take_along_axis(close, np.clip(last, 0, None), axis=1)
+    closes[last < 0] = np.nan
+    return volumes, closes
+
+def volume_surge(panel: BarPanel, sessions: Optional[np.ndarray] = None,
+                 bucket_seconds: int = VOLUME_BUCKET_SECONDS, window: int = VOLUME_WINDOW) -> np.ndarray:
+    """Current 5-minute volume / mean of the session's last `window` 5-minute volumes (1 when unknown)"""
+    if len(panel) == 0:
+        return np.ones(0)
+    sessions = session_numbers(panel) if sessions is None else sessions
+    today = panel.present & (sessions == sessions.max(axis=1, keepdims=True))
+    volumes, _ = bucket_bars(panel, today, bucket_seconds)
+    packed = _pack(volumes, ~np.isnan(volumes))
+    if packed.shape[1] == 0:
+        return np.ones(len(panel))
+    
+    tail = packed[:, -window:]
+    counts = (~np.isnan(tail)).sum(axis=1)
+    average = np.where(counts > 0, np.nansum(tail, axis=1) / np.maximum(counts, 1), np.nan)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(average > 0, packed[:, -1] / average, 1.0)
+
+def higher_timeframe_bias(panel: BarPanel, sessions: Optional[np.ndarray] = None,
+                          bucket_seconds: int = BIAS_BUCKET_SECONDS, span: int = BIAS_EMA_SPAN,
+                          session_count: int = BIAS_SESSIONS) -> np.ndarray:
+    """LONG if the last 15-minute close is above its EMA, SHORT otherwise, 0 without bars"""
+    if len(panel) == 0:
+        return np.zeros(0, dtype="int64")
+    sessions = session_numbers(panel) if sessions is None else sessions
+    recent = panel.present & (sessions > sessions.max(axis=1, keepdims=True) - session_count)
+    _, closes = bucket_bars(panel, recent, bucket_seconds)
+    packed = _pack(closes, ~np.isnan(closes))
+    if packed.shape[1] == 0:
+        return np.zeros(len(panel), dtype="int64")
+    
+    # EMA (adjust=True, as indicators.ema) run along the bucket axis for every symbol at once
+    beta = 1 - 2.0 / (span + 1)
+    numerator = np.zeros(len(packed))
+    denominator = np.zeros(len(packed))
+    for column in packed.T:
+        valid = ~np.isnan(column)
+        numerator = np.where(valid, column, 0.0) + beta * numerator
+        denominator = valid + beta * denominator
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ema = np.where(denominator > 0, numerator / denominator, np.nan)
+    
+    last = packed[:, -1]
+    bias = np.where(last > ema, LONG, SHORT)
+    return np.where(np.isnan(last) | np.isnan(ema), 0, bias)
+
+class BreakoutSignals:
+    """One cross-sectional pass: arrays aligned with symbols"""
+
+    def __init__(self, symbols: Sequence[str], prices: np.ndarray, volumes: np.ndarray, direction: np.ndarray,
+                 volume_surge: np.ndarray, bias: np.ndarray, min_flags: int = MIN_FLAGS,
+                 surge_ratio: float = VOLUME_SURGE_RATIO):
+        self.symbols = list(symbols)
+        self.prices = prices
+        self.volumes = volumes
+        self.direction = direction
+        self.volume_surge = volume_surge
+        self.bias = bias
+        
+        crossing = direction != 0
+        self.surge = crossing & (volume_surge >= surge_ratio)
+        self.aligned = crossing & (bias == direction)
+        self.flags = self.surge.astype("int64") + self.aligned
+        self.dispatch = crossing & (self.flags >= min_flags)
+        self._positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def crossings(self) -> List[str]:
+        """Symbols trading outside their opening range"""
+        return [self.symbols[i] for i in np.flatnonzero(self.direction != 0)]
+
+    def flagged(self) -> List[str]:
+        """Crossings with enough flags for the full confirmation"""
+        return [self.symbols[i] for i in np.flatnonzero(self.dispatch)]
+
+    def latest(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Latest (price, volume) of a symbol"""
+        i = self._positions.get(symbol)
+        if i is None or np.isnan(self.prices[i]):
+            return None
+        return float(self.prices[i]), float(self.volumes[i])
+
+    def get(self, symbol: str) -> Optional[Dict]:
+        """Flags of one symbol"""
+        i = self._positions.get(symbol)
+        if i is None:
+            return None
+        return {
+            'direction': {LONG: 'LONG', SHORT: 'SHORT'}.get(int(self.direction[i])),
+            'volume_surge': float(self.volume_surge[i]),
+            'bias': {LONG: 'BULLISH', SHORT: 'BEARISH'}.get(int(self.bias[i]), 'NEUTRAL'),
+            'surge': bool(self.surge[i]),
+            'aligned': bool(self.aligned[i]),
+            'dispatch': bool(self.dispatch[i])
+        }
+
+    def describe(self) -> str:
+        return f"{int((self.direction != 0).sum())} crossing, {int(self.dispatch.sum())} dispatched of {len(self.symbols)}"
+
+class BreakoutEngine:
+    """ORH/ORL/range/volume average per symbol in arrays, evaluated for all symbols at once"""
+
+    def __init__(self, symbols: Iterable[str] = (), min_flags: int = MIN_FLAGS,
+                 surge_ratio: float = VOLUME_SURGE_RATIO):
+        self.min_flags = min_flags
+        self.surge_ratio = surge_ratio
+        self.symbols = []
+        self._positions = {}
+        self.orh = np.empty(0)
+        self.orl = np.empty(0)
+        self.range_size = np.empty(0)
+        self.volume_avg = np.empty(0)
+        self._rows_key = None
+        self._rows = None
+        self.add_symbols(symbols)
+
+    def add_symbols(self, symbols: Iterable[str]):
+        """Grow the universe (new symbols start without a range)"""
+        new = [symbol for symbol in dict.fromkeys(symbols) if symbol not in self._positions]
+        if not new:
+            return
+        for symbol in new:
+            self._positions[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+        padding = np.full(len(new), np.nan)
+        self.orh = np.concatenate([self.orh, padding])
+        self.orl = np.concatenate([self.orl, padding])
+        self.range_size = np.concatenate([self.range_size, padding])
+        self.volume_avg = np.concatenate([self.volume_avg, padding])
+
+    def set_range(self, symbol: str, opening_range: Dict):
+        """Store one symbol's opening range (the dict calculate_opening_range builds)"""
+        self.add_symbols([symbol])
+        i = self._positions[symbol]
+        self.orh[i] = opening_range['orh']
+        self.orl[i] = opening_range['orl']
+        self.range_size[i] = opening_range.get('range_size', opening_range['orh'] - opening_range['orl'])
+        self.volume_avg[i] = opening_range.get('volume_avg', np.nan)
+
+    def load(self, opening_ranges: Dict[str, Dict]):
+        for symbol, opening_range in opening_ranges.items():
+            self.set_range(symbol, opening_range)
+
+    def clear(self, symbols: Optional[Iterable[str]] = None):
+        """Forget the ranges of some (default all) symbols"""
+        rows = list(range(len(self.symbols))) if symbols is None else \
+            [self._positions[symbol] for symbol in symbols if symbol in self._positions]
+        for array in (self.orh, self.orl, self.range_size, self.volume_avg):
+            array[rows] = np.nan
+
+    def has_range(self, symbol: str) -> bool:
+        i = self._positions.get(symbol)
+        return i is not None and not np.isnan(self.orh[i])
+
+    def _rows_for(self, symbols: Sequence[str]) -> np.ndarray:
+        """Engine row of each symbol (-1 if unknown), cached while the symbol list repeats"""
+        key = tuple(symbols)
+        if key != self._rows_key:
+            self._rows_key = key
+            self._rows = np.array([self._positions.get(symbol, -1) for symbol in key], dtype="int64")
+        return self._rows
+
+    def crossings(self, symbols: Sequence[str], prices: np.ndarray) -> np.ndarray:
+        """LONG above ORH, SHORT below ORL, 0 inside the range or without one"""
+        rows = self._rows_for(symbols)
+        known = rows >= 0
+        orh = np.where(known, self.orh[np.clip(rows, 0, None)] if len(self.orh) else np.nan, np.nan)
+        orl = np.where(known, self.orl[np.clip(rows, 0, None)] if len(self.orl) else np.nan, np.nan)
+        prices = np.asarray(prices, dtype="float64")
+        return np.where(prices > orh, LONG, np.where(prices < orl, SHORT, 0))
+
+    def evaluate(self, symbols: Sequence[str], prices: np.ndarray, volumes: Optional[np.ndarray] = None,
+                 volume_surge: Optional[np.ndarray] = None, bias: Optional[np.ndarray] = None) -> BreakoutSignals:
+        """Flag a whole quote vector (surge/bias default to 'unknown': no flag)"""
+        count = len(symbols)
+        prices = np.asarray(prices, dtype="float64")
+        volumes = np.full(count, np.nan) if volumes is None else np.asarray(volumes, dtype="float64")
+        volume_surge = np.ones(count) if volume_surge is None else np.asarray(volume_surge, dtype="float64")
+        bias = np.zeros(count, dtype="int64") if bias is None else np.asarray(bias)
+        return BreakoutSignals(symbols, prices, volumes, self.crossings(symbols, prices), volume_surge, bias,
+                               self.min_flags, self.surge_ratio)
+
+    def evaluate_panel(self, panel: BarPanel, prices: Optional[np.ndarray] = None) -> BreakoutSignals:
+        """Flag every symbol of a 1-minute panel (prices default to each symbol's last close)"""
+        prices = panel.last('Close') if prices is None else prices
+        sessions = session_numbers(panel)
+        return self.evaluate(panel.symbols, prices, panel.last('Volume'),
+                             volume_surge(panel, sessions), higher_timeframe_bias(panel, sessions))
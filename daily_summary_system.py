@@ -9,7 +9,7 @@ import logging
 import requests
 from datetime import datetime, time, timedelta
 import pytz
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 # Try to import market calendars, fallback to simple weekend check
 try:
@@ -285,16 +285,17 @@ class DailySummarySystem:
             logger.error(f"❌ Error generating US summary: {e}")
             return f"❌ Error generating US summary: {e}"
     
-    def is_uk_trading_day(self) -> bool:
+    def is_uk_trading_day(self, now: Optional[datetime] = None) -> bool:
         """Check if UK market is open today (not weekend or holiday)"""
+        now = now or datetime.now(pytz.utc)
         try:
             if not self.lse:
                 # Fallback to weekend check only
-                now_ldn = datetime.now(self.london_tz)
+                now_ldn = now.astimezone(self.london_tz)
                 return now_ldn.weekday() < 5
             
             # Get today's date in London timezone
-            now_ldn = datetime.now(self.london_tz)
+            now_ldn = now.astimezone(self.london_tz)
             today = now_ldn.date()
             
             # Check if market is open today
@@ -304,19 +305,20 @@ class DailySummarySystem:
         except Exception as e:
             logger.error(f"Error checking UK trading day: {e}")
             # Fallback to weekend check
-            now_ldn = datetime.now(self.london_tz)
+            now_ldn = now.astimezone(self.london_tz)
             return now_ldn.weekday() < 5
     
-    def is_us_trading_day(self) -> bool:
+    def is_us_trading_day(self, now: Optional[datetime] = None) -> bool:
         """Check if US market is open today (not weekend or holiday)"""
+        now = now or datetime.now(pytz.utc)
         try:
             if not self.nyse:
                 # Fallback to weekend check only
-                now_ny = datetime.now(self.ny_tz)
+                now_ny = now.astimezone(self.ny_tz)
                 return now_ny.weekday() < 5
             
             # Get today's date in NY timezone
-            now_ny = datetime.now(self.ny_tz)
+            now_ny = now.astimezone(self.ny_tz)
             today = now_ny.date()
             
             # Check if market is open today
@@ -326,7 +328,7 @@ class DailySummarySystem:
         except Exception as e:
             logger.error(f"Error checking US trading day: {e}")
             # Fallback to weekend check
-            now_ny = datetime.now(self.ny_tz)
+            now_ny = now.astimezone(self.ny_tz)
             return now_ny.weekday() < 5
     
     def get_next_uk_holiday(self) -> str:
@@ -365,20 +367,20 @@ class DailySummarySystem:
         except:
             return "Unknown"
     
-    def should_send_uk_open_notification(self) -> bool:
+    def should_send_uk_open_notification(self, now: Optional[datetime] = None) -> bool:
         """Check if it's time to send UK market open notification (12:00 PM Dubai)"""
-        if not self.is_uk_trading_day():
+        if not self.is_uk_trading_day(now):
             return False
         
-        now_dubai = datetime.now(self.dubai_tz)
+        now_dubai = (now or datetime.now(pytz.utc)).astimezone(self.dubai_tz)
         return now_dubai.hour == 12 and 0 <= now_dubai.minute <= 5
     
-    def should_send_us_open_notification(self) -> bool:
+    def should_send_us_open_notification(self, now: Optional[datetime] = None) -> bool:
         """Check if it's time to send US market open notification (6:30 PM Dubai)"""
-        if not self.is_us_trading_day():
+        if not self.is_us_trading_day(now):
             return False
         
-        now_dubai = datetime.now(self.dubai_tz)
+        now_dubai = (now or datetime.now(pytz.utc)).astimezone(self.dubai_tz)
         return now_dubai.hour == 18 and 30 <= now_dubai.minute <= 35
     
     def get_stock_uk_market_open_notification(self) -> str:
@@ -430,44 +432,44 @@ AAPL, TSLA, MSFT, GOOGL, AMZN, META, NVDA, NFLX, AMD, UBER, COIN, DIS
         now = datetime.now(self.dubai_tz)
         return now.hour == 21 and now.minute == 0  # 9:00 PM Dubai
     
-    def should_send_uk_close_notification(self) -> bool:
+    def should_send_uk_close_notification(self, now: Optional[datetime] = None) -> bool:
         """Check 15 minutes before UK close using London local time (DST-aware)"""
         # Check if it's a trading day first (blocks weekends and holidays)
-        if not self.is_uk_trading_day():
+        if not self.is_uk_trading_day(now):
             return False
         
-        now_ldn = datetime.now(self.london_tz)
+        now_ldn = (now or datetime.now(pytz.utc)).astimezone(self.london_tz)
         return now_ldn.hour == 16 and now_ldn.minute == 15
     
-    def should_send_us_early_warning(self) -> bool:
+    def should_send_us_early_warning(self, now: Optional[datetime] = None) -> bool:
         """Check for early US close warning (10 PM Dubai - user still awake)"""
         # Check if it's a trading day first (blocks weekends and holidays)
-        if not self.is_us_trading_day():
+        if not self.is_us_trading_day(now):
             return False
         
-        now_dubai = datetime.now(self.dubai_tz)
+        now_dubai = (now or datetime.now(pytz.utc)).astimezone(self.dubai_tz)
         return now_dubai.hour == 22 and now_dubai.minute == 0  # 10:00 PM Dubai
     
-    def should_send_us_close_notification(self) -> bool:
+    def should_send_us_close_notification(self, now: Optional[datetime] = None) -> bool:
         """Check 15 minutes before US close using New York local time (DST-aware)"""
         # Check if it's a trading day first (blocks weekends and holidays)
-        if not self.is_us_trading_day():
+        if not self.is_us_trading_day(now):
             return False
         
-        now_ny = datetime.now(self.ny_tz)
+        now_ny = (now or datetime.now(pytz.utc)).astimezone(self.ny_tz)
         return now_ny.hour == 15 and now_ny.minute == 45
     
-    def should_send_holiday_notification(self) -> bool:
+    def should_send_holiday_notification(self, now: Optional[datetime] = None) -> bool:
         """Send holiday notification at 9 AM Dubai if market is closed"""
-        now_dubai = datetime.now(self.dubai_tz)
+        now_dubai = (now or datetime.now(pytz.utc)).astimezone(self.dubai_tz)
         
         # Only send at 9:00 AM Dubai
         if now_dubai.hour != 9 or now_dubai.minute != 0:
             return False
         
         # Check if either market is closed for holiday/weekend
-        uk_closed = not self.is_uk_trading_day()
-        us_closed = not self.is_us_trading_day()
+        uk_closed = not self.is_uk_trading_day(now)
+        us_closed = not self.is_us_trading_day(now)
         
         return uk_closed or us_closed
     
@@ -534,8 +536,8 @@ No open trades currently.
 """
             
             # Import for price fetching
-            from rate_limited_data_fetcher import RateLimitedDataFetcher
-            fetcher = RateLimitedDataFetcher(base_delay=1.0)
+            from rate_limited_data_fetcher import get_shared_fetcher
+            fetcher = get_shared_fetcher(base_delay=1.0)
             
             summary = f"""
 📊 <b>FOREX OPEN TRADES SUMMARY</b>
@@ -546,6 +548,9 @@ No open trades currently.
 
 """
             
+            # One batched quote request for every open position
+            prices = fetcher.get_multiple_prices([trade['symbol'] for trade in active_trades], priority="report")
+            
             for trade in active_trades:
                 symbol = trade['symbol']
                 direction = trade['direction']
@@ -554,7 +559,7 @@ No open trades currently.
                 target = float(trade['target'])
                 
                 # Get current price
-                current_price = fetcher.get_current_price(symbol)
+                current_price = prices.get(symbol)
                 if not current_price:
                     current_price = entry  # Fallback
                 
@@ -5,11 +5,13 @@ Uses technical analysis to optimize R:R ratio (2:1 to 5:1)
 NO GUESSING - Pure data-driven decisions
 """
 
-import pandas as pd
 import numpy as np
 from datetime import datetime
 import logging
 
+from bars import field
+from indicators import get_indicator_library
+
 logger = logging.getLogger(__name__)
 
 class DynamicRROptimizer:
@@ -32,9 +34,20 @@ class DynamicRROptimizer:
         # ATR periods for volatility analysis
         self.atr_period = 14  # Standard ATR period
         
+        # Score weights: stronger zone + higher volatility + good momentum = higher R:R
+        self.weights = {
+            'atr': 0.30,        # Volatility is important
+            'zone': 0.35,       # Zone strength is critical
+            'momentum': 0.20,   # Momentum helps
+            'distance': 0.15    # Distance matters
+        }
+        
+        # Shared indicator kernels, memoized per symbol/interval/bar
+        self.indicators = get_indicator_library()
+        
         logger.info("✅ Dynamic R:R Optimizer initialized (2:1 to 5:1)")
     
-    def calculate_atr(self, df, period=14):
+    def calculate_atr(self, df, period=14, symbol=None, interval=None):
         """
         Calculate Average True Range (ATR)
         Measures market volatility - higher ATR = more volatile
@@ -43,17 +56,10 @@ class DynamicRROptimizer:
             return None
         
         try:
-            # True Range calculation
-            high_low = df['High'] - df['Low']
-            high_close = abs(df['High'] - df['Close'].shift())
-            low_close = abs(df['Low'] - df['Close'].shift())
+            # ATR is the moving average of True Range (memoized when the symbol is known)
+            atr = self.indicators.atr(df, period, symbol=symbol, interval=interval)
             
-            true_range = pd.concat([high_low, high_close, low_close], axis=1).max(axis=1)
-            
-            # ATR is the moving average of True Range
-            atr = true_range.rolling(window=period).mean()
-            
-            return atr.iloc[-1]  # Return current ATR
+            return atr[-1]  # Return current ATR
         
         except Exception as e:
             logger.error(f"ATR calculation error: {e}")
@@ -71,32 +77,28 @@ class DynamicRROptimizer:
             return 0.5  # Default medium strength
         
         try:
-            touches = 0
-            bounce_strength = []
             tolerance = zone_price * 0.002  # 0.2% tolerance
+            high = field(df, 'High')
+            low = field(df, 'Low')
+            close = field(df, 'Close')
             
-            for i in range(len(df)):
+            with np.errstate(divide='ignore', invalid='ignore'):
                 if zone_type == 'demand':  # Support
-                    # Check if price touched support
-                    if df['Low'].iloc[i] <= zone_price + tolerance:
-                        touches += 1
-                        # Calculate bounce strength (how far price bounced)
-                        if i < len(df) - 1:
-                            bounce = (df['Close'].iloc[i+1] - df['Low'].iloc[i]) / df['Low'].iloc[i]
-                            bounce_strength.append(bounce)
-                
+                    # Bars that touched support, and how far the next close bounced off the low
+                    touched = low <= zone_price + tolerance
+                    reaction = (close[1:] - low[:-1]) / low[:-1]
                 else:  # supply - Resistance
-                    # Check if price touched resistance
-                    if df['High'].iloc[i] >= zone_price - tolerance:
-                        touches += 1
-                        # Calculate rejection strength
-                        if i < len(df) - 1:
-                            rejection = (df['High'].iloc[i] - df['Close'].iloc[i+1]) / df['High'].iloc[i]
-                            bounce_strength.append(rejection)
+                    # Bars that touched resistance, and how far the next close was rejected from the high
+                    touched = high >= zone_price - tolerance
+                    reaction = (high[:-1] - close[1:]) / high[:-1]
+            
+            touches = int(np.count_nonzero(touched))
+            # The last bar has no next close, so it counts as a touch but has no reaction
+            bounce_strength = reaction[touched[:-1]]
             
             # Normalize strength (0 to 1)
             touch_score = min(touches / 5.0, 1.0)  # Max score at 5 touches
-            bounce_score = np.mean(bounce_strength) * 100 if bounce_strength else 0.5
+            bounce_score = np.mean(bounce_strength) * 100 if len(bounce_strength) else 0.5
             bounce_score = min(bounce_score, 1.0)
             
             # Combined strength score
@@ -108,6 +110,47 @@ class DynamicRROptimizer:
             logger.error(f"Zone strength calculation error: {e}")
             return 0.5
     
+    def calculate_zone_strengths(self, df, zone_prices, zone_types):
+        """
+        Zone strength for many zones at once (same scoring as calculate_zone_strength)
+        Touch masks and reactions are evaluated as a zones x bars matrix.
+        """
+        zone_prices = np.asarray(zone_prices, dtype="float64")
+        if df is None or df.empty:
+            return np.full(len(zone_prices), 0.5)
+        
+        high = field(df, 'High')
+        low = field(df, 'Low')
+        close = field(df, 'Close')
+        is_demand = (np.asarray(zone_types) == 'demand')[:, None]
+        tolerance = zone_prices * 0.002  # 0.2% tolerance
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            touched = np.where(
+                is_demand,
+                low <= (zone_prices + tolerance)[:, None],   # Support touches
+                high >= (zone_prices - tolerance)[:, None]   # Resistance touches
+            )
+            reaction = np.where(
+                is_demand,
+                (close[1:] - low[:-1]) / low[:-1],           # Bounce off the low
+                (high[:-1] - close[1:]) / high[:-1]          # Rejection from the high
+            )
+            
+            touches = np.count_nonzero(touched, axis=1)
+            reacted = touched[:, :-1]
+            reactions = np.count_nonzero(reacted, axis=1)
+            bounce_mean = np.where(reacted, reaction, 0.0).sum(axis=1) / reactions
+        
+        # Normalize strength (0 to 1)
+        touch_score = np.minimum(touches / 5.0, 1.0)  # Max score at 5 touches
+        bounce_score = np.where(reactions > 0, bounce_mean * 100, 0.5)
+        bounce_score = np.where(bounce_score > 1.0, 1.0, bounce_score)  # NaN passes through like min()
+        
+        strength = (touch_score * 0.6) + (bounce_score * 0.4)
+        strength = np.where(strength > 1.0, 1.0, strength)
+        return np.where(strength > 0.1, strength, 0.1)  # NaN -> 0.1, as max(0.1, nan) does
+    
     def calculate_momentum(self, df, period=10):
         """
         Calculate price momentum
@@ -118,7 +161,8 @@ class DynamicRROptimizer:
         
         try:
             # Calculate rate of change
-            roc = (df['Close'].iloc[-1] - df['Close'].iloc[-period]) / df['Close'].iloc[-period]
+            close = field(df, 'Close')
+            roc = (close[-1] - close[-period]) / close[-period]
             
             # Normalize momentum (-1 to 1)
             momentum = np.tanh(roc * 10)  # Smooth scaling
@@ -132,6 +176,46 @@ class DynamicRROptimizer:
             logger.error(f"Momentum calculation error: {e}")
             return 0.5
     
+    def calculate_atr_score(self, atr, current_price):
+        """Normalize ATR against the price (higher volatility = higher R:R potential)"""
+        if atr is None:
+            return 0.5
+        
+        atr_pct = (atr / current_price) * 100
+        if atr_pct > 1.0:  # High volatility
+            return 0.9
+        elif atr_pct > 0.5:  # Medium volatility
+            return 0.7
+        else:  # Low volatility
+            return 0.5
+    
+    def calculate_symbol_scores(self, hist_data, current_price, symbol=None, interval=None):
+        """ATR (volatility) score and momentum - shared by every zone of a symbol"""
+        atr = self.calculate_atr(hist_data, self.atr_period, symbol=symbol, interval=interval)
+        atr_score = self.calculate_atr_score(atr, current_price)
+        
+        momentum = self.calculate_momentum(hist_data, period=10)
+        return atr_score, momentum
+    
+    def analyze_bars(self, hist_data, zones, symbol=None, interval=None):
+        """
+        The part of the score that depends only on the bars: ATR, momentum and
+        each zone's strength. It stays valid until a new bar closes, so callers
+        can cache it and pass it back to optimize_many(analysis=...).
+        
+        Returns:
+        - {'atr': ATR or None, 'momentum': 0-1, 'zone_strength': {(type, price): strength}}
+        """
+        zone_prices = np.array([zone['price'] for zone in zones], dtype="float64")
+        zone_types = np.array([zone['type'] for zone in zones])
+        strengths = self.calculate_zone_strengths(hist_data, zone_prices, zone_types) if zones else []
+        
+        return {
+            'atr': self.calculate_atr(hist_data, self.atr_period, symbol=symbol, interval=interval),
+            'momentum': self.calculate_momentum(hist_data, period=10),
+            'zone_strength': {(zone['type'], zone['price']): float(strength) for zone, strength in zip(zones, strengths)}
+        }
+    
     def calculate_distance_score(self, current_price, zone_price, zone_type):
         """
         Calculate score based on distance from zone
@@ -156,7 +240,7 @@ class DynamicRROptimizer:
         Analyzes technical indicators and returns optimal R:R ratio
         
         Parameters:
-        - hist_data: Historical price data (pandas DataFrame)
+        - hist_data: Historical price data (pandas DataFrame or Bars)
         - current_price: Current market price
         - zone_price: Support/Resistance zone price
         - zone_type: 'demand' (support/long) or 'supply' (resistance/short)
@@ -172,37 +256,18 @@ class DynamicRROptimizer:
             return 2.0, 0.5, "Insufficient data - using baseline 2:1"
         
         try:
-            # 1. Calculate ATR (Volatility)
-            atr = self.calculate_atr(hist_data, self.atr_period)
-            if atr is None:
-                atr_score = 0.5
-            else:
-                # Normalize ATR (higher volatility = higher R:R potential)
-                atr_pct = (atr / current_price) * 100
-                if atr_pct > 1.0:  # High volatility
-                    atr_score = 0.9
-                elif atr_pct > 0.5:  # Medium volatility
-                    atr_score = 0.7
-                else:  # Low volatility
-                    atr_score = 0.5
+            # 1. Calculate ATR (Volatility) and 3. Momentum - these depend only on the symbol
+            atr_score, momentum = self.calculate_symbol_scores(hist_data, current_price)
             
             # 2. Calculate Zone Strength
             zone_strength = self.calculate_zone_strength(hist_data, zone_price, zone_type)
             
-            # 3. Calculate Momentum
-            momentum = self.calculate_momentum(hist_data, period=10)
-            
             # 4. Calculate Distance Score
             distance_score = self.calculate_distance_score(current_price, zone_price, zone_type)
             
             # 5. Combine scores with weights
             # Stronger zone + higher volatility + good momentum = higher R:R
-            weights = {
-                'atr': 0.30,        # Volatility is important
-                'zone': 0.35,       # Zone strength is critical
-                'momentum': 0.20,   # Momentum helps
-                'distance': 0.15    # Distance matters
-            }
+            weights = self.weights
             
             combined_score = (
                 atr_score * weights['atr'] +
@@ -231,20 +296,7 @@ class DynamicRROptimizer:
                 confidence = 0.95
             
             # 7. Build explanation
-            explanation_parts = []
-            if atr_score > 0.7:
-                explanation_parts.append("high volatility")
-            if zone_strength > 0.7:
-                explanation_parts.append("strong zone")
-            if momentum > 0.7:
-                explanation_parts.append("good momentum")
-            if distance_score > 0.8:
-                explanation_parts.append("optimal entry")
-            
-            if not explanation_parts:
-                explanation_parts.append("baseline conditions")
-            
-            explanation = f"{optimal_rr}:1 R:R - " + ", ".join(explanation_parts)
+            explanation = self.build_explanation(optimal_rr, atr_score, zone_strength, momentum, distance_score)
             
             logger.info(f"📊 R:R Optimizer: {explanation} (confidence: {confidence:.2f})")
             logger.info(f"   ATR: {atr_score:.2f} | Zone: {zone_strength:.2f} | Momentum: {momentum:.2f} | Distance: {distance_score:.2f}")
@@ -255,6 +307,188 @@ class DynamicRROptimizer:
             logger.error(f"R:R optimization error: {e}")
             return 2.0, 0.5, "Error in analysis - using baseline 2:1"
     
+    def build_explanation(self, optimal_rr, atr_score, zone_strength, momentum, distance_score):
+        """Human-readable reasons behind an R:R choice"""
+        explanation_parts = []
+        if atr_score > 0.7:
+            explanation_parts.append("high volatility")
+        if zone_strength > 0.7:
+            explanation_parts.append("strong zone")
+        if momentum > 0.7:
+            explanation_parts.append("good momentum")
+        if distance_score > 0.8:
+            explanation_parts.append("optimal entry")
+        
+        if not explanation_parts:
+            explanation_parts.append("baseline conditions")
+        
+        return f"{optimal_rr}:1 R:R - " + ", ".join(explanation_parts)
+    
+    def analyze_panel(self, panel, zones_by_symbol):
+        """
+        analyze_bars for every symbol of a BarPanel cross-sectionally
+        
+        ATR, momentum and zone strength are evaluated over [symbol, bar] (and
+        [symbol, zone, bar]) matrices of the end-aligned bars, so 29 symbols cost
+        one NumPy pass instead of 29 DataFrame pipelines.
+        
+        Returns:
+        - {symbol: analysis} in the analyze_bars format, usable with optimize_many(analysis=...)
+        """
+        if len(panel) == 0:
+            return {}
+        
+        high, low, close = panel.packed('High'), panel.packed('Low'), panel.packed('Close')
+        lengths = panel.lengths
+        bars = high.shape[1]
+        
+        # ATR: mean true range of the last atr_period bars (same as the rolling mean's last value)
+        prev_close = np.concatenate([np.full((len(panel), 1), np.nan), close[:, :-1]], axis=1)
+        true_range = np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+        period = self.atr_period
+        atr = true_range[:, -period:].mean(axis=1) if bars >= period else np.full(len(panel), np.nan)
+        
+        # Momentum: rate of change over the last 10 bars, squashed to 0-1
+        momentum = np.full(len(panel), 0.5)
+        if bars >= 10:
+            with np.errstate(divide='ignore', invalid='ignore'):
+                roc = (close[:, -1] - close[:, -10]) / close[:, -10]
+            momentum = np.where(lengths >= 10, (np.tanh(roc * 10) + 1) / 2, 0.5)
+        
+        # Zone strength over a [symbol, zone, bar] matrix (rows padded with NaN zones)
+        max_zones = max((len(zones_by_symbol.get(symbol) or []) for symbol in panel.symbols), default=0)
+        zone_prices = np.full((len(panel), max_zones), np.nan)
+        is_demand = np.zeros((len(panel), max_zones), dtype=bool)
+        for s, symbol in enumerate(panel.symbols):
+            for z, zone in enumerate(zones_by_symbol.get(symbol) or []):
+                zone_prices[s, z] = zone['price']
+                is_demand[s, z] = zone['type'] == 'demand'
+        strengths = self.calculate_zone_strengths_panel(high, low, close, zone_prices, is_demand)
+        
+        analyses = {}
+        for s, symbol in enumerate(panel.symbols):
+            zones = zones_by_symbol.get(symbol) or []
+            analyses[symbol] = {
+                'atr': None if lengths[s] < period else float(atr[s]),
+                'momentum': float(momentum[s]),
+                'zone_strength': {(zone['type'], zone['price']): float(strengths[s, z]) for z, zone in enumerate(zones)}
+            }
+        return analyses
+    
+    def calculate_zone_strengths_panel(self, high, low, close, zone_prices, is_demand):
+        """
+        calculate_zone_strengths over [symbol, bar] bars and [symbol, zone] zones
+        Bars are end-aligned with NaN padding in front; padding never touches a zone,
+        so each row scores exactly like that symbol's own frame.
+        """
+        if zone_prices.shape[1] == 0 or high.shape[1] == 0:
+            return np.full(zone_prices.shape, 0.5)
+        
+        tolerance = zone_prices * 0.002  # 0.2% tolerance
+        is_demand = is_demand[:, :, None]
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            touched = np.where(
+                is_demand,
+                low[:, None, :] <= (zone_prices + tolerance)[:, :, None],   # Support touches
+                high[:, None, :] >= (zone_prices - tolerance)[:, :, None]   # Resistance touches
+            )
+            reaction = np.where(
+                is_demand,
+                ((close[:, 1:] - low[:, :-1]) / low[:, :-1])[:, None, :],   # Bounce off the low
+                ((high[:, :-1] - close[:, 1:]) / high[:, :-1])[:, None, :]  # Rejection from the high
+            )
+            
+            touches = np.count_nonzero(touched, axis=2)
+            reacted = touched[:, :, :-1]
+            reactions = np.count_nonzero(reacted, axis=2)
+            bounce_mean = np.where(reacted, reaction, 0.0).sum(axis=2) / reactions
+        
+        # Normalize strength (0 to 1), same clamping as calculate_zone_strengths
+        touch_score = np.minimum(touches / 5.0, 1.0)
+        bounce_score = np.where(reactions > 0, bounce_mean * 100, 0.5)
+        bounce_score = np.where(bounce_score > 1.0, 1.0, bounce_score)
+        
+        strength = (touch_score * 0.6) + (bounce_score * 0.4)
+        strength = np.where(strength > 1.0, 1.0, strength)
+        return np.where(strength > 0.1, strength, 0.1)  # NaN -> 0.1, as max(0.1, nan) does
+    
+    def optimize_many(self, hist_data, current_price, zones, symbol=None, interval=None, analysis=None):
+        """
+        Optimize R:R for every candidate zone of a symbol in one pass
+        
+        ATR and momentum are computed once; zone strength, distance and the
+        combined score are evaluated for all zones together. Each zone gets the
+        same result optimize_rr_ratio would give it.
+        
+        Parameters:
+        - hist_data: Historical price data (pandas DataFrame or Bars)
+        - current_price: Current market price
+        - zones: Zone dicts with 'price' and 'type'
+        - symbol/interval: Optional, lets the indicator library reuse results per bar
+        - analysis: Optional cached analyze_bars() result covering these zones;
+          then only the price-dependent scores are computed and hist_data isn't read
+        
+        Returns:
+        - List of (rr, confidence, explanation, zone) tuples, best first
+          (highest R:R, then confidence, then original zone order)
+        """
+        if not zones:
+            return []
+        
+        if analysis is None and (hist_data is None or hist_data.empty):
+            return [(2.0, 0.5, "Insufficient data - using baseline 2:1", zone) for zone in zones]
+        
+        try:
+            zone_prices = np.array([zone['price'] for zone in zones], dtype="float64")
+            
+            if analysis is None:
+                analysis = self.analyze_bars(hist_data, zones, symbol, interval)
+            atr_score = self.calculate_atr_score(analysis['atr'], current_price)
+            momentum = analysis['momentum']
+            zone_strength = np.array([analysis['zone_strength'][(zone['type'], zone['price'])] for zone in zones])
+            
+            distance = np.abs(current_price - zone_prices) / current_price
+            distance_score = np.select(
+                [distance < 0.001, distance < 0.005, distance < 0.01],
+                [0.7, 1.0, 0.8],
+                default=0.5
+            )
+            
+            weights = self.weights
+            combined_score = (
+                atr_score * weights['atr'] +
+                zone_strength * weights['zone'] +
+                momentum * weights['momentum'] +
+                distance_score * weights['distance']
+            )
+            
+            # Same score -> R:R bands as optimize_rr_ratio (NaN scores fall through to 5:1 like the scalar path)
+            with np.errstate(invalid='ignore'):
+                bands = [combined_score < 0.4, combined_score < 0.6, combined_score < 0.8]
+            optimal_rr = np.select(bands, [2.0, 3.0, 4.0], default=5.0)
+            confidence = np.select(bands, [combined_score / 0.4, 0.7, 0.85], default=0.95)
+            
+            results = []
+            for i, zone in enumerate(zones):
+                explanation = self.build_explanation(
+                    float(optimal_rr[i]), atr_score, zone_strength[i], momentum, distance_score[i]
+                )
+                results.append((float(optimal_rr[i]), float(confidence[i]), explanation, zone))
+            
+            # Stable sort keeps the zones' own (strength) order among equals
+            results.sort(key=lambda result: (result[0], result[1]), reverse=True)
+            
+            best_rr, best_confidence, best_explanation, best_zone = results[0]
+            logger.info(f"📊 R:R Optimizer: {len(zones)} zones scored, best {best_zone['type']} @ {best_zone['price']:.5f}: "
+                        f"{best_explanation} (confidence: {best_confidence:.2f})")
+            
+            return results
+        
+        except Exception as e:
+            logger.error(f"R:R batch optimization error: {e}")
+            return [(2.0, 0.5, "Error in analysis - using baseline 2:1", zone) for zone in zones]
+    
     def calculate_stop_and_target(self, entry, zone_type, rr_ratio):
         """
         Calculate stop loss and take profit based on R:R ratio
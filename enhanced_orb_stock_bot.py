@@ -19,6 +19,17 @@ from datetime import datetime, timedelta
 import pytz
 from dotenv import load_dotenv
 
+from bar_resampler import resample_timeframes
+from bar_store import slice_period
+from indicators import get_indicator_library
+from bars import field
+from market_snapshot import MarketSnapshot
+from orb_scheduler import ORBScheduler
+from breakout_engine import BreakoutEngine
+from opening_ranges import OpeningRangeStore, compute_opening_ranges, trading_day, session_open, opening_range_end
+from panel import BarPanel
+from trade_outcomes import trade_path_events
+
 # Load environment variables
 load_dotenv()
 
@@ -31,11 +42,15 @@ except ImportError:
 
 # Import rate-limited data fetcher
 try:
-    from rate_limited_data_fetcher import RateLimitedDataFetcher
+    from rate_limited_data_fetcher import RateLimitedDataFetcher, get_shared_fetcher
     RATE_LIMITED_FETCHER_AVAILABLE = True
 except ImportError:
     RATE_LIMITED_FETCHER_AVAILABLE = False
 
+# Only 1-minute bars are downloaded; 5m/15m/1h are derived from them locally
+BASE_INTERVAL = "1m"
+BASE_PERIOD = "5d"  # Enough 1h bars for a 20-period EMA (Yahoo keeps 7 days of 1m data)
+
 class EnhancedORBStockTradingBot:
     def __init__(self):
         # Telegram configuration
@@ -81,9 +96,18 @@ class EnhancedORBStockTradingBot:
         
         # Opening range data
         self.opening_ranges = {}
+        self.breakout_engine = BreakoutEngine(self.all_stocks)  # Same ranges as arrays for the breakout scan
+        self.opening_range_store = OpeningRangeStore()  # Today's ranges per market, survive a restart
+        self.opening_range_days = {}  # Market -> trading day its ranges were loaded for
         self.volume_averages = {}
         self.market_conditions = {}
         
+        # Shared indicator kernels, memoized per symbol/interval/bar
+        self.indicators = get_indicator_library()
+        
+        # Wakes the main loop on bar closes and session events (exchange calendars)
+        self.scheduler = ORBScheduler()
+        
         # Load existing data
         self.load_trades_data()
         
@@ -101,7 +125,8 @@ class EnhancedORBStockTradingBot:
         
         # Initialize rate-limited data fetcher
         if RATE_LIMITED_FETCHER_AVAILABLE:
-            self.data_fetcher = RateLimitedDataFetcher(base_delay=3.0, max_delay=15.0)
+            # Shared with the forex bot so concurrent requests are coalesced
+            self.data_fetcher = get_shared_fetcher(base_delay=3.0, max_delay=15.0)
             print("✅ Rate-Limited Data Fetcher initialized - Railway optimized")
         else:
             self.data_fetcher = None
@@ -145,11 +170,11 @@ class EnhancedORBStockTradingBot:
         except Exception as e:
             print(f"⚠️ Error saving trades data: {e}")
 
-    def get_stock_data(self, symbol, period="1d", interval="5m"):
+    def get_stock_data(self, symbol, period="1d", interval="5m", priority="scan"):
         """Get stock data from Yahoo Finance with rate limiting"""
         # Use rate-limited fetcher if available
         if self.data_fetcher:
-            data = self.data_fetcher.get_historical_data(symbol, period=period, interval=interval)
+            data = self.data_fetcher.get_historical_data(symbol, period=period, interval=interval, priority=priority)
             if data is not None and not data.empty:
                 return data
             return None
@@ -165,21 +190,82 @@ class EnhancedORBStockTradingBot:
             print(f"❌ Error getting data for {symbol}: {e}")
             return None
 
-    def calculate_atr(self, data, period=14):
+    def get_stock_data_batch(self, symbols, period="1d", interval="5m", priority="scan"):
+        """Get stock data for several symbols in one grouped request"""
+        if not symbols:
+            return {}
+        
+        # Use rate-limited fetcher if available
+        if self.data_fetcher:
+            return self.data_fetcher.get_historical_data_batch(symbols, period=period, interval=interval,
+                                                               priority=priority)
+        
+        # Fallback to fetching one symbol at a time
+        frames = {}
+        for symbol in symbols:
+            data = self.get_stock_data(symbol, period=period, interval=interval, priority=priority)
+            if data is not None:
+                frames[symbol] = data
+        return frames
+
+    def get_timeframes(self, symbol, intervals=("5m", "15m", "1h"), priority="scan"):
+        """Fetch 1-minute bars once and derive higher timeframes locally (session-aligned)"""
+        base_data = self.get_stock_data(symbol, period=BASE_PERIOD, interval=BASE_INTERVAL, priority=priority)
+        if base_data is None or base_data.empty:
+            return {}
+        
+        session = "UK" if symbol in self.uk_stocks else "US"
+        frames = resample_timeframes(base_data, intervals, session)
+        frames[BASE_INTERVAL] = base_data
+        return frames
+
+    def build_market_snapshot(self, active_stocks):
+        """
+        Gather this loop's market data in bulk: 1-minute bars for every active stock
+        (and open trade) in one batched request, plus one quote batch for open trades
+        """
+        start = time.perf_counter()
+        trade_symbols = list(dict.fromkeys(trade['symbol'] for trade in self.active_trades.values()))
+        symbols = list(dict.fromkeys(list(active_stocks) + trade_symbols))
+        
+        requests = 0
+        bars = {}
+        if symbols:
+            bars = self.get_stock_data_batch(symbols, period=BASE_PERIOD, interval=BASE_INTERVAL)
+            requests += 1
+        quotes = {}
+        if trade_symbols:
+            # Open positions jump the request queue
+            quotes = self.get_quotes(trade_symbols, priority="monitor")
+            requests += 1
+        
+        sessions = {symbol: "UK" if symbol in self.uk_stocks else "US" for symbol in symbols}
+        return MarketSnapshot(symbols, bars, quotes, sessions=sessions, base_interval=BASE_INTERVAL,
+                              requests=requests, build_seconds=time.perf_counter() - start)
+
+    def get_quotes(self, symbols, priority="scan"):
+        """Get last/bid/ask/timestamp for several symbols in one batched request"""
+        if not symbols:
+            return {}
+        
+        # Use rate-limited fetcher if available
+        if self.data_fetcher:
+            return self.data_fetcher.get_quotes(symbols, priority=priority)
+        
+        # Fallback to the last 1-minute close per symbol
+        quotes = {}
+        for symbol in symbols:
+            data = self.get_stock_data(symbol, period="1d", interval="1m", priority=priority)
+            if data is not None:
+                quotes[symbol] = {'last': float(data['Close'].iloc[-1]), 'bid': None, 'ask': None,
+                                  'timestamp': data.index[-1]}
+        return quotes
+
+    def calculate_atr(self, data, period=14, symbol=None, interval=None):
         """Calculate Average True Range for volatility measurement"""
         try:
-            high = data['High']
-            low = data['Low']
-            close = data['Close']
-            
-            tr1 = high - low
-            tr2 = abs(high - close.shift(1))
-            tr3 = abs(low - close.shift(1))
-            
-            tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = tr.rolling(window=period).mean()
-            
-            return atr
+            atr = self.indicators.atr(data, period, symbol=symbol, interval=interval)
+            return pd.Series(atr, index=data.index)
         except Exception as e:
             print(f"❌ Error calculating ATR: {e}")
             return pd.Series()
@@ -187,17 +273,18 @@ class EnhancedORBStockTradingBot:
     def get_market_condition(self, symbol, data):
         """Determine market condition for dynamic R:R"""
         try:
-            # Calculate ATR for volatility
-            atr = self.calculate_atr(data, 14)
-            if atr.empty:
+            # Calculate ATR for volatility (read off the memoized array, no Series per call)
+            atr = self.indicators.atr(data, 14, symbol=symbol, interval="5m")
+            if len(atr) == 0:
                 return "NORMAL", 2.5
             
-            current_atr = atr.iloc[-1]
-            avg_atr = atr.mean()
+            current_atr = atr[-1]
+            valid_atr = atr[~np.isnan(atr)]  # Series.mean() skips the warm-up NaNs
+            avg_atr = valid_atr.mean() if len(valid_atr) else np.nan
             
             # Calculate trend strength
-            ema_20 = data['Close'].ewm(span=20).mean()
-            trend_strength = abs(data['Close'].iloc[-1] - ema_20.iloc[-1]) / ema_20.iloc[-1]
+            ema_20 = self.indicators.ema(data, 20, symbol=symbol, interval="5m")[-1]
+            trend_strength = abs(field(data, 'Close')[-1] - ema_20) / ema_20
             
             # Determine condition and target R:R
             if current_atr > avg_atr * 1.5 and trend_strength > 0.02:
@@ -216,15 +303,15 @@ class EnhancedORBStockTradingBot:
     def enhanced_volume_analysis(self, symbol, data):
         """Enhanced volume analysis for better entries"""
         try:
-            current_volume = data['Volume'].iloc[-1]
-            avg_volume_20 = data['Volume'].tail(20).mean()
-            avg_volume_50 = data['Volume'].tail(50).mean()
+            current_volume = field(data, 'Volume')[-1]
+            avg_volume_5 = self.indicators.volume_average(data, 5, symbol=symbol, interval="5m")
+            avg_volume_20 = self.indicators.volume_average(data, 20, symbol=symbol, interval="5m")
             
             # Volume surge detection
             volume_surge = current_volume / avg_volume_20 if avg_volume_20 > 0 else 1
             
             # Volume trend
-            volume_trend = data['Volume'].tail(5).mean() / data['Volume'].tail(20).mean() if data['Volume'].tail(20).mean() > 0 else 1
+            volume_trend = avg_volume_5 / avg_volume_20 if avg_volume_20 > 0 else 1
             
             return {
                 'volume_surge': volume_surge,
@@ -243,12 +330,14 @@ class EnhancedORBStockTradingBot:
                 'current_volume': 0
             }
 
-    def get_higher_timeframe_bias(self, symbol):
+    def get_higher_timeframe_bias(self, symbol, frames=None):
         """Get 15-minute and 1-hour bias for confirmation"""
         try:
-            # 15-minute data for trend confirmation
-            data_15m = self.get_stock_data(symbol, period="2d", interval="15m")
-            data_1h = self.get_stock_data(symbol, period="5d", interval="1h")
+            # 15-minute and 1-hour bars derived from the shared 1-minute download
+            if frames is None:
+                frames = self.get_timeframes(symbol, intervals=("15m", "1h"))
+            data_15m = slice_period(frames.get("15m"), "2d")
+            data_1h = frames.get("1h")
             
             if data_15m is None or data_1h is None or data_15m.empty or data_1h.empty:
                 return {
@@ -258,13 +347,13 @@ class EnhancedORBStockTradingBot:
                 }
             
             # Calculate EMAs
-            ema_20_15m = data_15m['Close'].ewm(span=20).mean()
-            ema_20_1h = data_1h['Close'].ewm(span=20).mean()
+            ema_20_15m = self.indicators.ema(data_15m, 20, symbol=symbol, interval="15m")
+            ema_20_1h = self.indicators.ema(data_1h, 20, symbol=symbol, interval="1h")
             
-            current_price = data_15m['Close'].iloc[-1]
+            current_price = field(data_15m, 'Close')[-1]
             
-            bias_15m = "BULLISH" if current_price > ema_20_15m.iloc[-1] else "BEARISH"
-            bias_1h = "BULLISH" if current_price > ema_20_1h.iloc[-1] else "BEARISH"
+            bias_15m = "BULLISH" if current_price > ema_20_15m[-1] else "BEARISH"
+            bias_1h = "BULLISH" if current_price > ema_20_1h[-1] else "BEARISH"
             
             # Relaxed bias alignment: Just check 15m has clear direction (more realistic for ORB)
             return {
@@ -355,11 +444,12 @@ class EnhancedORBStockTradingBot:
             print(f"❌ Error checking opening range period: {e}")
             return False
 
-    def calculate_opening_range(self, symbol):
-        """Calculate opening range for a symbol"""
+    def calculate_opening_range(self, symbol, snapshot=None):
+        """Calculate opening range for a symbol (from the loop's snapshot when given)"""
         try:
             # Get 5-minute data for today
-            data = self.get_stock_data(symbol, period="1d", interval="5m")
+            frames = snapshot.timeframes(symbol) if snapshot is not None else self.get_timeframes(symbol, intervals=("5m",))
+            data = slice_period(frames.get("5m"), "1d")
             if data is None or data.empty:
                 return None
             
@@ -373,8 +463,8 @@ class EnhancedORBStockTradingBot:
             orl = opening_data['Low'].min()
             range_size = orh - orl
             
-            # Calculate volume average
-            volume_avg = data['Volume'].tail(20).mean() if len(data) >= 20 else data['Volume'].mean()
+            # Calculate volume average (all of today's bars until there are 20)
+            volume_avg = self.indicators.volume_average(data, 20, symbol=symbol, interval="5m")
             
             opening_range = {
                 'symbol': symbol,
@@ -386,17 +476,81 @@ class EnhancedORBStockTradingBot:
             }
             
             self.opening_ranges[symbol] = opening_range
+            self.breakout_engine.set_range(symbol, opening_range)
             return opening_range
             
         except Exception as e:
             print(f"❌ Error calculating opening range for {symbol}: {e}")
             return None
 
-    def enhanced_entry_conditions(self, symbol, current_price, current_volume):
+    def update_opening_ranges(self, market, snapshot=None, now=None):
+        """
+        Bulk opening-range job for one market ("UK"/"US"), run once per trading day:
+        today's stored ranges if there are any (e.g. after a restart), else the 1-minute
+        bars of all its stocks (from the loop's snapshot, or one batched request) once
+        the opening range has closed. Stocks without bars yet are retried on later loops
+        until the ORB cutoff; only then is the day's set final.
+        """
+        now = now or datetime.now(pytz.utc)
+        day = trading_day(market, now)
+        if self.opening_range_days.get(market) == day:
+            return
+        
+        stocks = self.uk_stocks if market == "UK" else self.us_stocks
+        ranges = self.opening_range_store.get(market, day)
+        if ranges is not None and self.opening_range_store.is_complete(market, day):
+            print(f"📂 Reusing {len(ranges)} {market} opening ranges from {day}")
+        else:
+            if ranges is None:
+                # Drop the previous day's ranges so nothing breaks out against them
+                for symbol in stocks:
+                    self.opening_ranges.pop(symbol, None)
+                self.breakout_engine.clear(stocks)
+                if now < opening_range_end(market, day):
+                    return  # Opening range still forming
+                ranges = {}
+            
+            # Only the stocks still without a range (all of them the first time)
+            pending = [symbol for symbol in stocks if symbol not in ranges]
+            print(f"📊 Opening range closed ({market}), calculating ranges for {len(pending)} stocks...")
+            if snapshot is not None:
+                frames = {symbol: snapshot.bars[symbol] for symbol in pending if symbol in snapshot}
+            else:
+                frames = self.get_stock_data_batch(pending, period="1d", interval=BASE_INTERVAL)
+            ranges.update(compute_opening_ranges(BarPanel.from_frames(frames), market, day))
+            
+            missing = [symbol for symbol in stocks if symbol not in ranges]
+            complete = not missing or self.scheduler.breakout_window_closed(
+                market, session_open(market, day).to_pydatetime(), now)
+            if missing and not complete:
+                print(f"⚠️ No opening range for {', '.join(missing)} yet, retrying next loop")
+            elif missing:
+                print(f"⚠️ No opening range for {', '.join(missing)} (ORB cutoff passed)")
+            if not ranges and not complete:
+                return
+            self.opening_range_store.put(market, day, ranges, complete=complete)
+        
+        # Ranges found so far trade right away; the day is done once the set is final
+        for symbol, opening_range in ranges.items():
+            self.opening_ranges[symbol] = opening_range
+        self.breakout_engine.load(ranges)
+        if self.opening_range_store.is_complete(market, day):
+            self.opening_range_days[market] = day
+
+    def scan_breakouts(self, panel):
+        """
+        Breakout flags for every symbol of a 1-minute BarPanel in one array pass:
+        ORH/ORL crossing, volume surge and 15m bias alignment (see BreakoutEngine)
+        """
+        return self.breakout_engine.evaluate_panel(panel)
+
+    def enhanced_entry_conditions(self, symbol, current_price, current_volume, snapshot=None):
         """Enhanced entry conditions with multiple confirmations"""
         try:
-            # Get current data for analysis
-            data = self.get_stock_data(symbol, period="1d", interval="5m")
+            # Get current data for analysis (every timeframe comes from one 1-minute download,
+            # already in the loop's snapshot when given)
+            frames = snapshot.timeframes(symbol) if snapshot is not None else self.get_timeframes(symbol)
+            data = slice_period(frames.get("5m"), "1d")
             if data is None or data.empty:
                 return None, "No data available"
             
@@ -407,7 +561,7 @@ class EnhancedORBStockTradingBot:
             volume_analysis = self.enhanced_volume_analysis(symbol, data)
             
             # Get higher timeframe bias
-            bias_analysis = self.get_higher_timeframe_bias(symbol)
+            bias_analysis = self.get_higher_timeframe_bias(symbol, frames)
             
             # Check basic breakout
             if symbol not in self.opening_ranges:
@@ -610,46 +764,54 @@ class EnhancedORBStockTradingBot:
             print(f"❌ Error executing trade: {e}")
             return False, str(e)
 
-    def monitor_active_trades(self):
-        """Monitor and manage active trades with enhanced logic"""
+    def monitor_active_trades(self, snapshot=None):
+        """
+        Monitor and manage active trades with enhanced logic: stop/target touches along
+        the 1-minute high/low path since each trade was last checked, then the latest price
+        """
         try:
+            symbols = list({trade['symbol'] for trade in self.active_trades.values()})
+            if snapshot is None:
+                # One quote and one bar request for every open position (open positions jump the request queue)
+                quotes = self.get_quotes(symbols, priority="monitor")
+                prices = {symbol: quote['last'] for symbol, quote in quotes.items()}
+                bars = self.get_stock_data_batch(symbols, period="1d", interval=BASE_INTERVAL, priority="monitor")
+            else:
+                prices = {symbol: snapshot.price(symbol) for symbol in symbols}
+                bars = {symbol: snapshot.bars.get(symbol) for symbol in symbols}
+            
+            checked_at = datetime.now().isoformat()
             for trade_id, trade in list(self.active_trades.items()):
                 symbol = trade['symbol']
                 
-                # Get current price
-                data = self.get_stock_data(symbol, period="1d", interval="1m")
-                if data is None or data.empty:
+                # Bars since the last check (or entry); without either only the current price counts
+                since = trade.get('last_checked') or trade.get('timestamp')
+                path = bars.get(symbol) if since else None
+                current_price = prices.get(symbol)
+                if current_price is None and path is None:
                     continue
                 
-                current_price = float(data['Close'].iloc[-1])
+                # Stop and targets in the order the path touched them (stop first if a bar hit both)
+                events = trade_path_events(
+                    path, trade['direction'], trade['current_stop'],
+                    [trade['target1'], trade['target2'], trade['target3']],
+                    hit=[level for level, key in ((1, 'tp1_hit'), (2, 'tp2_hit')) if trade[key]],
+                    since=since, price=current_price, breakeven=trade['entry_price']
+                )
+                trade['last_checked'] = checked_at
                 
-                # Check stop loss
-                if trade['direction'] == 'LONG' and current_price <= trade['current_stop']:
-                    self.close_trade(trade_id, current_price, "Stop Loss Hit")
-                    continue
-                elif trade['direction'] == 'SHORT' and current_price >= trade['current_stop']:
-                    self.close_trade(trade_id, current_price, "Stop Loss Hit")
+                for event in events:
+                    if event['type'] == 'stop':
+                        self.close_trade(trade_id, event['price'], "Stop Loss Hit")
+                    elif event['level'] == 3:
+                        self.close_trade(trade_id, event['price'], "Target 3 Hit")
+                    else:
+                        self.hit_take_profit(trade_id, event['level'], event['price'])
+                if trade_id not in self.active_trades:
                     continue
                 
-                # Check take profit targets with enhanced logic
-                if trade['direction'] == 'LONG':
-                    if not trade['tp1_hit'] and current_price >= trade['target1']:
-                        self.hit_take_profit(trade_id, 1, current_price)
-                    elif not trade['tp2_hit'] and current_price >= trade['target2']:
-                        self.hit_take_profit(trade_id, 2, current_price)
-                    elif current_price >= trade['target3']:
-                        self.close_trade(trade_id, current_price, "Target 3 Hit")
-                
-                elif trade['direction'] == 'SHORT':
-                    if not trade['tp1_hit'] and current_price <= trade['target1']:
-                        self.hit_take_profit(trade_id, 1, current_price)
-                    elif not trade['tp2_hit'] and current_price <= trade['target2']:
-                        self.hit_take_profit(trade_id, 2, current_price)
-                    elif current_price <= trade['target3']:
-                        self.close_trade(trade_id, current_price, "Target 3 Hit")
-                
-                # Enhanced trailing stop after TP1
-                if trade['tp1_hit'] and not trade['tp2_hit']:
+                # Enhanced trailing stop after TP1 (TP1 and TP2 can now land in the same check)
+                if trade['tp1_hit']:
                     if trade['direction'] == 'LONG':
                         new_stop = trade['entry_price']  # Breakeven
                         if new_stop > trade['current_stop']:
@@ -658,6 +820,10 @@ class EnhancedORBStockTradingBot:
                         new_stop = trade['entry_price']  # Breakeven
                         if new_stop < trade['current_stop']:
                             trade['current_stop'] = new_stop
+            
+            # Keep last_checked so a restart doesn't rescan bars that were already checked
+            if self.active_trades:
+                self.save_trades_data()
                 
         except Exception as e:
             print(f"❌ Error monitoring trades: {e}")
@@ -772,6 +938,49 @@ class EnhancedORBStockTradingBot:
         except Exception as e:
             print(f"❌ Error closing trade: {e}")
 
+    def send_market_notifications(self, at=None):
+        """
+        Holiday, market open and close notifications (each checks its own time window)
+        at: when the notification was due (the scheduler's wake-up), so a late loop still sends it
+        """
+        if not self.daily_summary:
+            return
+        
+        # Check for holiday notification (9 AM Dubai)
+        if self.daily_summary.should_send_holiday_notification(at):
+            print("🏖️ Sending market holiday notification...")
+            holiday_msg = self.daily_summary.get_holiday_notification()
+            self.daily_summary.send_telegram_message(holiday_msg)
+        
+        # UK market open notification (12:00 PM Dubai)
+        if self.daily_summary.should_send_uk_open_notification(at):
+            print("🇬🇧 Sending UK market open notification...")
+            uk_open = self.daily_summary.get_stock_uk_market_open_notification()
+            self.daily_summary.send_telegram_message(uk_open)
+        
+        # US market open notification (6:30 PM Dubai)
+        if self.daily_summary.should_send_us_open_notification(at):
+            print("🇺🇸 Sending US market open notification...")
+            us_open = self.daily_summary.get_stock_us_market_open_notification()
+            self.daily_summary.send_telegram_message(us_open)
+        
+        if self.daily_summary.should_send_uk_close_notification(at):
+            print("🇬🇧 Sending UK market close notification...")
+            uk_summary = self.daily_summary.get_stock_uk_market_close_summary()
+            self.daily_summary.send_telegram_message(uk_summary)
+        
+        # US early warning (10 PM Dubai - before bed)
+        if self.daily_summary.should_send_us_early_warning(at):
+            print("🇺🇸 Sending US early warning (10 PM)...")
+            us_early = self.daily_summary.get_stock_us_early_warning()
+            self.daily_summary.send_telegram_message(us_early)
+        
+        # US final warning (12:45 AM Dubai - 15 min before close)
+        if self.daily_summary.should_send_us_close_notification(at):
+            print("🇺🇸 Sending US final close warning (12:45 AM)...")
+            us_summary = self.daily_summary.get_stock_us_market_close_summary()
+            self.daily_summary.send_telegram_message(us_summary)
+
     def run(self):
         """Main bot loop with enhanced session management"""
         print("🚀 Enhanced ORB Stock Trading Bot started")
@@ -798,66 +1007,65 @@ class EnhancedORBStockTradingBot:
         
         self.send_telegram_message(startup_message)
         
-        last_opening_range_calc = None
+        wakeup = None  # First pass runs every check
         
-        while True:
+        while not self.scheduler.stopped:
             try:
+                # Notifications first, checked at the time they were due: their windows are a
+                # minute or so wide, and the data work below can run past them
+                if wakeup is None or wakeup.has_kind("notification"):
+                    self.send_market_notifications(wakeup.at if wakeup is not None else None)
+                
                 # Get current session info
                 sessions = self.get_optimal_trading_sessions()
                 active_stocks = self.get_active_stocks_for_session()
                 
                 if not active_stocks:
                     print("⏰ No active trading sessions")
-                    time.sleep(300)  # Check every 5 minutes when no sessions
+                    wakeup = self.scheduler.wait(trades_open=bool(self.active_trades))
                     continue
                 
                 print(f"📊 Active stocks: {len(active_stocks)} ({'UK' if sessions['uk_session'] else ''}{'US' if sessions['us_session'] else ''})")
                 
-                # Calculate opening ranges during opening period
-                for symbol in active_stocks:
-                    if self.is_opening_range_period(symbol):
-                        if last_opening_range_calc != datetime.now().date():
-                            print(f"📊 Calculating opening range for {symbol}...")
-                            self.calculate_opening_range(symbol)
-                        last_opening_range_calc = datetime.now().date()
+                # Everything this loop reads comes from one bulk snapshot
+                loop_start = time.perf_counter()
+                snapshot = self.build_market_snapshot(active_stocks)
+                
+                # Opening ranges: one bulk job per market once its opening range has closed
+                # (the scheduler wakes the loop then); reused from disk after a restart
+                for market, in_session in (("UK", sessions['uk_session']), ("US", sessions['us_session'])):
+                    if in_session:
+                        self.update_opening_ranges(market, snapshot)
                 
                 # Monitor active trades
                 if self.active_trades:
-                    self.monitor_active_trades()
+                    self.monitor_active_trades(snapshot)
                 
-                # Check for new breakouts (only after opening range period)
-                for symbol in active_stocks:
-                    if symbol in self.opening_ranges:
+                # Check for new breakouts (only after opening range period); crossings found by
+                # the cross-sectional scan go through the full confirmation
+                signals = self.scan_breakouts(snapshot.panel)
+                if signals.crossings():
+                    print(f"🎯 Breakout scan: {signals.describe()}")
+                
+                for symbol in signals.flagged():
+                    if symbol in active_stocks and symbol in self.opening_ranges:
                         # Check if market is open for this symbol
                         is_open, market_name = self.is_market_open(symbol)
                         if not is_open:
                             continue
                         
                         # ORB Time Window Check: Only trade first 2.5 hours after opening range
-                        dubai_time = datetime.now(self.dubai_tz)
+                        # (UK 8:30 - 11:00 AM London, US 10:00 AM - 12:30 PM New York; the
+                        # scheduler's breakout window, on the exchange clock through DST)
+                        if not self.scheduler.in_breakout_window("UK" if symbol in self.uk_stocks else "US"):
+                            continue  # Past optimal ORB window
                         
-                        if symbol in self.uk_stocks:
-                            # UK: 8:30 AM - 11:00 AM GMT (12:30 PM - 3:00 PM Dubai)
-                            cutoff_time = dubai_time.replace(hour=15, minute=0, second=0, microsecond=0)
-                            if dubai_time > cutoff_time:
-                                continue  # Past optimal ORB window
-                        else:  # US stocks
-                            # US: 10:00 AM - 12:30 PM EST (7:00 PM - 9:30 PM Dubai)
-                            cutoff_time = dubai_time.replace(hour=21, minute=30, second=0, microsecond=0)
-                            if dubai_time > cutoff_time:
-                                continue  # Past optimal ORB window
-                        
-                        # Get current data
-                        data = self.get_stock_data(symbol, period="1d", interval="1m")
-                        if data is None or data.empty:
-                            continue
-                        
-                        current_price = float(data['Close'].iloc[-1])
-                        current_volume = float(data['Volume'].iloc[-1])
+                        # Latest bar from the snapshot (flagged symbols always have one)
+                        current_price, current_volume = signals.latest(symbol)
                         
                         # Check for enhanced breakout
                         breakout_data, message = self.enhanced_entry_conditions(
-                            symbol, current_price, current_volume
+                            symbol, current_price, current_volume, snapshot=snapshot
                         )
                         
                         if breakout_data:
@@ -874,61 +1082,26 @@ class EnhancedORBStockTradingBot:
                                 else:
                                     print(f"❌ Trade failed: {result}")
                 
-                # Check for market notifications
-                if self.daily_summary:
-                    # Check for holiday notification (9 AM Dubai)
-                    if self.daily_summary.should_send_holiday_notification():
-                        print("🏖️ Sending market holiday notification...")
-                        holiday_msg = self.daily_summary.get_holiday_notification()
-                        self.daily_summary.send_telegram_message(holiday_msg)
-                    
-                    # UK market open notification (12:00 PM Dubai)
-                    if self.daily_summary.should_send_uk_open_notification():
-                        print("🇬🇧 Sending UK market open notification...")
-                        uk_open = self.daily_summary.get_stock_uk_market_open_notification()
-                        self.daily_summary.send_telegram_message(uk_open)
-                    
-                    # US market open notification (6:30 PM Dubai)
-                    if self.daily_summary.should_send_us_open_notification():
-                        print("🇺🇸 Sending US market open notification...")
-                        us_open = self.daily_summary.get_stock_us_market_open_notification()
-                        self.daily_summary.send_telegram_message(us_open)
-                    
-                    if self.daily_summary.should_send_uk_close_notification():
-                        print("🇬🇧 Sending UK market close notification...")
-                        uk_summary = self.daily_summary.get_stock_uk_market_close_summary()
-                        self.daily_summary.send_telegram_message(uk_summary)
-                    
-                    # US early warning (10 PM Dubai - before bed)
-                    if self.daily_summary.should_send_us_early_warning():
-                        print("🇺🇸 Sending US early warning (10 PM)...")
-                        us_early = self.daily_summary.get_stock_us_early_warning()
-                        self.daily_summary.send_telegram_message(us_early)
-                    
-                    # US final warning (12:45 AM Dubai - 15 min before close)
-                    if self.daily_summary.should_send_us_close_notification():
-                        print("🇺🇸 Sending US final close warning (12:45 AM)...")
-                        us_summary = self.daily_summary.get_stock_us_market_close_summary()
-                        self.daily_summary.send_telegram_message(us_summary)
+                # Close positions at the end of their market's day (the scheduler's EOD flatten:
+                # 4:45 PM London, 4:00 PM New York)
+                for trade_id in list(self.active_trades.keys()):
+                    trade = self.active_trades[trade_id]
+                    if self.scheduler.session_ended("UK" if trade['symbol'] in self.uk_stocks else "US"):
+                        price = snapshot.price(trade['symbol'])
+                        if price is not None:
+                            self.close_trade(trade_id, price, "End of Day Close")
                 
-                # Close all positions before market close
-                dubai_time = datetime.now(self.dubai_tz)
-                if (dubai_time.hour == 20 and dubai_time.minute >= 45) or (dubai_time.hour == 1 and dubai_time.minute >= 0):
-                    for trade_id in list(self.active_trades.keys()):
-                        trade = self.active_trades[trade_id]
-                        data = self.get_stock_data(trade['symbol'], period="1d", interval="1m")
-                        if data is not None and not data.empty:
-                            current_price = float(data['Close'].iloc[-1])
-                            self.close_trade(trade_id, current_price, "End of Day Close")
+                print(f"⏱️ Loop took {time.perf_counter() - loop_start:.2f}s (snapshot: {snapshot.describe()})")
                 
-                time.sleep(240)  # Check every 4 minutes (safe rate limiting with 24 stocks)
+                # Sleep until the next bar close or session event instead of a fixed 4 minutes
+                wakeup = self.scheduler.wait(trades_open=bool(self.active_trades))
                 
             except KeyboardInterrupt:
                 print("\n🛑 Bot stopped by user")
                 break
             except Exception as e:
                 print(f"❌ Error in main loop: {e}")
-                time.sleep(240)
+                wakeup = self.scheduler.wait(trades_open=bool(self.active_trades), min_seconds=60)
 
 if __name__ == "__main__":
     bot = EnhancedORBStockTradingBot()
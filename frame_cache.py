@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+In-Process Frame Cache
+Bounded TTL/LRU cache for downloaded price frames keyed by (symbol, period, interval)
+- Entries expire based on the bar interval (1m data goes stale faster than 1h)
+- Size and memory caps with least-recently-used eviction
+- One shared instance per process so both bots reuse each other's downloads
+"""
+
+import os
+import time
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Union
+
+import pandas as pd
+
+from bars import Bars
+
+logger = logging.getLogger(__name__)
+
+# Seconds a cached frame stays fresh, per bar interval
+DEFAULT_INTERVAL_TTLS = {
+    "1m": 30,
+    "2m": 45,
+    "5m": 60,
+    "15m": 120,
+    "30m": 300,
+    "60m": 300,
+    "90m": 300,
+    "1h": 300,
+    "1d": 1800,
+    "5d": 3600,
+    "1wk": 3600,
+    "1mo": 3600,
+}
+DEFAULT_TTL = 60
+
+def _share(frame):
+    """Hand out a frame as a shallow copy; read-only Bars are shared as-is"""
+    return frame if isinstance(frame, Bars) else frame.copy(deep=False)
+
+class FrameCache:
+    """Thread-safe TTL + LRU cache for pandas frames"""
+
+    def __init__(self, max_entries: int = 256, max_bytes: int = 64 * 1024 * 1024,
+                 interval_ttls: Optional[Dict[str, float]] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.interval_ttls = dict(DEFAULT_INTERVAL_TTLS)
+        if interval_ttls:
+            self.interval_ttls.update(interval_ttls)
+        
+        self._entries = OrderedDict()  # key -> (frame, expires_at, nbytes)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def ttl_for(self, interval: str) -> float:
+        """Freshness window for a bar interval"""
+        return self.interval_ttls.get(interval, DEFAULT_TTL)
+
+    def get(self, key: Tuple) -> Optional[Union[pd.DataFrame, Bars]]:
+        """
+        Return a cached frame or None
+        Frames go in and come out as shallow copies, so a caller adding
+        columns never leaks into the cache.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            
+            frame, expires_at, nbytes = entry
+            if time.monotonic() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _share(frame)
+
+    def put(self, key: Tuple, frame: Union[pd.DataFrame, Bars], interval: str):
+        """Cache a frame (or Bars); expiry is derived from the bar interval"""
+        if frame is None or frame.empty:
+            return
+        
+        if isinstance(frame, Bars):
+            nbytes = frame.nbytes
+        else:
+            nbytes = int(frame.memory_usage(index=True, deep=False).sum())
+        if nbytes > self.max_bytes:
+            return  # Would evict everything else, not worth caching
+        
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            
+            expires_at = time.monotonic() + self.ttl_for(interval)
+            self._entries[key] = (_share(frame), expires_at, nbytes)
+            self._bytes += nbytes
+            
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest_key = next(iter(self._entries))
+                self._remove(oldest_key)
+                self.evictions += 1
+
+    def _remove(self, key: Tuple):
+        """Drop an entry (caller holds the lock)"""
+        frame, expires_at, nbytes = self._entries.pop(key)
+        self._bytes -= nbytes
+
+    def clear(self):
+        """Drop every cached frame"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current footprint for monitoring"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations
+            }
+
+_shared_cache = None
+_shared_cache_lock = threading.Lock()
+
+def get_shared_frame_cache() -> FrameCache:
+    """Process-wide cache shared by every fetcher (sized from env vars)"""
+    global _shared_cache
+    with _shared_cache_lock:
+        if _shared_cache is None:
+            max_entries = int(os.getenv("FRAME_CACHE_MAX_ENTRIES", "256"))
+            max_mb = float(os.getenv("FRAME_CACHE_MAX_MB", "64"))
+            _shared_cache = FrameCache(max_entries=max_entries, max_bytes=int(max_mb * 1024 * 1024))
+            logger.info(f"✅ Shared frame cache initialized ({max_entries} entries, {max_mb:.0f} MB)")
+        return _shared_cache
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+Shared Indicator Library
+One implementation of the indicators every strategy uses (ATR, EMA, RSI, pivots, volume averages)
+- Kernels work on NumPy arrays: no per-indicator pd.concat / rolling objects
+- Results are memoized per (symbol, interval, bar window), so an indicator is
+  computed once per new bar no matter how many strategies ask for it
+- Kernels follow the pandas conventions the bots used (rolling min_periods, ewm adjust=True)
+"""
+
+import os
+import threading
+import logging
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple, Callable, Union
+
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from bars import Bars, field
+from zone_engine import find_pivots
+
+logger = logging.getLogger(__name__)
+
+# Chunk length for the closed-form recursive filter (keeps beta**-k well inside float range)
+DECAY_CHUNK = 256
+
+def _as_float_array(values) -> np.ndarray:
+    return np.asarray(values, dtype="float64")
+
+def decay_sum(values: np.ndarray, beta: float) -> np.ndarray:
+    """
+    s[t] = values[t] + beta * s[t-1] for the whole array
+    Evaluated chunk by chunk in closed form (cumsum of values * beta**-k),
+    so there is no Python loop per bar.
+    """
+    values = _as_float_array(values)
+    n = len(values)
+    result = np.empty(n)
+    if n == 0:
+        return result
+    if beta == 0:
+        result[:] = values
+        return result
+    
+    powers = beta ** np.arange(min(DECAY_CHUNK, n))
+    carry = 0.0
+    for start in range(0, n, DECAY_CHUNK):
+        chunk = values[start:start + DECAY_CHUNK]
+        scale = powers[:len(chunk)]
+        sums = np.cumsum(chunk / scale)
+        result[start:start + len(chunk)] = scale * (beta * carry + sums)
+        carry = result[start + len(chunk) - 1]
+    return result
+
+def true_range(high, low, close) -> np.ndarray:
+    """max(high - low, |high - prev close|, |low - prev close|); the first bar is high - low"""
+    high, low, close = _as_float_array(high), _as_float_array(low), _as_float_array(close)
+    prev_close = np.concatenate([[np.nan], close[:-1]])
+    # fmax skips NaN like DataFrame.max(axis=1)
+    return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+def rolling_window(values, window: int, how: str) -> np.ndarray:
+    """Trailing rolling mean/sum/max/min; NaN until the window is full or if it holds a NaN"""
+    values = _as_float_array(values)
+    result = np.full(len(values), np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    
+    windows = sliding_window_view(values, window)
+    reducer = {"mean": np.mean, "sum": np.sum, "max": np.max, "min": np.min}[how]
+    result[window - 1:] = reducer(windows, axis=1)
+    return result
+
+def rolling_mean(values, window: int) -> np.ndarray:
+    return rolling_window(values, window, "mean")
+
+def ema(values, span: float) -> np.ndarray:
+    """Exponential moving average, same as Series.ewm(span=span).mean() (adjust=True)"""
+    values = _as_float_array(values)
+    beta = 1 - 2.0 / (span + 1)
+    valid = ~np.isnan(values)
+    numerator = decay_sum(np.where(valid, values, 0.0), beta)
+    denominator = decay_sum(valid.astype("float64"), beta)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(denominator > 0, numerator / denominator, np.nan)
+
+def wilder_smooth(values, period: int) -> np.ndarray:
+    """
+    Wilder's smoothing: the first value is the mean of the first `period` values,
+    then avg = (avg * (period - 1) + value) / period
+    """
+    values = _as_float_array(values)
+    result = np.full(len(values), np.nan)
+    if len(values) < period:
+        return result
+    
+    seeded = np.empty(len(values) - period + 1)
+    seeded[0] = values[:period].mean()
+    seeded[1:] = values[period:] / period
+    result[period - 1:] = decay_sum(seeded, 1 - 1.0 / period)
+    return result
+
+def atr(high, low, close, period: int = 14, method: str = "sma") -> np.ndarray:
+    """Average True Range: rolling mean of true range ("sma") or Wilder's smoothing ("wilder")"""
+    tr = true_range(high, low, close)
+    if method == "wilder":
+        return wilder_smooth(tr, period)
+    return rolling_mean(tr, period)
+
+def rsi(close, period: int = 14) -> np.ndarray:
+    """Wilder RSI (0-100); the first `period` bars are NaN"""
+    close = _as_float_array(close)
+    result = np.full(len(close), np.nan)
+    if len(close) <= period:
+        return result
+    
+    delta = np.diff(close)
+    avg_gain = wilder_smooth(np.where(delta > 0, delta, 0.0), period)
+    avg_loss = wilder_smooth(np.where(delta < 0, -delta, 0.0), period)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        rs = avg_gain / avg_loss
+        values = np.where(avg_loss == 0, 100.0, 100 - 100 / (1 + rs))
+    result[1:] = np.where(np.isnan(avg_gain) | np.isnan(avg_loss), np.nan, values)
+    return result
+
+def tail_mean(values, window: int) -> float:
+    """Mean of the last `window` values, skipping NaN (like Series.tail(window).mean())"""
+    tail = _as_float_array(values)[-window:]
+    tail = tail[~np.isnan(tail)]
+    return float(tail.mean()) if len(tail) else float("nan")
+
+class IndicatorLibrary:
+    """
+    Indicators over OHLCV frames or Bars, memoized per (symbol, interval, bar window)
+    The memo key covers the first/last bar timestamps, the bar count and the last
+    bar's values, so a still-forming bar or a differently sliced frame never hits
+    a stale entry. Arrays handed out are read-only.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+
+    def _window_key(self, df: Union[Bars, pd.DataFrame]) -> Tuple:
+        if isinstance(df, Bars):
+            # Read straight off the arrays (bytes compare NaN-safe)
+            return (int(df.epoch[0]), int(df.epoch[-1]), len(df), df.values[:, -1].tobytes())
+        last = df.iloc[-1]
+        last_values = tuple(float(last[column]) for column in ("Open", "High", "Low", "Close", "Volume") if column in df)
+        return (df.index[0], df.index[-1], len(df), last_values)
+
+    def _memo(self, symbol: Optional[str], interval: Optional[str], df: pd.DataFrame,
+              name: str, params: Tuple, compute: Callable[[], Any]):
+        """Cached result for a symbol's bar window, or compute and remember it"""
+        if symbol is None:
+            return compute()
+        
+        key = (symbol, interval, name, params) + self._window_key(df)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        
+        value = compute()
+        for array in (value if isinstance(value, tuple) else (value,)):
+            if isinstance(array, np.ndarray):
+                array.flags.writeable = False
+        
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def atr(self, df: pd.DataFrame, period: int = 14, symbol: Optional[str] = None,
+            interval: Optional[str] = None, method: str = "sma") -> np.ndarray:
+        """ATR series aligned with df"""
+        return self._memo(symbol, interval, df, "atr", (period, method), lambda: atr(
+            field(df, 'High'), field(df, 'Low'), field(df, 'Close'), period, method
+        ))
+
+    def ema(self, df: pd.DataFrame, span: int = 20, column: str = 'Close',
+            symbol: Optional[str] = None, interval: Optional[str] = None) -> np.ndarray:
+        """EMA series aligned with df"""
+        return self._memo(symbol, interval, df, "ema", (span, column), lambda: ema(field(df, column), span))
+
+    def rsi(self, df: pd.DataFrame, period: int = 14, symbol: Optional[str] = None,
+            interval: Optional[str] = None) -> np.ndarray:
+        """RSI series aligned with df"""
+        return self._memo(symbol, interval, df, "rsi", (period,), lambda: rsi(field(df, 'Close'), period))
+
+    def pivots(self, df: pd.DataFrame, symbol: Optional[str] = None,
+               interval: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(pivot high, pivot low) masks from the centred 5-bar window"""
+        return self._memo(symbol, interval, df, "pivots", (), lambda: (
+            find_pivots(field(df, 'High'), highs=True),
+            find_pivots(field(df, 'Low'), highs=False)
+        ))
+
+    def volume_average(self, df: pd.DataFrame, window: int = 20, symbol: Optional[str] = None,
+                       interval: Optional[str] = None) -> float:
+        """Mean volume of the last `window` bars"""
+        return self._memo(symbol, interval, df, "volume_average", (window,),
+                          lambda: tail_mean(field(df, 'Volume'), window))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Memo hit rate for monitoring"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0
+            }
+
+_shared_library = None
+_shared_library_lock = threading.Lock()
+
+def get_indicator_library() -> IndicatorLibrary:
+    """Process-wide indicator library (memo size from INDICATOR_CACHE_ENTRIES)"""
+    global _shared_library
+    with _shared_library_lock:
+        if _shared_library is None:
+            _shared_library = IndicatorLibrary(max_entries=int(os.getenv("INDICATOR_CACHE_ENTRIES", "2048")))
+        return _shared_library
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Per-Loop Market Snapshot
+Everything one ORB loop iteration needs, fetched in bulk once and then only read
+- 1-minute bars for every active stock in one batched request (5m/15m/1h are
+  derived from them locally, so one batch covers every interval)
+- Quotes for symbols with open trades in one batched request
+- A 1-minute BarPanel for the cross-sectional breakout scan
+Downstream methods read from the snapshot instead of fetching again, so a symbol
+is no longer downloaded separately by the breakout check, entry confirmation,
+bias check and trade monitor.
+"""
+
+import time
+from types import MappingProxyType
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from bar_resampler import resample_timeframes
+from panel import BarPanel
+
+# Timeframes the ORB confirmations read
+DEFAULT_INTERVALS = ("5m", "15m", "1h")
+
+class MarketSnapshot:
+    """
+    Immutable bars/quotes for one loop iteration
+    Attributes can't be reassigned and the mappings are read-only proxies. The
+    frames are shared between readers and must be treated as read-only too.
+    """
+    
+    __slots__ = ("taken_at", "symbols", "base_interval", "bars", "quotes", "panel", "sessions",
+                 "requests", "build_seconds", "_latest", "_timeframes")
+
+    def __init__(self, symbols: Iterable[str], bars: Dict[str, pd.DataFrame], quotes: Dict[str, Dict],
+                 sessions: Optional[Dict[str, str]] = None, base_interval: str = "1m",
+                 requests: int = 0, build_seconds: float = 0.0, taken_at: Optional[float] = None):
+        bars = {symbol: frame for symbol, frame in bars.items() if frame is not None and not frame.empty}
+        assign = object.__setattr__
+        assign(self, "taken_at", time.time() if taken_at is None else taken_at)
+        assign(self, "symbols", tuple(symbols))
+        assign(self, "base_interval", base_interval)
+        assign(self, "bars", MappingProxyType(bars))
+        assign(self, "quotes", MappingProxyType(dict(quotes)))
+        assign(self, "panel", BarPanel.from_frames(bars))
+        assign(self, "_latest", dict(zip(self.panel.symbols, zip(self.panel.last('Close'), self.panel.last('Volume')))))
+        assign(self, "sessions", MappingProxyType(dict(sessions or {})))
+        assign(self, "requests", requests)            # Batched requests made to build it
+        assign(self, "build_seconds", build_seconds)
+        assign(self, "_timeframes", {})               # Derived frames, memoized per symbol
+
+    def __setattr__(self, name, value):
+        raise AttributeError("MarketSnapshot is immutable")
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.bars
+
+    def timeframes(self, symbol: str, intervals: Tuple[str, ...] = DEFAULT_INTERVALS) -> Mapping[str, pd.DataFrame]:
+        """
+        Base bars plus the requested timeframes resampled from them (session-aligned),
+        the same frames EnhancedORBStockTradingBot.get_timeframes would return
+        """
+        base = self.bars.get(symbol)
+        if base is None:
+            return MappingProxyType({})
+        
+        key = (symbol, tuple(intervals))
+        frames = self._timeframes.get(key)
+        if frames is None:
+            frames = resample_timeframes(base, intervals, self.sessions.get(symbol, "US"))
+            frames[self.base_interval] = base
+            frames = MappingProxyType(frames)
+            self._timeframes[key] = frames
+        return frames
+
+    def frame(self, symbol: str, interval: str) -> Optional[pd.DataFrame]:
+        """One timeframe of a symbol (None if the batch had no bars for it)"""
+        if interval == self.base_interval:
+            return self.bars.get(symbol)
+        return self.timeframes(symbol, (interval,)).get(interval)
+
+    def latest(self, symbol: str) -> Optional[Tuple[float, float]]:
+        """Last 1-minute (price, volume) of a symbol"""
+        price, volume = self._latest.get(symbol, (np.nan, np.nan))
+        if np.isnan(price):
+            return None
+        return float(price), float(volume)
+
+    def price(self, symbol: str) -> Optional[float]:
+        """Quote if one was taken for the symbol, else the last 1-minute close"""
+        quote = self.quotes.get(symbol)
+        if quote is not None and quote.get('last') is not None:
+            return float(quote['last'])
+        latest = self.latest(symbol)
+        return latest[0] if latest else None
+
+    def describe(self) -> str:
+        return (f"{len(self.bars)}/{len(self.symbols)} symbols, {len(self.quotes)} quotes, "
+                f"{self.requests} requests, built in {self.build_seconds * 1000:.0f} ms")
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Session Opening Ranges
+The opening range of every stock in a market, computed once when its opening range closes
+- Session open and trading day come from the exchange clock (bar_resampler.SESSIONS),
+  so the 30-minute window stays right across DST changes
+- ORH/ORL/range/volume average for all symbols in one array pass over a 1-minute BarPanel
+- Ranges are persisted per market and trading day, so a restart during the session
+  reuses them instead of refetching; a partial set (some stocks had no bars yet) is
+  stored as incomplete and topped up on later loops
+"""
+
+import os
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+import pytz
+
+from bar_resampler import SESSIONS
+from breakout_engine import bucket_bars, panel_epoch
+from panel import BarPanel
+
+logger = logging.getLogger(__name__)
+
+# Opening range length (first 30 minutes of the session)
+OPENING_RANGE_MINUTES = 30
+
+# Volume average over the opening range's 5-minute bars
+VOLUME_BUCKET_SECONDS = 300
+
+def trading_day(market: str, now: Optional[datetime] = None) -> str:
+    """Exchange-local date (ISO) of now"""
+    now = now or datetime.now(pytz.utc)
+    return now.astimezone(pytz.timezone(SESSIONS[market]["tz"])).date().isoformat()
+
+def session_open(market: str, day: str) -> pd.Timestamp:
+    """Session open of a trading day, in UTC"""
+    local = pd.Timestamp(day) + SESSIONS[market]["open"]
+    return local.tz_localize(SESSIONS[market]["tz"]).tz_convert("UTC")
+
+def opening_range_end(market: str, day: str, minutes: int = OPENING_RANGE_MINUTES) -> pd.Timestamp:
+    return session_open(market, day) + pd.Timedelta(minutes=minutes)
+
+def compute_opening_ranges(panel: BarPanel, market: str, day: str,
+                           minutes: int = OPENING_RANGE_MINUTES) -> Dict[str, Dict]:
+    """
+    Opening range of every panel symbol with bars in [open, open + minutes) on `day`
+    Same values as the first 6 five-minute bars of the day (ORH = max High, ORL = min Low);
+    volume_avg is the mean of those 5-minute volumes.
+    """
+    if len(panel) == 0 or panel.values.shape[1] == 0:
+        return {}
+    
+    start = session_open(market, day).value
+    end = opening_range_end(market, day, minutes).value
+    epoch = panel_epoch(panel)
+    window = panel.present & ((epoch >= start) & (epoch < end))[None, :]
+    
+    high = panel.field('High')
+    low = panel.field('Low')
+    counts = window.sum(axis=1)
+    orh = np.max(np.where(window & ~np.isnan(high), high, -np.inf), axis=1)
+    orl = np.min(np.where(window & ~np.isnan(low), low, np.inf), axis=1)
+    volumes, _ = bucket_bars(panel, window, VOLUME_BUCKET_SECONDS)
+    bucket_counts = (~np.isnan(volumes)).sum(axis=1)
+    volume_avg = np.where(bucket_counts > 0, np.nansum(volumes, axis=1) / np.maximum(bucket_counts, 1), np.nan)
+    
+    computed_at = datetime.now().isoformat()
+    ranges = {}
+    for s in np.flatnonzero((counts > 0) & np.isfinite(orh) & np.isfinite(orl)):
+        symbol = panel.symbols[s]
+        ranges[symbol] = {
+            'symbol': symbol,
+            'orh': float(orh[s]),
+            'orl': float(orl[s]),
+            'range_size': float(orh[s] - orl[s]),
+            'volume_avg': float(volume_avg[s]),
+            'date': day,
+            'bars': int(counts[s]),
+            'timestamp': computed_at
+        }
+    return ranges
+
+class OpeningRangeStore:
+    """Each market's opening ranges for its current trading day, persisted as JSON"""
+
+    def __init__(self, path: Optional[str] = None, persist: bool = True):
+        self.path = path or os.getenv("ORB_OPENING_RANGES_FILE", "opening_ranges.json")
+        self.persist = persist
+        self._markets = {}  # market -> {"date": day, "ranges": {symbol: range}, "complete": bool}
+        self._lock = threading.Lock()
+        if self.persist:
+            self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                self._markets = json.load(f)
+            days = ", ".join(f"{market} {stored.get('date')}" for market, stored in self._markets.items())
+            logger.info(f"📂 Loaded opening ranges from {self.path} ({days})")
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read opening ranges {self.path}: {e}")
+            self._markets = {}
+
+    def _save(self):
+        """Atomic write (caller holds the lock)"""
+        if not self.persist:
+            return
+        try:
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump(self._markets, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"⚠️ Could not save opening ranges {self.path}: {e}")
+
+    def get(self, market: str, day: str) -> Optional[Dict[str, Dict]]:
+        """Stored ranges of a market for that trading day (None if not computed yet)"""
+        with self._lock:
+            stored = self._markets.get(market)
+            if stored is None or stored.get("date") != day:
+                return None
+            return {symbol: dict(opening_range) for symbol, opening_range in stored["ranges"].items()}
+
+    def is_complete(self, market: str, day: str) -> bool:
+        """True once the market's ranges for that day are final (no stock left to retry)"""
+        with self._lock:
+            stored = self._markets.get(market)
+            return stored is not None and stored.get("date") == day and stored.get("complete", True)
+
+    def put(self, market: str, day: str, ranges: Dict[str, Dict], complete: bool = True):
+        """Replace a market's ranges (the previous day's are dropped)"""
+        with self._lock:
+            self._markets[market] = {"date": day, "ranges": dict(ranges), "complete": complete}
+            self._save()
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Event-Driven ORB Scheduler
+Works out when the ORB loop next has something to do instead of sleeping a fixed 4 minutes
+- Session events (open, opening-range end, ORB cutoff, end-of-day flatten) at fixed
+  offsets from the exchange-local session open (opening_ranges.session_open), so they
+  follow each market's DST; notification windows at the wall-clock times their checks
+  use; all skipped on days the exchange is closed
+- 1-minute bar closes while a market is inside its breakout window, 5-minute bar
+  closes while trades are open and the market is in session
+- Trading days come from the NYSE/LSE calendars (pandas-market-calendars), weekdays otherwise
+- Wake-ups are computed from the calendar, not polled; wait() can be interrupted with stop()
+"""
+
+import os
+import threading
+import logging
+from datetime import datetime, time as dt_time, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import pytz
+
+from opening_ranges import session_open
+
+logger = logging.getLogger(__name__)
+
+# Try to import market calendars, fallback to weekday-only checks
+try:
+    import pandas_market_calendars as mcal
+    MARKET_CALENDARS_AVAILABLE = True
+except ImportError:
+    MARKET_CALENDARS_AVAILABLE = False
+
+# Exchange timezone per market (decides which trading day an event belongs to)
+MARKET_TIMEZONES = {"US": "America/New_York", "UK": "Europe/London"}
+MARKET_CALENDARS = {"US": "NYSE", "UK": "LSE"}
+
+# Seconds after a bar close before Yahoo reliably serves the closed bar
+BAR_SETTLE_SECONDS = float(os.getenv("ORB_BAR_SETTLE_SECONDS", "3"))
+
+# Bar closes that wake the loop: inside the breakout window / while trades are open
+BREAKOUT_BAR_SECONDS = 60
+MONITOR_BAR_SECONDS = 300
+
+# Longest single wait, so a changed clock or calendar is picked up eventually
+MAX_WAIT_SECONDS = 6 * 3600
+
+# How far ahead session events are searched (covers long weekends and holidays)
+LOOKAHEAD_DAYS = 8
+
+class ScheduledEvent:
+    """A wall-clock time in some timezone, on the trading days of a market (or every day)"""
+
+    def __init__(self, name: str, at: str, clock_tz: str, market: Optional[str] = None,
+                 kind: str = "session"):
+        hours, minutes = (int(part) for part in at.split(":"))
+        self.name = name
+        self.time = dt_time(hours, minutes)
+        self.clock_tz = pytz.timezone(clock_tz)
+        self.market = market
+        self.kind = kind  # "session" or "notification"
+
+    def occurrences(self, start: datetime, end: datetime, calendar: "TradingCalendar") -> List[datetime]:
+        """Times (UTC) in [start, end] on which the event happens"""
+        first = start.astimezone(self.clock_tz).date() - timedelta(days=1)
+        last = end.astimezone(self.clock_tz).date() + timedelta(days=1)
+        times = []
+        day = first
+        while day <= last:
+            at = self.at_on(day)
+            if start <= at <= end and calendar.is_trading_day(self.market, at):
+                times.append(at)
+            day += timedelta(days=1)
+        return times
+
+    def at_on(self, day) -> datetime:
+        """The event's time (UTC) on a date of its clock"""
+        return self.clock_tz.localize(datetime.combine(day, self.time)).astimezone(pytz.utc)
+
+class SessionEvent(ScheduledEvent):
+    """A fixed offset from a market's session open, on the exchange clock (follows its DST)"""
+
+    def __init__(self, name: str, market: str, minutes: int, kind: str = "session"):
+        self.name = name
+        self.offset = timedelta(minutes=minutes)
+        self.clock_tz = pytz.timezone(MARKET_TIMEZONES[market])
+        self.market = market
+        self.kind = kind
+
+    def at_on(self, day) -> datetime:
+        return session_open(self.market, day.isoformat()).to_pydatetime() + self.offset
+
+class TradingCalendar:
+    """Trading days per market, from the exchange calendars when available"""
+
+    def __init__(self, calendars: Optional[Dict[str, str]] = None):
+        self.calendar_names = dict(MARKET_CALENDARS if calendars is None else calendars)
+        self._calendars = {}
+        self._valid_days = {}  # market -> (first, last, set of trading dates)
+        self._lock = threading.Lock()
+
+    def _calendar(self, market: str):
+        if market not in self._calendars:
+            calendar = None
+            if MARKET_CALENDARS_AVAILABLE and market in self.calendar_names:
+                try:
+                    calendar = mcal.get_calendar(self.calendar_names[market])
+                except Exception as e:
+                    logger.warning(f"⚠️ Could not load {market} calendar, using weekdays: {e}")
+            self._calendars[market] = calendar
+        return self._calendars[market]
+
+    def is_trading_day(self, market: Optional[str], when: datetime) -> bool:
+        """True if the market trades on the (exchange-local) date of `when`; None = every day"""
+        if market is None:
+            return True
+        day = when.astimezone(pytz.timezone(MARKET_TIMEZONES[market])).date()
+        if day.weekday() >= 5:
+            return False
+        
+        with self._lock:
+            calendar = self._calendar(market)
+            if calendar is None:
+                return True
+            
+            cached = self._valid_days.get(market)
+            if cached is None or not cached[0] <= day <= cached[1]:
+                first, last = day - timedelta(days=7), day + timedelta(days=60)
+                try:
+                    days = {stamp.date() for stamp in calendar.valid_days(first.isoformat(), last.isoformat())}
+                except Exception as e:
+                    logger.warning(f"⚠️ {market} calendar lookup failed, using weekdays: {e}")
+                    return True
+                cached = (first, last, days)
+                self._valid_days[market] = cached
+            return day in cached[2]
+
+class Wakeup:
+    """When the loop should run next and why"""
+
+    def __init__(self, at: datetime, reasons: List[str], kinds: Optional[Dict[str, str]] = None):
+        self.at = at
+        self.reasons = reasons
+        self.kinds = kinds or {}
+
+    def has(self, name: str) -> bool:
+        return name in self.reasons
+
+    def has_kind(self, kind: str) -> bool:
+        return kind in self.kinds.values()
+
+    def __repr__(self):
+        return f"Wakeup({self.at.isoformat()}, {self.reasons})"
+
+def default_orb_events() -> List[ScheduledEvent]:
+    """
+    The ORB bot's session events on the exchange clocks (minutes after the session open,
+    as in winter Dubai time before) and the daily summary notification windows on the
+    same clocks those checks use
+    """
+    return [
+        ScheduledEvent("holiday_notice", "09:00", "Asia/Dubai", None, "notification"),
+        # UK: 8:00 AM - 4:30 PM London
+        SessionEvent("uk_session_open", "UK", 0),
+        ScheduledEvent("uk_open", "12:00", "Asia/Dubai", "UK", "notification"),
+        SessionEvent("uk_or_end", "UK", 30),         # 8:30 AM London
+        SessionEvent("uk_orb_cutoff", "UK", 180),    # 11:00 AM London
+        ScheduledEvent("uk_close_warning", "16:15", "Europe/London", "UK", "notification"),
+        SessionEvent("uk_eod_flatten", "UK", 525),   # 4:45 PM London
+        # US: 9:30 AM - 4:00 PM New York
+        SessionEvent("us_session_open", "US", 0),
+        ScheduledEvent("us_open", "18:30", "Asia/Dubai", "US", "notification"),
+        SessionEvent("us_or_end", "US", 30),         # 10:00 AM New York
+        SessionEvent("us_orb_cutoff", "US", 180),    # 12:30 PM New York
+        ScheduledEvent("us_early_warning", "22:00", "Asia/Dubai", "US", "notification"),
+        ScheduledEvent("us_close_warning", "15:45", "America/New_York", "US", "notification"),
+        SessionEvent("us_eod_flatten", "US", 390),   # 4:00 PM New York
+    ]
+
+# (start event, end event) per market
+DEFAULT_BREAKOUT_WINDOWS = {"UK": ("uk_or_end", "uk_orb_cutoff"), "US": ("us_or_end", "us_orb_cutoff")}
+DEFAULT_SESSION_WINDOWS = {"UK": ("uk_session_open", "uk_eod_flatten"), "US": ("us_session_open", "us_eod_flatten")}
+
+class ORBScheduler:
+    """Next wake-up for the ORB loop from session events and bar closes"""
+
+    def __init__(self, events: Optional[List[ScheduledEvent]] = None,
+                 breakout_windows: Optional[Dict[str, Tuple[str, str]]] = None,
+                 session_windows: Optional[Dict[str, Tuple[str, str]]] = None,
+                 calendar: Optional[TradingCalendar] = None,
+                 breakout_bar_seconds: int = BREAKOUT_BAR_SECONDS,
+                 monitor_bar_seconds: int = MONITOR_BAR_SECONDS,
+                 settle_seconds: float = BAR_SETTLE_SECONDS):
+        self.events = {event.name: event for event in (default_orb_events() if events is None else events)}
+        self.breakout_windows = dict(DEFAULT_BREAKOUT_WINDOWS if breakout_windows is None else breakout_windows)
+        self.session_windows = dict(DEFAULT_SESSION_WINDOWS if session_windows is None else session_windows)
+        self.calendar = calendar or TradingCalendar()
+        self.breakout_bar_seconds = breakout_bar_seconds
+        self.monitor_bar_seconds = monitor_bar_seconds
+        self.settle = timedelta(seconds=settle_seconds)
+        
+        self._stop = threading.Event()
+        self.wakeups = 0
+
+    def _window_end(self, window: Tuple[str, str], now: datetime) -> Optional[datetime]:
+        """End of the window `now` falls in, or None if outside it"""
+        start_event, end_event = self.events[window[0]], self.events[window[1]]
+        starts = start_event.occurrences(now - timedelta(days=2), now, self.calendar)
+        if not starts:
+            return None
+        ends = end_event.occurrences(starts[-1], starts[-1] + timedelta(days=2), self.calendar)
+        if ends and now < ends[0]:
+            return ends[0]
+        return None
+
+    def in_breakout_window(self, market: str, now: Optional[datetime] = None) -> bool:
+        now = now or datetime.now(pytz.utc)
+        return market in self.breakout_windows and self._window_end(self.breakout_windows[market], now) is not None
+
+    def session_ended(self, market: str, now: Optional[datetime] = None) -> bool:
+        """True once the market's session window has ended (EOD flatten), until it opens again"""
+        now = now or datetime.now(pytz.utc)
+        if market not in self.session_windows:
+            return False
+        start_event, end_event = (self.events[name] for name in self.session_windows[market])
+        starts = start_event.occurrences(now - timedelta(days=LOOKAHEAD_DAYS), now, self.calendar)
+        ends = end_event.occurrences(now - timedelta(days=LOOKAHEAD_DAYS), now, self.calendar)
+        return bool(ends) and (not starts or ends[-1] >= starts[-1])
+
+    def breakout_window_closed(self, market: str, since: datetime, now: Optional[datetime] = None) -> bool:
+        """True if the market's breakout window ended (the ORB cutoff) between since and now"""
+        now = now or datetime.now(pytz.utc)
+        if market not in self.breakout_windows:
+            return True
+        end_event = self.events[self.breakout_windows[market][1]]
+        return bool(end_event.occurrences(since, now, self.calendar))
+
+    def _next_bar_close(self, now: datetime, bar_seconds: int) -> datetime:
+        """Next bar close (plus settle time) strictly after now, on the UTC bar grid"""
+        epoch = (now - self.settle).timestamp()
+        return datetime.fromtimestamp((epoch // bar_seconds + 1) * bar_seconds, pytz.utc) + self.settle
+
+    def next_wakeup(self, now: Optional[datetime] = None, trades_open: bool = False) -> Wakeup:
+        """Earliest upcoming session event or relevant bar close"""
+        now = (now or datetime.now(pytz.utc)).astimezone(pytz.utc)
+        candidates = []  # (time, reason, kind)
+        
+        horizon = now + timedelta(days=LOOKAHEAD_DAYS)
+        for event in self.events.values():
+            upcoming = [at + self.settle for at in event.occurrences(now - self.settle, horizon, self.calendar)]
+            upcoming = [at for at in upcoming if at > now]
+            if upcoming:
+                candidates.append((upcoming[0], event.name, event.kind))
+        
+        for market, window in self.breakout_windows.items():
+            if self._window_end(window, now) is not None:
+                candidates.append((self._next_bar_close(now, self.breakout_bar_seconds),
+                                   f"{market.lower()}_bar_close", "bar"))
+        
+        if trades_open:
+            for market, window in self.session_windows.items():
+                if self._window_end(window, now) is not None:
+                    candidates.append((self._next_bar_close(now, self.monitor_bar_seconds),
+                                       f"{market.lower()}_monitor_bar_close", "bar"))
+        
+        if not candidates:
+            at = now + timedelta(seconds=MAX_WAIT_SECONDS)
+            return Wakeup(at, ["max_wait"], {"max_wait": "session"})
+        
+        at = min(candidate[0] for candidate in candidates)
+        at = min(at, now + timedelta(seconds=MAX_WAIT_SECONDS))
+        # Everything due within the same second runs in the same iteration
+        due = [(reason, kind) for when, reason, kind in candidates if when <= at + timedelta(seconds=1)]
+        if not due:
+            due = [("max_wait", "session")]
+        return Wakeup(at, [reason for reason, _ in due], dict(due))
+
+    def wait(self, trades_open: bool = False, min_seconds: float = 0.0) -> Optional[Wakeup]:
+        """
+        Sleep until the next wake-up (at least min_seconds, e.g. to back off after an error)
+        Returns the wake-up that was due, or None if stop() was called.
+        """
+        now = datetime.now(pytz.utc)
+        wakeup = self.next_wakeup(now + timedelta(seconds=min_seconds), trades_open)
+        delay = max((wakeup.at - now).total_seconds(), min_seconds, 0.0)
+        
+        dubai_time = wakeup.at.astimezone(pytz.timezone('Asia/Dubai'))
+        logger.info(f"⏰ Next wake-up in {delay:.0f}s at {dubai_time.strftime('%H:%M:%S')} Dubai "
+                    f"({', '.join(wakeup.reasons)})")
+        
+        if self._stop.wait(delay):
+            return None
+        self.wakeups += 1
+        return wakeup
+
+    def stop(self):
+        """Interrupt wait() (used on shutdown)"""
+        self._stop.set()
+
+    @property
+    def stopped(self) -> bool:
+        return self._stop.is_set()
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Multi-Symbol Bar Panel
+Aligned OHLCV bars for many symbols in one contiguous float64 array
+- values[symbol, bar, field] on a shared timestamp index (union of every symbol's bars)
+- present[symbol, bar] is False where a symbol has no bar (gaps, other trading hours)
+- packed() end-aligns each symbol's own bars, so "last N bars" and rolling windows
+  are plain slices along the bar axis and give the same results as the per-symbol frame
+"""
+
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars, FIELDS, epoch_ns
+
+class BarPanel:
+    """Read-only [symbol, bar, field] float64 bars with a gap mask"""
+
+    def __init__(self, symbols: Sequence[str], index: pd.DatetimeIndex, values: np.ndarray,
+                 present: np.ndarray, fields: Sequence[str] = FIELDS):
+        self.symbols = list(symbols)
+        self.index = index
+        self.values = values
+        self.present = present
+        self.fields = tuple(fields)
+        self.lengths = present.sum(axis=1)  # Bars per symbol
+        
+        self._symbol_positions = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._field_positions = {field: i for i, field in enumerate(self.fields)}
+        self._packed_order = None
+        
+        self.values.flags.writeable = False
+        self.present.flags.writeable = False
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, Union[Bars, pd.DataFrame]], fields: Sequence[str] = FIELDS) -> "BarPanel":
+        """Align per-symbol OHLCV frames (or Bars) on the union of their timestamps (missing fields are NaN)"""
+        frames = {symbol: frame for symbol, frame in frames.items() if frame is not None and not frame.empty}
+        symbols = list(frames)
+        
+        # Epoch nanoseconds per symbol (a repeated timestamp keeps its last row); asi8 of
+        # a tz-aware index is already UTC, and naive timestamps are taken as UTC
+        epochs = {}
+        for symbol, frame in frames.items():
+            stamps = epoch_ns(frame)
+            keep = ~pd.Index(stamps).duplicated(keep="last")
+            epochs[symbol] = (stamps[keep], keep)
+        
+        stamps_list = [stamps for stamps, _ in epochs.values()]
+        if stamps_list and all(np.array_equal(stamps, stamps_list[0]) for stamps in stamps_list[1:]):
+            union = stamps_list[0]  # Already aligned (same bars for every symbol)
+        elif stamps_list:
+            union = np.unique(np.concatenate(stamps_list))
+        else:
+            union = np.array([], dtype="int64")
+        
+        values = np.full((len(symbols), len(union), len(fields)), np.nan)
+        present = np.zeros((len(symbols), len(union)), dtype=bool)
+        for s, symbol in enumerate(symbols):
+            frame = frames[symbol]
+            stamps, keep = epochs[symbol]
+            columns = [f for f, field in enumerate(fields) if field in frame]
+            if not columns:
+                continue
+            if isinstance(frame, Bars):
+                block = np.column_stack([frame[fields[f]] for f in columns])[keep]
+            else:
+                block = np.column_stack([frame[fields[f]].to_numpy(dtype="float64") for f in columns])[keep]
+            if len(stamps) == len(union) and np.array_equal(stamps, union):
+                # Symbol has every bar of the panel, no scatter needed
+                present[s] = True
+                values[s][:, columns] = block
+            else:
+                positions = np.searchsorted(union, stamps)
+                present[s, positions] = True
+                values[s, positions[:, None], columns] = block
+        
+        index = pd.DatetimeIndex(pd.to_datetime(union, unit="ns", utc=True))
+        return cls(symbols, index, values, present, fields)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def position(self, symbol: str) -> int:
+        return self._symbol_positions[symbol]
+
+    def field(self, name: str) -> np.ndarray:
+        """[symbol, bar] view of one field on the shared index (NaN where not present)"""
+        return self.values[:, :, self._field_positions[name]]
+
+    def packed(self, name: str) -> np.ndarray:
+        """
+        [symbol, bar] copy of one field with each symbol's bars end-aligned
+        Row s holds exactly the symbol's own bars (in order) in its last lengths[s]
+        columns, NaN before them, so the last column is every symbol's latest bar.
+        """
+        if self._packed_order is None:
+            # Stable argsort on the mask puts absent bars first, present bars after in time order
+            self._packed_order = np.argsort(self.present, axis=1, kind="stable")
+        # Absent cells are NaN already, so the moved-up gaps become the padding
+        return np.take_along_axis(self.field(name), self._packed_order, axis=1)
+
+    def last(self, name: str) -> np.ndarray:
+        """Each symbol's latest value of a field (NaN for symbols without bars)"""
+        if self.values.shape[1] == 0:
+            return np.full(len(self.symbols), np.nan)
+        return self.packed(name)[:, -1]
+
+    def last_timestamps(self) -> List[Optional[pd.Timestamp]]:
+        """Each symbol's latest bar time"""
+        if self.values.shape[1] == 0:
+            return [None] * len(self.symbols)
+        last = self.present.shape[1] - 1 - np.argmax(self.present[:, ::-1], axis=1)
+        return [self.index[position] if length else None for position, length in zip(last, self.lengths)]
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """One symbol's bars back as a DataFrame (UTC index)"""
+        s = self.position(symbol)
+        mask = self.present[s]
+        return pd.DataFrame(self.values[s][mask], index=self.index[mask], columns=list(self.fields))
@@ -6,131 +6,373 @@ Handles Yahoo Finance rate limiting with proper delays and retry logic
 
 import yfinance as yf
 import pandas as pd
+import os
 import time
 import logging
 import random
-from typing import Optional, Dict, Any
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import threading
+from typing import Optional, Dict, Any, List
+
+from single_flight import SingleFlight
+from request_scheduler import get_request_scheduler
+from adaptive_rate import AdaptiveRateController, get_rate_controller, is_throttle_error
+from yahoo_session import get_yahoo_session, get_connection_stats
+from bars import Bars
 
 logger = logging.getLogger(__name__)
 
+# Import persistent bar store
+try:
+    from bar_store import BarStore, parse_period, slice_period
+    BAR_STORE_AVAILABLE = True
+except ImportError:
+    BAR_STORE_AVAILABLE = False
+
+# Yahoo's crumb-aware JSON client (used for the batched quote endpoint)
+try:
+    from yfinance.data import YfData
+    QUOTE_ENDPOINT_AVAILABLE = True
+except ImportError:
+    QUOTE_ENDPOINT_AVAILABLE = False
+
+QUOTE_URL = "https://query1.finance.yahoo.com/v7/finance/quote"
+QUOTE_BATCH_SIZE = 50  # Symbols per quote request
+
+# Import in-process frame cache
+try:
+    from frame_cache import get_shared_frame_cache
+    FRAME_CACHE_AVAILABLE = True
+except ImportError:
+    FRAME_CACHE_AVAILABLE = False
+
 class RateLimitedDataFetcher:
     """Data fetcher with built-in rate limiting for cloud deployment"""
     
-    def __init__(self, base_delay: float = 1.0, max_delay: float = 10.0):
-        self.base_delay = base_delay  # Base delay between requests
+    def __init__(self, base_delay: float = 1.0, max_delay: float = 10.0, bar_store=None, use_bar_store: bool = True,
+                 frame_cache=None, use_frame_cache: bool = True, scheduler=None, rate_controller=None,
+                 use_adaptive_rate: bool = True, session=None, price_freshness: Optional[float] = None):
+        self.base_delay = base_delay  # Base delay for retries and failure backoff
         self.max_delay = max_delay    # Maximum delay for exponential backoff
         self.last_request_time = 0
         self.consecutive_failures = 0
         self.max_consecutive_failures = 5
         
-        # Setup requests session with retry strategy
-        self.session = requests.Session()
-        retry_strategy = Retry(
-            total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
-        )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
-        self.session.mount("http://", adapter)
-        self.session.mount("https://", adapter)
+        # Request budget is shared by every fetcher/thread in the process
+        self.scheduler = scheduler or get_request_scheduler()
+        
+        # AIMD controller tunes the scheduler's rate from observed throttling
+        if rate_controller is None and use_adaptive_rate:
+            if scheduler is None:
+                rate_controller = get_rate_controller()
+            else:
+                rate_controller = AdaptiveRateController(self.scheduler)
+        self.rate_controller = rate_controller
+        
+        # Concurrent identical requests (e.g. from both bot threads) share one download
+        self.single_flight = SingleFlight()
+        
+        # Local bar store so repeated scans only download new candles
+        if bar_store is None and use_bar_store and BAR_STORE_AVAILABLE:
+            try:
+                bar_store = BarStore()
+            except Exception as e:
+                logger.warning(f"⚠️ Bar store not available: {e}")
+        self.bar_store = bar_store
+        self.download_stats = {
+            'full_downloads': 0,
+            'incremental_downloads': 0,
+            'bars_downloaded': 0
+        }
+        self.quote_stats = {
+            'requests': 0,
+            'fallback_requests': 0,
+            'symbols_quoted': 0,
+            'prices_from_bars': 0
+        }
+        
+        # Last close of every bar download, so a recent download doubles as a price quote
+        if price_freshness is None:
+            price_freshness = float(os.getenv("PRICE_FRESHNESS_SECONDS", "120"))
+        self.price_freshness = price_freshness  # Max age (s) of a bar-derived price
+        self._bar_prices = {}  # symbol -> (last close, downloaded at)
+        self._bar_prices_lock = threading.Lock()
+        
+        # In-memory cache (shared process-wide by default) for repeated identical requests
+        if frame_cache is None and use_frame_cache and FRAME_CACHE_AVAILABLE:
+            frame_cache = get_shared_frame_cache()
+        self.frame_cache = frame_cache
+        
+        # Pooled keep-alive session (shared process-wide) used for all yfinance calls
+        self.session = session or get_yahoo_session()
         
         logger.info("✅ Rate-Limited Data Fetcher initialized")
         logger.info(f"   Base delay: {base_delay}s, Max delay: {max_delay}s")
     
-    def _wait_for_rate_limit(self):
-        """Wait appropriate time between requests to avoid rate limiting"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+    def _wait_for_rate_limit(self, priority: str = "scan"):
+        """Wait for a request token from the process-wide scheduler"""
+        self.scheduler.acquire(priority)
         
-        # Calculate delay based on consecutive failures
+        # Back off further after failures
         if self.consecutive_failures > 0:
             # Exponential backoff with jitter
             delay = min(self.base_delay * (2 ** self.consecutive_failures), self.max_delay)
             # Add random jitter to avoid thundering herd
-            jitter = random.uniform(0.1, 0.5)
-            delay += jitter
-        else:
-            delay = self.base_delay + random.uniform(0.1, 0.3)
-        
-        # Ensure minimum delay
-        if time_since_last < delay:
-            sleep_time = delay - time_since_last
-            logger.debug(f"⏳ Rate limiting: waiting {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+            delay += random.uniform(0.1, 0.5)
+            logger.debug(f"⏳ Backing off {delay:.2f}s after {self.consecutive_failures} failures")
+            time.sleep(delay)
         
         self.last_request_time = time.time()
     
-    def get_current_price(self, symbol: str) -> Optional[float]:
-        """Get current price with rate limiting and retry logic"""
+    def _record_success(self):
+        """Healthy response: let the adaptive rate creep up"""
+        self.consecutive_failures = 0
+        if self.rate_controller:
+            self.rate_controller.record_success()
+    
+    def _record_failure(self, reason: str, error: Optional[Exception] = None):
+        """Failed response: cut the adaptive rate if it looks like throttling"""
+        self.consecutive_failures += 1
+        if self.rate_controller and (error is None or is_throttle_error(error)):
+            self.rate_controller.record_throttle(reason)
+    
+    def get_current_price(self, symbol: str, priority: str = "scan", max_age: Optional[float] = None) -> Optional[float]:
+        """
+        Get current price, from recently downloaded bars when possible
+        Only if no bars for the symbol were downloaded within max_age seconds
+        (default: price_freshness) is a quote requested.
+        """
+        price = self.get_price_from_bars(symbol, max_age)
+        if price is not None:
+            return price
+        
+        quote = self.get_quotes([symbol], priority=priority).get(symbol)
+        return quote['last'] if quote else None
+    
+    def get_price_from_bars(self, symbol: str, max_age: Optional[float] = None) -> Optional[float]:
+        """Last close of the most recent bar download for a symbol, if it's fresh enough"""
+        max_age = self.price_freshness if max_age is None else max_age
+        with self._bar_prices_lock:
+            entry = self._bar_prices.get(symbol)
+        if entry is None:
+            return None
+        
+        price, downloaded_at = entry
+        if time.time() - downloaded_at > max_age:
+            return None
+        
+        self.quote_stats['prices_from_bars'] += 1
+        logger.debug(f"⚡ {symbol}: price {price} from bars downloaded {time.time() - downloaded_at:.0f}s ago")
+        return price
+    
+    def _remember_bar_price(self, symbol: str, data: Optional[pd.DataFrame]):
+        """Record the latest close of a fresh download (the forming candle tracks the live price)"""
+        if data is None or data.empty or 'Close' not in data:
+            return
+        closes = data['Close'].dropna()
+        if closes.empty:
+            return
+        with self._bar_prices_lock:
+            self._bar_prices[symbol] = (float(closes.iloc[-1]), time.time())
+    
+    def get_quotes(self, symbols: List[str], priority: str = "scan") -> Dict[str, Dict[str, Any]]:
+        """
+        Get last/bid/ask/timestamp for several symbols in as few requests as possible
+        Returns {symbol: {"last", "bid", "ask", "timestamp"}}; bid/ask are None when
+        Yahoo doesn't publish them. Symbols without a price are left out.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        if not symbols:
+            return {}
+        
+        return self.single_flight.do(
+            ("quotes", priority, tuple(symbols)),
+            lambda: self._fetch_quotes(symbols, priority)
+        )
+    
+    def _fetch_quotes(self, symbols: List[str], priority: str) -> Dict[str, Dict[str, Any]]:
+        """Request quotes in chunks the endpoint accepts"""
+        quotes = {}
+        for start in range(0, len(symbols), QUOTE_BATCH_SIZE):
+            quotes.update(self._fetch_quote_chunk(symbols[start:start + QUOTE_BATCH_SIZE], priority))
+        
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if missing:
+            logger.warning(f"⚠️ No quote for: {', '.join(missing)}")
+        return quotes
+    
+    def _fetch_quote_chunk(self, symbols: List[str], priority: str) -> Dict[str, Dict[str, Any]]:
+        """One quote request (with retries) for up to QUOTE_BATCH_SIZE symbols"""
+        yahoo_symbols = {self._convert_to_yahoo_symbol(symbol): symbol for symbol in symbols}
+        use_endpoint = QUOTE_ENDPOINT_AVAILABLE
         max_retries = 3
         
         for attempt in range(max_retries):
             try:
-                self._wait_for_rate_limit()
-                
-                # Convert symbol to Yahoo Finance format
-                yahoo_symbol = self._convert_to_yahoo_symbol(symbol)
+                self._wait_for_rate_limit(priority)
                 
-                logger.debug(f"🔍 Fetching price for {symbol} (attempt {attempt + 1})")
-                
-                ticker = yf.Ticker(yahoo_symbol)
-                data = ticker.history(period="1d", interval="1m")
+                logger.debug(f"🔍 Fetching quotes for {len(symbols)} symbols (attempt {attempt + 1})")
+                if use_endpoint:
+                    quotes = self._request_quote_endpoint(yahoo_symbols)
+                else:
+                    quotes = self._request_daily_bar_quotes(yahoo_symbols)
+                    self.quote_stats['fallback_requests'] += 1
+                self.quote_stats['requests'] += 1
                 
-                if data.empty:
-                    logger.warning(f"⚠️ No data for {symbol}")
-                    self.consecutive_failures += 1
+                if not quotes:
+                    logger.warning(f"⚠️ Empty quote response for {', '.join(symbols)}")
+                    self._record_failure("empty quote response")
                     continue
                 
-                current_price = float(data['Close'].iloc[-1])
-                logger.debug(f"✅ {symbol}: {current_price}")
-                
-                # Reset failure counter on success
-                self.consecutive_failures = 0
-                return current_price
+                self.quote_stats['symbols_quoted'] += len(quotes)
+                self._record_success()
+                return quotes
                 
             except Exception as e:
-                self.consecutive_failures += 1
-                logger.warning(f"⚠️ Error fetching {symbol} (attempt {attempt + 1}): {e}")
+                self._record_failure("quote error", e)
+                logger.warning(f"⚠️ Error fetching quotes (attempt {attempt + 1}): {e}")
+                
+                # Endpoint refused us for a reason other than throttling: use daily bars instead
+                if use_endpoint and not is_throttle_error(e):
+                    use_endpoint = False
                 
                 if attempt < max_retries - 1:
-                    # Wait before retry
                     wait_time = self.base_delay * (2 ** attempt)
-                    logger.debug(f"⏳ Retrying in {wait_time}s...")
                     time.sleep(wait_time)
                 else:
-                    logger.error(f"❌ Failed to fetch {symbol} after {max_retries} attempts")
+                    logger.error(f"❌ Failed to fetch quotes for {len(symbols)} symbols")
         
-        return None
+        return {}
+    
+    def _request_quote_endpoint(self, yahoo_symbols: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Query Yahoo's quote endpoint (a few hundred bytes per symbol)"""
+        response = YfData(session=self.session).get_raw_json(
+            QUOTE_URL,
+            params={"symbols": ",".join(yahoo_symbols), "formatted": "false"},
+            timeout=10
+        )
+        results = (response.get("quoteResponse") or {}).get("result") or []
+        
+        quotes = {}
+        for item in results:
+            symbol = yahoo_symbols.get(item.get("symbol"))
+            last = item.get("regularMarketPrice")
+            if symbol is None or not last:
+                continue
+            
+            market_time = item.get("regularMarketTime")
+            quotes[symbol] = {
+                'last': float(last),
+                'bid': float(item["bid"]) if item.get("bid") else None,
+                'ask': float(item["ask"]) if item.get("ask") else None,
+                'timestamp': pd.Timestamp(market_time, unit="s", tz="UTC") if market_time else None
+            }
+        return quotes
+    
+    def _request_daily_bar_quotes(self, yahoo_symbols: Dict[str, str]) -> Dict[str, Dict[str, Any]]:
+        """Fallback: last price from one grouped daily-bar download (one row per symbol)"""
+        data = yf.download(
+            tickers=list(yahoo_symbols.keys()),
+            period="5d",
+            interval="1d",
+            group_by="ticker",
+            auto_adjust=True,
+            threads=True,
+            progress=False,
+            session=self.session
+        )
+        
+        quotes = {}
+        for symbol, frame in self._split_batch_frame(data, yahoo_symbols).items():
+            closes = frame['Close'].dropna()
+            if closes.empty:
+                continue
+            quotes[symbol] = {
+                'last': float(closes.iloc[-1]),
+                'bid': None,
+                'ask': None,
+                'timestamp': closes.index[-1]
+            }
+        return quotes
+    
+    def get_historical_data(self, symbol: str, period: str = "1mo", interval: str = "1h", priority: str = "scan") -> Optional[pd.DataFrame]:
+        """Get historical data with rate limiting (served from cache / bar store when possible)"""
+        cache_key = (symbol, period, interval)
+        if self.frame_cache is not None:
+            cached = self.frame_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"⚡ Cache hit for {symbol} ({period}, {interval})")
+                return cached
+        
+        data = self.single_flight.do(
+            ("history", priority) + cache_key,
+            lambda: self._get_historical_data_uncached(symbol, period, interval, priority)
+        )
+        if data is None:
+            return None
+        if self.frame_cache is not None:
+            self.frame_cache.put(cache_key, data, interval)
+        # Coalesced callers all received the same frame, hand each its own view
+        return data.copy(deep=False)
+    
+    def _get_historical_data_uncached(self, symbol: str, period: str, interval: str, priority: str) -> Optional[pd.DataFrame]:
+        """Fetch historical data, topped up from the bar store when it is warm"""
+        if self.bar_store is None or parse_period(period) is None:
+            return self._download_history(symbol, interval, period=period, priority=priority)
+        
+        stored = self.bar_store.load(symbol, interval)
+        if self.bar_store.covers(stored, period, interval):
+            # Only ask Yahoo for bars from the last stored candle onwards
+            new_bars = self._download_history(symbol, interval, start=stored.index[-1], priority=priority)
+            if new_bars is None:
+                # Download failed: the stored bars may be hours old, don't pass them off as fresh
+                return None
+            merged = self.bar_store.append(symbol, interval, new_bars)
+        else:
+            data = self._download_history(symbol, interval, period=period, priority=priority)
+            if data is None:
+                return None
+            merged = self.bar_store.append(symbol, interval, data)
+        
+        return slice_period(merged, period)
     
-    def get_historical_data(self, symbol: str, period: str = "1mo", interval: str = "1h") -> Optional[pd.DataFrame]:
-        """Get historical data with rate limiting"""
+    def _download_history(self, symbol: str, interval: str, period: Optional[str] = None, start=None,
+                          priority: str = "scan") -> Optional[pd.DataFrame]:
+        """
+        Download bars for one symbol, either a full `period` or everything since `start`
+        An incremental (start=) download may legitimately be empty, e.g. over a weekend.
+        """
         max_retries = 3
+        incremental = start is not None
         
         for attempt in range(max_retries):
             try:
-                self._wait_for_rate_limit()
+                self._wait_for_rate_limit(priority)
                 
                 yahoo_symbol = self._convert_to_yahoo_symbol(symbol)
                 
-                logger.debug(f"📊 Fetching historical data for {symbol} ({period}, {interval})")
-                
-                ticker = yf.Ticker(yahoo_symbol)
-                data = ticker.history(period=period, interval=interval)
+                ticker = yf.Ticker(yahoo_symbol, session=self.session)
+                if incremental:
+                    logger.debug(f"📊 Fetching new bars for {symbol} ({interval} since {start})")
+                    data = ticker.history(start=start, interval=interval)
+                    self.download_stats['incremental_downloads'] += 1
+                else:
+                    logger.debug(f"📊 Fetching historical data for {symbol} ({period}, {interval})")
+                    data = ticker.history(period=period, interval=interval)
+                    self.download_stats['full_downloads'] += 1
                 
-                if data.empty:
+                if data.empty and not incremental:
                     logger.warning(f"⚠️ No historical data for {symbol}")
-                    self.consecutive_failures += 1
+                    self._record_failure(f"empty frame for {symbol}")
                     continue
                 
                 logger.debug(f"✅ {symbol}: {len(data)} candles")
-                self.consecutive_failures = 0
+                self.download_stats['bars_downloaded'] += len(data)
+                self._remember_bar_price(symbol, data)
+                self._record_success()
                 return data
                 
             except Exception as e:
-                self.consecutive_failures += 1
+                self._record_failure(f"history error for {symbol}", e)
                 logger.warning(f"⚠️ Error fetching historical data for {symbol}: {e}")
                 
                 if attempt < max_retries - 1:
@@ -141,6 +383,216 @@ class RateLimitedDataFetcher:
         
         return None
     
+    def get_historical_data_batch(self, symbols: List[str], period: str = "1mo", interval: str = "1h",
+                                  priority: str = "scan") -> Dict[str, pd.DataFrame]:
+        """Get historical data for several symbols in one grouped request
+        
+        Returns a dict of per-symbol frames keyed by the trading symbol. Symbols
+        Yahoo returned no bars for are left out so callers can fall back to
+        get_historical_data for them. With a bar store, warm symbols share one
+        incremental request and only cold symbols download the full period.
+        """
+        symbols = list(dict.fromkeys(symbols))  # de-duplicate, keep order
+        if not symbols:
+            return {}
+        
+        frames = {}
+        if self.frame_cache is not None:
+            for symbol in symbols:
+                cached = self.frame_cache.get((symbol, period, interval))
+                if cached is not None:
+                    frames[symbol] = cached
+        
+        to_fetch = [symbol for symbol in symbols if symbol not in frames]
+        if to_fetch:
+            fetched = self.single_flight.do(
+                ("batch", priority, tuple(to_fetch), period, interval),
+                lambda: self._get_historical_data_batch_uncached(to_fetch, period, interval, priority)
+            )
+            for symbol, frame in fetched.items():
+                if self.frame_cache is not None:
+                    self.frame_cache.put((symbol, period, interval), frame, interval)
+                frames[symbol] = frame.copy(deep=False)
+        
+        return {symbol: frames[symbol] for symbol in symbols if symbol in frames}
+    
+    def get_bars(self, symbol: str, period: str = "1mo", interval: str = "1h", priority: str = "scan",
+                 dtype: str = "float64") -> Optional[Bars]:
+        """
+        Historical data as compact read-only Bars (OHLCV only, no Dividends/Stock Splits)
+        The frame is converted once and only the Bars are cached, so every caller
+        shares the same arrays without copying.
+        """
+        cache_key = (symbol, period, interval, "bars", dtype)
+        if self.frame_cache is not None:
+            cached = self.frame_cache.get(cache_key)
+            if cached is not None:
+                logger.debug(f"⚡ Cache hit for {symbol} bars ({period}, {interval})")
+                return cached
+        
+        # Same single-flight key as get_historical_data, so concurrent frame and bar requests share one download
+        data = self.single_flight.do(
+            ("history", priority, symbol, period, interval),
+            lambda: self._get_historical_data_uncached(symbol, period, interval, priority)
+        )
+        if data is None:
+            return None
+        bars = Bars.from_frame(data, dtype=dtype)
+        if self.frame_cache is not None:
+            self.frame_cache.put(cache_key, bars, interval)
+        return bars
+    
+    def get_bars_batch(self, symbols: List[str], period: str = "1mo", interval: str = "1h",
+                       priority: str = "scan", dtype: str = "float64") -> Dict[str, Bars]:
+        """Batched get_bars: one grouped request for every symbol not cached as Bars"""
+        symbols = list(dict.fromkeys(symbols))  # de-duplicate, keep order
+        if not symbols:
+            return {}
+        
+        bars = {}
+        if self.frame_cache is not None:
+            for symbol in symbols:
+                cached = self.frame_cache.get((symbol, period, interval, "bars", dtype))
+                if cached is not None:
+                    bars[symbol] = cached
+        
+        to_fetch = [symbol for symbol in symbols if symbol not in bars]
+        if to_fetch:
+            fetched = self.single_flight.do(
+                ("batch", priority, tuple(to_fetch), period, interval),
+                lambda: self._get_historical_data_batch_uncached(to_fetch, period, interval, priority)
+            )
+            for symbol, frame in fetched.items():
+                bars[symbol] = Bars.from_frame(frame, dtype=dtype)
+                if self.frame_cache is not None:
+                    self.frame_cache.put((symbol, period, interval, "bars", dtype), bars[symbol], interval)
+        
+        return {symbol: bars[symbol] for symbol in symbols if symbol in bars}
+    
+    def _get_historical_data_batch_uncached(self, symbols: List[str], period: str, interval: str,
+                                           priority: str) -> Dict[str, pd.DataFrame]:
+        """Batch-fetch symbols, sharing one incremental request for those warm in the bar store"""
+        if self.bar_store is None or parse_period(period) is None:
+            return self._download_batch(symbols, interval, period=period, priority=priority) or {}
+        
+        stored = {symbol: self.bar_store.load(symbol, interval) for symbol in symbols}
+        warm = [symbol for symbol in symbols if self.bar_store.covers(stored[symbol], period, interval)]
+        cold = [symbol for symbol in symbols if symbol not in warm]
+        
+        downloaded = {}
+        warm_fetched = False
+        if warm:
+            start = min(stored[symbol].index[-1] for symbol in warm)
+            new_bars = self._download_batch(warm, interval, start=start, priority=priority)
+            warm_fetched = new_bars is not None
+            downloaded.update(new_bars or {})
+        if cold:
+            downloaded.update(self._download_batch(cold, interval, period=period, priority=priority) or {})
+        
+        frames = {}
+        for symbol in symbols:
+            if symbol in downloaded:
+                merged = self.bar_store.append(symbol, interval, downloaded[symbol])
+            elif symbol in warm and warm_fetched:
+                merged = stored[symbol]  # Nothing new since the last stored bar
+            else:
+                # No bars for a cold symbol, or the warm request failed: left out, stored bars may be stale
+                continue
+            frames[symbol] = slice_period(merged, period)
+        
+        return frames
+    
+    def _download_batch(self, symbols: List[str], interval: str, period: Optional[str] = None, start=None,
+                        priority: str = "scan") -> Optional[Dict[str, pd.DataFrame]]:
+        """
+        Download bars for several symbols with one grouped yf.download call
+        None if every attempt failed; an incremental (start=) download may be empty.
+        """
+        yahoo_symbols = {self._convert_to_yahoo_symbol(symbol): symbol for symbol in symbols}
+        incremental = start is not None
+        max_retries = 3
+        
+        for attempt in range(max_retries):
+            try:
+                self._wait_for_rate_limit(priority)
+                
+                if incremental:
+                    logger.debug(f"📊 Fetching new batch bars for {len(symbols)} symbols ({interval} since {start})")
+                    window = {'start': start}
+                    self.download_stats['incremental_downloads'] += 1
+                else:
+                    logger.debug(f"📊 Fetching batch historical data for {len(symbols)} symbols ({period}, {interval})")
+                    window = {'period': period}
+                    self.download_stats['full_downloads'] += 1
+                
+                data = yf.download(
+                    tickers=list(yahoo_symbols.keys()),
+                    interval=interval,
+                    group_by="ticker",
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False,
+                    session=self.session,
+                    **window
+                )
+                
+                frames = self._split_batch_frame(data, yahoo_symbols)
+                
+                if not frames and not incremental:
+                    logger.warning(f"⚠️ No batch historical data for {', '.join(symbols)}")
+                    self._record_failure("empty batch frame")
+                    continue
+                
+                missing = [symbol for symbol in symbols if symbol not in frames]
+                if missing and not incremental:
+                    logger.warning(f"⚠️ Batch returned no data for: {', '.join(missing)}")
+                
+                logger.debug(f"✅ Batch: {len(frames)}/{len(symbols)} symbols")
+                self.download_stats['bars_downloaded'] += sum(len(frame) for frame in frames.values())
+                for symbol, frame in frames.items():
+                    self._remember_bar_price(symbol, frame)
+                self._record_success()
+                return frames
+            
+            except Exception as e:
+                self._record_failure("batch history error", e)
+                logger.warning(f"⚠️ Error fetching batch historical data (attempt {attempt + 1}): {e}")
+                
+                if attempt < max_retries - 1:
+                    wait_time = self.base_delay * (2 ** attempt)
+                    time.sleep(wait_time)
+                else:
+                    logger.error(f"❌ Failed to fetch batch historical data for {len(symbols)} symbols")
+        
+        return None
+    
+    def _split_batch_frame(self, data: pd.DataFrame, yahoo_symbols: Dict[str, str]) -> Dict[str, pd.DataFrame]:
+        """Split a grouped yf.download frame back into per-symbol OHLCV frames"""
+        frames = {}
+        if data is None or data.empty:
+            return frames
+        
+        for yahoo_symbol, symbol in yahoo_symbols.items():
+            if isinstance(data.columns, pd.MultiIndex):
+                if yahoo_symbol not in data.columns.get_level_values(0):
+                    continue
+                frame = data[yahoo_symbol]
+            elif len(yahoo_symbols) == 1:
+                # Single ticker downloads come back with flat columns
+                frame = data
+            else:
+                continue
+            
+            # Rows are aligned across tickers, so drop the ones this symbol has no bars for
+            frame = frame.dropna(how="all")
+            if frame.empty:
+                continue
+            
+            frame.columns.name = None
+            frames[symbol] = frame
+        
+        return frames
+    
     def _convert_to_yahoo_symbol(self, symbol: str) -> str:
         """Convert trading symbol to Yahoo Finance format"""
         # Forex pairs
@@ -167,20 +619,13 @@ class RateLimitedDataFetcher:
         # Stocks (already in correct format)
         return symbol
     
-    def get_multiple_prices(self, symbols: list, delay_between: float = 0.5) -> Dict[str, float]:
-        """Get prices for multiple symbols with proper spacing"""
-        prices = {}
-        
-        for i, symbol in enumerate(symbols):
-            price = self.get_current_price(symbol)
-            if price:
-                prices[symbol] = price
-            
-            # Additional delay between symbols
-            if i < len(symbols) - 1:
-                time.sleep(delay_between)
-        
-        return prices
+    def get_multiple_prices(self, symbols: list, delay_between: float = 0.5, priority: str = "scan") -> Dict[str, float]:
+        """
+        Get prices for multiple symbols from one batched quote request
+        delay_between is kept for compatibility; spacing is handled by the scheduler.
+        """
+        quotes = self.get_quotes(symbols, priority=priority)
+        return {symbol: quote['last'] for symbol, quote in quotes.items()}
     
     def get_status(self) -> Dict[str, Any]:
         """Get fetcher status for monitoring"""
@@ -188,9 +633,40 @@ class RateLimitedDataFetcher:
             "consecutive_failures": self.consecutive_failures,
             "base_delay": self.base_delay,
             "max_delay": self.max_delay,
-            "last_request_time": self.last_request_time
+            "last_request_time": self.last_request_time,
+            "bar_store": str(self.bar_store.directory) if self.bar_store else None,
+            "download_stats": dict(self.download_stats),
+            "quote_stats": dict(self.quote_stats),
+            "price_freshness": self.price_freshness,
+            "frame_cache": self.frame_cache.get_stats() if self.frame_cache else None,
+            "single_flight": self.single_flight.get_stats(),
+            "scheduler": self.scheduler.get_metrics(),
+            "adaptive_rate": self.rate_controller.get_status() if self.rate_controller else None,
+            "current_rate": self.scheduler.rate,
+            "connections": get_connection_stats(self.session)
         }
 
+_shared_fetchers = {}
+_shared_fetchers_lock = threading.Lock()
+
+def get_shared_fetcher(base_delay: float = 1.0, max_delay: float = 10.0, name: str = "default") -> RateLimitedDataFetcher:
+    """
+    Process-wide fetcher registry
+    Every component asking for the same name gets the same fetcher, so they
+    share one rate limiter, cache and in-flight request table. If callers ask
+    for different delays the most conservative ones win.
+    """
+    with _shared_fetchers_lock:
+        fetcher = _shared_fetchers.get(name)
+        if fetcher is None:
+            fetcher = RateLimitedDataFetcher(base_delay=base_delay, max_delay=max_delay)
+            _shared_fetchers[name] = fetcher
+        elif base_delay > fetcher.base_delay or max_delay > fetcher.max_delay:
+            fetcher.base_delay = max(fetcher.base_delay, base_delay)
+            fetcher.max_delay = max(fetcher.max_delay, max_delay)
+            logger.info(f"🔧 Shared fetcher '{name}' delays raised to {fetcher.base_delay}s / {fetcher.max_delay}s")
+        return fetcher
+
 def test_rate_limited_fetcher():
     """Test the rate-limited fetcher"""
     print("🧪 Testing Rate-Limited Data Fetcher...")
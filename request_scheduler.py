@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Process-Wide Request Scheduler
+Token bucket shared by every thread that talks to Yahoo Finance
+- One budget for the whole process instead of one per fetcher instance
+- Priority classes: live trade monitoring > new-signal scans > summaries/reports
+- Queue depth and wait-time metrics for monitoring
+"""
+
+import os
+import time
+import heapq
+import itertools
+import threading
+import logging
+from typing import Dict, Any
+
+logger = logging.getLogger(__name__)
+
+# Priority classes, highest first
+PRIORITY_CLASSES = ("monitor", "scan", "report")
+PRIORITY_RANK = {name: rank for rank, name in enumerate(PRIORITY_CLASSES)}
+
+class RequestScheduler:
+    """Thread-safe token bucket that hands out tokens in priority order"""
+
+    def __init__(self, rate: float = 0.5, burst: float = 3.0):
+        self.rate = rate      # Tokens (requests) added per second
+        self.burst = burst    # Bucket capacity
+        self._tokens = burst
+        self._last_refill = time.monotonic()
+        
+        self._cond = threading.Condition()
+        self._waiting = []  # Heap of (rank, seq) tickets
+        self._seq = itertools.count()
+        
+        self._metrics = {
+            name: {"queued": 0, "granted": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in PRIORITY_CLASSES
+        }
+        
+        logger.info(f"✅ Request scheduler initialized ({rate:.2f} req/s, burst {burst:.0f})")
+
+    def _refill(self):
+        """Add tokens for the time elapsed since the last refill (caller holds the lock)"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, priority: str = "scan") -> float:
+        """
+        Block until a request token is available for this priority class
+        Higher classes are always served first; returns the seconds waited.
+        """
+        if priority not in PRIORITY_RANK:
+            priority = "scan"
+        
+        start = time.monotonic()
+        ticket = (PRIORITY_RANK[priority], next(self._seq))
+        metrics = self._metrics[priority]
+        
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            metrics["queued"] += 1
+            
+            while True:
+                self._refill()
+                at_head = self._waiting[0] == ticket
+                if at_head and self._tokens >= 1:
+                    heapq.heappop(self._waiting)
+                    self._tokens -= 1
+                    break
+                
+                if at_head:
+                    self._cond.wait((1 - self._tokens) / self.rate)
+                else:
+                    # Someone ahead of us is waiting; re-check when the queue moves
+                    self._cond.wait(1.0)
+            
+            metrics["queued"] -= 1
+            waited = time.monotonic() - start
+            metrics["granted"] += 1
+            metrics["total_wait"] += waited
+            metrics["max_wait"] = max(metrics["max_wait"], waited)
+            self._cond.notify_all()
+        
+        if waited > 0.01:
+            logger.debug(f"⏳ Scheduler: {priority} request waited {waited:.2f}s")
+        return waited
+
+    def set_rate(self, rate: float):
+        """Change the refill rate (e.g. from an adaptive controller)"""
+        with self._cond:
+            self._refill()
+            self.rate = max(rate, 1e-6)
+            self._cond.notify_all()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth and wait statistics per priority class"""
+        with self._cond:
+            self._refill()
+            per_priority = {}
+            for name, metrics in self._metrics.items():
+                granted = metrics["granted"]
+                per_priority[name] = {
+                    "queue_depth": metrics["queued"],
+                    "granted": granted,
+                    "avg_wait": round(metrics["total_wait"] / granted, 3) if granted else 0.0,
+                    "max_wait": round(metrics["max_wait"], 3)
+                }
+            return {
+                "rate": self.rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queue_depth": len(self._waiting),
+                "priorities": per_priority
+            }
+
+_shared_scheduler = None
+_shared_scheduler_lock = threading.Lock()
+
+def get_request_scheduler() -> RequestScheduler:
+    """Process-wide scheduler (rate and burst from YAHOO_REQUESTS_PER_SECOND / YAHOO_REQUEST_BURST)"""
+    global _shared_scheduler
+    with _shared_scheduler_lock:
+        if _shared_scheduler is None:
+            rate = float(os.getenv("YAHOO_REQUESTS_PER_SECOND", "0.5"))
+            burst = float(os.getenv("YAHOO_REQUEST_BURST", "3"))
+            _shared_scheduler = RequestScheduler(rate=rate, burst=burst)
+        return _shared_scheduler
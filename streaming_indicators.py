@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Streaming Indicators
+Incremental indicator objects that cost O(1) per new bar instead of recomputing a whole series
+- EMA (pandas ewm adjust=True), ATR (rolling-mean or Wilder), rolling mean/sum/max/min
+- seed() primes an indicator from history; update() adds one closed bar
+- preview() evaluates a still-forming bar without committing it
+- Values match the batch kernels in indicators.py (and pandas) to float tolerance
+"""
+
+import math
+from collections import deque
+from typing import Iterable, Dict, Any
+
+import pandas as pd
+
+def _is_nan(value: float) -> bool:
+    return value != value
+
+class StreamingEMA:
+    """Exponential moving average, same as Series.ewm(span=span).mean()"""
+
+    def __init__(self, span: float):
+        self.span = span
+        self.beta = 1 - 2.0 / (span + 1)
+        self._numerator = 0.0
+        self._denominator = 0.0
+        self.count = 0
+
+    def _step(self, value: float):
+        if _is_nan(value):
+            # Missing bar: older weights still decay (ignore_na=False), value is unchanged
+            return self.beta * self._numerator, self.beta * self._denominator
+        return value + self.beta * self._numerator, 1.0 + self.beta * self._denominator
+
+    def update(self, value: float) -> float:
+        self._numerator, self._denominator = self._step(float(value))
+        self.count += 1
+        return self.value
+
+    def preview(self, value: float) -> float:
+        numerator, denominator = self._step(float(value))
+        return numerator / denominator if denominator > 0 else math.nan
+
+    def seed(self, values: Iterable[float]) -> float:
+        for value in values:
+            self.update(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._numerator / self._denominator if self._denominator > 0 else math.nan
+
+class RollingWindow:
+    """
+    Trailing rolling mean/sum with a fixed window (NaN until full, or while a NaN is inside)
+    The running sum is re-added from scratch once per window of updates so
+    floating-point drift can't accumulate; that keeps the cost amortized O(1).
+    """
+
+    def __init__(self, window: int, how: str = "mean"):
+        if how not in ("mean", "sum"):
+            raise ValueError(f"Unsupported rolling aggregation: {how}")
+        self.window = window
+        self.how = how
+        self._values = deque(maxlen=window)
+        self._sum = 0.0
+        self._nans = 0
+        self._since_resum = 0
+        self.count = 0
+
+    def _result(self, total: float, nans: int, size: int) -> float:
+        if size < self.window or nans:
+            return math.nan
+        return total / self.window if self.how == "mean" else total
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        if len(self._values) == self.window:
+            oldest = self._values[0]
+            if _is_nan(oldest):
+                self._nans -= 1
+            else:
+                self._sum -= oldest
+        self._values.append(value)
+        if _is_nan(value):
+            self._nans += 1
+        else:
+            self._sum += value
+        
+        self.count += 1
+        self._since_resum += 1
+        if self._since_resum >= self.window:
+            self._sum = math.fsum(v for v in self._values if not _is_nan(v))
+            self._since_resum = 0
+        return self.value
+
+    def preview(self, value: float) -> float:
+        value = float(value)
+        total, nans, size = self._sum, self._nans, len(self._values)
+        if size == self.window:
+            oldest = self._values[0]
+            if _is_nan(oldest):
+                nans -= 1
+            else:
+                total -= oldest
+            size -= 1
+        if _is_nan(value):
+            nans += 1
+        else:
+            total += value
+        return self._result(total, nans, size + 1)
+
+    def seed(self, values: Iterable[float]) -> float:
+        for value in values:
+            self.update(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._result(self._sum, self._nans, len(self._values))
+
+class RollingExtreme:
+    """Trailing rolling max/min via a monotonic deque (amortized O(1) per bar)"""
+
+    def __init__(self, window: int, how: str = "max"):
+        if how not in ("max", "min"):
+            raise ValueError(f"Unsupported rolling extreme: {how}")
+        self.window = window
+        self.how = how
+        self._candidates = deque()  # (position, value), values monotonic from the front
+        self._last_nan = -1         # Position of the most recent NaN
+        self.count = 0
+
+    def _dominates(self, new: float, old: float) -> bool:
+        return new >= old if self.how == "max" else new <= old
+
+    def update(self, value: float) -> float:
+        value = float(value)
+        position = self.count
+        self.count += 1
+        
+        if _is_nan(value):
+            self._last_nan = position
+        else:
+            while self._candidates and self._dominates(value, self._candidates[-1][1]):
+                self._candidates.pop()
+            self._candidates.append((position, value))
+        while self._candidates and self._candidates[0][0] <= position - self.window:
+            self._candidates.popleft()
+        return self.value
+
+    def preview(self, value: float) -> float:
+        value = float(value)
+        position = self.count
+        if position + 1 < self.window or _is_nan(value) or self._last_nan > position - self.window:
+            return math.nan
+        
+        # Best surviving candidate once the oldest bar leaves the window
+        best = None
+        for index in range(min(2, len(self._candidates))):
+            candidate_position, candidate = self._candidates[index]
+            if candidate_position > position - self.window:
+                best = candidate
+                break
+        if best is None:
+            return value
+        return max(best, value) if self.how == "max" else min(best, value)
+
+    def seed(self, values: Iterable[float]) -> float:
+        for value in values:
+            self.update(value)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        position = self.count - 1
+        if self.count < self.window or self._last_nan > position - self.window or not self._candidates:
+            return math.nan
+        return self._candidates[0][1]
+
+class StreamingATR:
+    """Average True Range from OHLC bars: rolling mean of true range ("sma") or Wilder's smoothing"""
+
+    def __init__(self, period: int = 14, method: str = "sma"):
+        if method not in ("sma", "wilder"):
+            raise ValueError(f"Unknown ATR method: {method}")
+        self.period = period
+        self.method = method
+        self._prev_close = math.nan
+        self._rolling = RollingWindow(period, "mean")
+        self._wilder = math.nan
+        self.count = 0
+
+    def _true_range(self, high: float, low: float) -> float:
+        ranges = [high - low, abs(high - self._prev_close), abs(low - self._prev_close)]
+        ranges = [r for r in ranges if not _is_nan(r)]  # Like DataFrame.max(axis=1), NaN skipped
+        return max(ranges) if ranges else math.nan
+
+    def _next_wilder(self, true_range: float) -> float:
+        if self.count + 1 < self.period:
+            return math.nan
+        if self.count + 1 == self.period:
+            # Seed: mean of the first `period` true ranges (the rolling window holds them)
+            return self._rolling.preview(true_range)
+        return (self._wilder * (self.period - 1) + true_range) / self.period
+
+    def update(self, high: float, low: float, close: float) -> float:
+        true_range = self._true_range(float(high), float(low))
+        if self.method == "wilder":
+            self._wilder = self._next_wilder(true_range)
+        self._rolling.update(true_range)
+        self._prev_close = float(close)
+        self.count += 1
+        return self.value
+
+    def preview(self, high: float, low: float, close: float) -> float:
+        true_range = self._true_range(float(high), float(low))
+        if self.method == "wilder":
+            return self._next_wilder(true_range)
+        return self._rolling.preview(true_range)
+
+    def seed(self, bars: pd.DataFrame) -> float:
+        for high, low, close in zip(bars['High'].to_numpy(), bars['Low'].to_numpy(), bars['Close'].to_numpy()):
+            self.update(high, low, close)
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self._wilder if self.method == "wilder" else self._rolling.value
+
+class BarStream:
+    """
+    Keeps a set of streaming indicators in step with a growing bar frame
+    sync() feeds only the closed bars added since the last call and previews the
+    last (still-forming) bar; a frame that doesn't continue the stream reseeds it.
+    """
+
+    def __init__(self, ema_spans: Iterable[int] = (20,), atr_period: int = 14, atr_method: str = "sma",
+                 volume_windows: Iterable[int] = (20,)):
+        self.ema_spans = tuple(ema_spans)
+        self.atr_period = atr_period
+        self.atr_method = atr_method
+        self.volume_windows = tuple(volume_windows)
+        self.reseeds = 0
+        self._reset()
+
+    def _reset(self):
+        self.emas = {span: StreamingEMA(span) for span in self.ema_spans}
+        self.atr = StreamingATR(self.atr_period, self.atr_method)
+        self.volumes = {window: RollingWindow(window, "mean") for window in self.volume_windows}
+        self.last_closed = None  # Timestamp of the last committed bar
+
+    def _update(self, bar):
+        for stream in self.emas.values():
+            stream.update(bar.Close)
+        self.atr.update(bar.High, bar.Low, bar.Close)
+        for stream in self.volumes.values():
+            stream.update(bar.Volume)
+
+    def sync(self, bars: pd.DataFrame) -> Dict[str, Any]:
+        """Advance to the frame's latest bar and return current values"""
+        if bars is None or bars.empty:
+            return {}
+        
+        if self.last_closed is not None and self.last_closed not in bars.index:
+            # Gap or a different history: start over from this frame
+            self._reset()
+            self.reseeds += 1
+        
+        closed = bars.iloc[:-1]
+        if self.last_closed is not None:
+            closed = closed[closed.index > self.last_closed]
+        for bar in closed.itertuples():
+            self._update(bar)
+            self.last_closed = bar.Index
+        
+        if bars.index[-1] == self.last_closed:
+            # No forming bar beyond what's already committed
+            return {
+                "ema": {span: stream.value for span, stream in self.emas.items()},
+                "atr": self.atr.value,
+                "volume_average": {window: stream.value for window, stream in self.volumes.items()},
+                "last_bar": bars.index[-1]
+            }
+        
+        forming = bars.iloc[-1]
+        return {
+            "ema": {span: stream.preview(forming['Close']) for span, stream in self.emas.items()},
+            "atr": self.atr.preview(forming['High'], forming['Low'], forming['Close']),
+            "volume_average": {window: stream.preview(forming['Volume']) for window, stream in self.volumes.items()},
+            "last_bar": bars.index[-1]
+        }
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+Synthetic Bars for Tests
+Random-walk hourly OHLCV bars shaped like a yfinance download, shared by the
+zone, R:R, analysis cache and panel tests
+"""
+
+import numpy as np
+import pandas as pd
+
+def make_hourly_bars(periods, seed=0, start="2023-01-02", start_price=1.1, decimals=None,
+                     random_volume=False, gaps=False):
+    """
+    Random-walk hourly OHLC bars (UTC)
+    decimals rounds prices like real quotes (so levels repeat); random_volume draws
+    volumes instead of 0; gaps drops weekends, unlike 24/7 symbols
+    """
+    rng = np.random.default_rng(seed)
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.002, periods)))
+    spread = np.abs(rng.normal(0, 0.0015, periods)) * close
+    high, low = close + spread, close - spread
+    if decimals is not None:
+        close, high, low = (np.round(values, decimals) for values in (close, high, low))
+    
+    index = pd.date_range(start, periods=periods, freq="1h", tz="UTC")
+    bars = pd.DataFrame({
+        'Open': close,
+        'High': high,
+        'Low': low,
+        'Close': close,
+        'Volume': rng.integers(0, 1000, periods).astype(float) if random_volume else 0.0
+    }, index=index)
+    if gaps:
+        bars = bars[bars.index.dayofweek < 5]
+    return bars
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Test Adaptive Rate
+Verifies the AIMD controller raises, cuts and persists the shared request rate
+"""
+
+import os
+import sys
+import tempfile
+
+from request_scheduler import RequestScheduler
+from adaptive_rate import AdaptiveRateController, is_throttle_error
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+class FakeHTTPError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"HTTP {status_code}")
+        self.response = FakeResponse(status_code)
+
+def test_additive_increase():
+    """Healthy responses raise the rate step by step up to the ceiling"""
+    print("🧪 Testing additive increase...")
+    
+    scheduler = RequestScheduler(rate=0.5, burst=1.0)
+    controller = AdaptiveRateController(scheduler, max_rate=0.55, increase_step=0.02)
+    
+    controller.record_success()
+    assert abs(scheduler.rate - 0.52) < 1e-9
+    for _ in range(10):
+        controller.record_success()
+    assert scheduler.rate == 0.55
+    assert controller.get_status()["increases"] == 3
+    
+    print("   ✅ Additive increase OK")
+
+def test_multiplicative_decrease():
+    """Throttling halves the rate once per cooldown and never goes below the floor"""
+    print("🧪 Testing multiplicative decrease...")
+    
+    scheduler = RequestScheduler(rate=1.0, burst=1.0)
+    controller = AdaptiveRateController(scheduler, min_rate=0.2, cooldown=0.0)
+    
+    controller.record_throttle("429")
+    assert scheduler.rate == 0.5
+    controller.record_throttle("429")
+    controller.record_throttle("429")
+    assert scheduler.rate == 0.2
+    
+    cooled = AdaptiveRateController(RequestScheduler(rate=1.0), cooldown=60.0)
+    cooled.record_throttle("429")
+    cooled.record_throttle("429")  # Same episode, ignored
+    assert cooled.rate == 0.5
+    assert cooled.get_status()["decreases"] == 1
+    
+    print("   ✅ Multiplicative decrease OK")
+
+def test_persistence():
+    """A new controller starts from the rate the previous one learned"""
+    print("🧪 Testing rate persistence...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        state_file = os.path.join(directory, "rate.json")
+        first = AdaptiveRateController(RequestScheduler(rate=1.0), state_file=state_file)
+        first.record_throttle("503")
+        
+        scheduler = RequestScheduler(rate=1.0)
+        second = AdaptiveRateController(scheduler, state_file=state_file)
+        assert second.rate == 0.5
+        assert scheduler.rate == 0.5
+    
+    print("   ✅ Rate persistence OK")
+
+def test_throttle_classification():
+    """429 and 5xx count as throttling, other errors don't"""
+    print("🧪 Testing throttle classification...")
+    
+    assert is_throttle_error(FakeHTTPError(429))
+    assert is_throttle_error(FakeHTTPError(503))
+    assert not is_throttle_error(FakeHTTPError(404))
+    assert is_throttle_error(Exception("Too Many Requests. Rate limited. Try after a while."))
+    assert not is_throttle_error(ValueError("No timezone found, symbol may be delisted"))
+    
+    print("   ✅ Throttle classification OK")
+
+if __name__ == "__main__":
+    test_additive_increase()
+    test_multiplicative_decrease()
+    test_persistence()
+    test_throttle_classification()
+    print("🎉 All adaptive rate tests passed")
+    sys.exit(0)
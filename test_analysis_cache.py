@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test Analysis Cache
+Verifies analyses are reused only until the next bar closes, that
+cached optimizer bar scores give the same R:R as a full recompute, and that
+a cached symbol is analysed from the scan's batch quote without new requests
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from analysis_cache import AnalysisCache, SymbolAnalysis, last_closed_bar
+from dynamic_rr_optimizer import DynamicRROptimizer
+from synthetic_bars import make_hourly_bars
+from zone_engine import find_zones_arrays
+from zone_book import ZoneBook
+from zone_index import SymbolZoneIndex, ZoneProximityIndex
+
+def test_last_closed_bar():
+    """The forming bar (or a live tick row) is never treated as closed"""
+    print("🧪 Testing last closed bar detection...")
+    
+    bars = make_hourly_bars(10, start="2024-03-04")
+    last_start = bars.index[-1].timestamp()
+    
+    assert last_closed_bar(bars, "1h", now=last_start + 1800) == bars.index[-2]  # Last bar still forming
+    assert last_closed_bar(bars, "1h", now=last_start + 3600) == bars.index[-1]  # It has just closed
+    
+    # Yahoo's live row carries the tick time, after the forming bar
+    live = pd.concat([bars, bars.iloc[[-1]].set_axis([bars.index[-1] + pd.Timedelta(minutes=37)])])
+    assert last_closed_bar(live, "1h", now=last_start + 37 * 60) == bars.index[-2]
+    assert last_closed_bar(live.tz_localize(None), "1h", now=last_start + 37 * 60) == bars.index[-2].tz_localize(None)
+    
+    assert last_closed_bar(bars.iloc[[0]], "1h", now=bars.index[0].timestamp() + 60) is None
+    assert last_closed_bar(pd.DataFrame(), "1h") is None
+    
+    print("   ✅ Last closed bar OK")
+
+def test_cache_lifetime():
+    """An entry serves every scan until the next bar closes, then misses"""
+    print("🧪 Testing cache lifetime and hit rate...")
+    
+    cache = AnalysisCache(interval="1h")
+    bars = make_hourly_bars(48, start="2024-03-04")
+    hour = bars.index[-1].timestamp()  # The last bar is forming during this hour
+    last_closed = last_closed_bar(bars, "1h", now=hour + 60)
+    
+    assert cache.get("EUR/USD", now=hour + 60) is None
+    assert not cache.is_current("EUR/USD", now=hour + 60)
+    analysis = cache.put(SymbolAnalysis("EUR/USD", last_closed, [], SymbolZoneIndex([])))
+    
+    # 15-minute scans within the hour: all hits, no download needed
+    for minutes in (15, 30, 45):
+        assert cache.is_current("EUR/USD", now=hour + minutes * 60)
+        assert cache.get("EUR/USD", now=hour + minutes * 60) is analysis
+    assert cache.get("EUR/USD", last_closed) is analysis
+    
+    # Next hour: a new bar has closed
+    assert not cache.is_current("EUR/USD", now=hour + 3600)
+    assert cache.get("EUR/USD", now=hour + 3600) is None
+    assert cache.get("EUR/USD", bars.index[-1]) is None
+    
+    stats = cache.get_stats()
+    assert stats["hits"] == 4 and stats["misses"] == 1 and stats["hit_rate"] == 0.8, stats
+    
+    cache.invalidate("EUR/USD")
+    assert cache.get("EUR/USD", last_closed) is None
+    
+    print(f"   Stats: {stats}")
+    print("   ✅ Cache lifetime OK")
+
+def test_cached_scores_match():
+    """optimize_many with cached bar scores equals a full recompute at any price"""
+    print("🧪 Testing cached R:R bar scores...")
+    
+    optimizer = DynamicRROptimizer()
+    for seed in range(5):
+        bars = make_hourly_bars(600, seed=seed, start="2024-03-04")
+        zones = find_zones_arrays(bars['High'].to_numpy(), bars['Low'].to_numpy())
+        assert zones
+        scores = optimizer.analyze_bars(bars, zones)
+        
+        for price in np.linspace(0.99, 1.01, 7) * bars['Close'].iloc[-1]:
+            near_zones = SymbolZoneIndex(zones).zones_near(price) or zones[:3]
+            expected = optimizer.optimize_many(bars, price, near_zones)
+            assert optimizer.optimize_many(None, price, near_zones, analysis=scores) == expected, (seed, price)
+    
+    assert optimizer.analyze_bars(bars, [])['zone_strength'] == {}
+    
+    print("   ✅ Cached scores OK")
+
+class CountingFetcher:
+    """Records the requests analyze_symbol makes"""
+
+    def __init__(self):
+        self.calls = []
+
+    def get_current_price(self, symbol, priority="scan"):
+        self.calls.append(("price", symbol))
+        return 1.1
+
+    def get_historical_data(self, symbol, period="1mo", interval="1h"):
+        self.calls.append(("history", symbol))
+        return None
+
+class OpenMarkets:
+    def should_trade_symbol(self, symbol):
+        return True, "open"
+
+def test_cached_symbol_uses_scan_quote():
+    """A cached analysis plus the cycle's batch quote needs no request of its own"""
+    print("🧪 Testing analysis from the scan quote...")
+    
+    from yahoo_forex_bot import YahooTradingBot, ZoneDetector
+    bot = YahooTradingBot.__new__(YahooTradingBot)
+    bot.data_fetcher = CountingFetcher()
+    bot.trade_tracker = None
+    bot.market_checker = OpenMarkets()
+    bot.zone_detector = ZoneDetector()
+    bot.zone_book = ZoneBook(persist=False)
+    bot.zone_index = ZoneProximityIndex()
+    bot.analysis_cache = AnalysisCache(interval="1h")
+    bot.rr_optimizer = DynamicRROptimizer()
+    
+    bars = make_hourly_bars(600, start=pd.Timestamp.now(tz="UTC").floor("h") - pd.Timedelta(hours=599))
+    bot.get_bar_analysis("EUR/USD", bars)
+    assert bot.analysis_cache.get("EUR/USD") is not None
+    
+    bot.analyze_symbol("EUR/USD", current_price=float(bars['Close'].iloc[-1]))
+    assert bot.data_fetcher.calls == []
+    
+    # No quote from the scan: falls back to a price lookup
+    bot.analyze_symbol("EUR/USD")
+    assert bot.data_fetcher.calls == [("price", "EUR/USD")]
+    
+    print("   ✅ Scan quote OK")
+
+if __name__ == "__main__":
+    test_last_closed_bar()
+    test_cache_lifetime()
+    test_cached_scores_match()
+    test_cached_symbol_uses_scan_quote()
+    print("🎉 All analysis cache tests passed")
+    sys.exit(0)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test Bar Resampler
+Verifies 1-minute bars aggregate into session-aligned higher timeframes
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from bar_resampler import resample_bars, resample_timeframes, session_for_symbol
+
+def make_minute_bars(days, open_time="09:30", close_time="15:59", tz="America/New_York"):
+    """Regular-session 1-minute bars for the given dates"""
+    index = pd.DatetimeIndex([])
+    for day in days:
+        index = index.append(pd.date_range(f"{day} {open_time}", f"{day} {close_time}", freq="1min", tz=tz))
+    values = np.arange(len(index), dtype=float)
+    return pd.DataFrame({
+        'Open': values,
+        'High': values + 1,
+        'Low': values - 1,
+        'Close': values + 0.5,
+        'Volume': 10.0
+    }, index=index)
+
+def test_ohlcv_aggregation():
+    """Resampled bars match a plain pandas resample when the session is on the grid"""
+    print("🧪 Testing OHLCV aggregation...")
+    
+    bars = make_minute_bars(["2024-03-05"])
+    derived = resample_bars(bars, "15m", "US")
+    expected = bars.resample("15min").agg({
+        'Open': 'first', 'High': 'max', 'Low': 'min', 'Close': 'last', 'Volume': 'sum'
+    })
+    
+    assert len(derived) == 26
+    assert (derived.index == expected.index).all()
+    np.testing.assert_allclose(derived.to_numpy(), expected.to_numpy())
+    
+    print("   ✅ OHLCV aggregation OK")
+
+def test_session_anchoring():
+    """Hourly and 4h bars start at the session open, including across a DST change"""
+    print("🧪 Testing session anchoring...")
+    
+    # US clocks change on 2024-03-10
+    us_bars = make_minute_bars(["2024-03-08", "2024-03-11"])
+    hourly = resample_bars(us_bars, "1h", "US")
+    assert set(hourly.index.strftime("%H:%M")) == {"09:30", "10:30", "11:30", "12:30", "13:30", "14:30", "15:30"}
+    four_hour = resample_bars(us_bars, "4h", "US")
+    assert list(four_hour.index.strftime("%m-%d %H:%M")) == ["03-08 09:30", "03-08 13:30", "03-11 09:30", "03-11 13:30"]
+    assert four_hour['Volume'].iloc[0] == 240 * 10.0
+    
+    uk_bars = make_minute_bars(["2024-03-05"], open_time="08:00", close_time="16:29", tz="Europe/London")
+    assert resample_bars(uk_bars, "1h", "UK").index[0].strftime("%H:%M") == "08:00"
+    
+    daily = resample_bars(us_bars, "1d", "US")
+    assert len(daily) == 2
+    assert daily['Open'].iloc[1] == us_bars['Open'].iloc[390]
+    
+    print("   ✅ Session anchoring OK")
+
+def test_forex_trading_days():
+    """Forex days roll at 17:00 New York, so Sunday's open belongs to Monday"""
+    print("🧪 Testing forex trading days...")
+    
+    index = pd.date_range("2024-03-07 12:00", "2024-03-11 12:00", freq="1h", tz="UTC")
+    index = index[(index.dayofweek < 5) | ((index.dayofweek == 6) & (index.hour >= 21))]
+    index = index[~((index.dayofweek == 4) & (index.hour >= 21))]
+    bars = pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': 1.5, 'Volume': 0.0}, index=index)
+    
+    daily = resample_bars(bars, "1d", "FOREX")
+    local_dates = daily.index.tz_convert("America/New_York").strftime("%a %m-%d")
+    assert list(local_dates) == ["Thu 03-07", "Fri 03-08", "Mon 03-11"]
+    
+    four_hour = resample_bars(bars, "4h", "FOREX").index.tz_convert("America/New_York")
+    assert "Sun 17:00" in set(four_hour.strftime("%a %H:%M"))
+    
+    print("   ✅ Forex trading days OK")
+
+def test_helpers():
+    """Several timeframes at once, and session lookup by symbol"""
+    print("🧪 Testing resampling helpers...")
+    
+    frames = resample_timeframes(make_minute_bars(["2024-03-05"]), ["5m", "1h", "1d"], "US")
+    assert [len(frames[interval]) for interval in ("5m", "1h", "1d")] == [78, 7, 1]
+    
+    assert session_for_symbol("BARC.L") == "UK"
+    assert session_for_symbol("EUR/USD") == "FOREX"
+    assert session_for_symbol("AAPL") == "US"
+    
+    print("   ✅ Resampling helpers OK")
+
+if __name__ == "__main__":
+    test_ohlcv_aggregation()
+    test_session_anchoring()
+    test_forex_trading_days()
+    test_helpers()
+    print("🎉 All bar resampler tests passed")
+    sys.exit(0)
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Test Bar Store
+Verifies bars round-trip through disk, incremental appends merge correctly and
+a failed top-up is not served as fresh data
+"""
+
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bar_store import BarStore, slice_period
+from rate_limited_data_fetcher import RateLimitedDataFetcher
+from request_scheduler import RequestScheduler
+
+def make_bars(start, periods, freq="1h", tz="America/New_York", seed=0):
+    """Build a synthetic OHLCV frame shaped like a yfinance download"""
+    rng = np.random.default_rng(seed)
+    index = pd.date_range(start, periods=periods, freq=freq, tz=tz)
+    close = 100 + rng.standard_normal(periods).cumsum()
+    return pd.DataFrame({
+        'Open': close + 0.1,
+        'High': close + 0.5,
+        'Low': close - 0.5,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, periods).astype(float),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    }, index=index)
+
+def test_round_trip():
+    """Stored bars come back with the same values and timezone"""
+    print("🧪 Testing bar store round trip...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarStore(directory)
+        bars = make_bars("2024-03-01 09:30", 50)
+        store.append("AAPL", "1h", bars)
+        
+        loaded = store.load("AAPL", "1h")
+        assert list(loaded.columns) == ['Open', 'High', 'Low', 'Close', 'Volume']
+        assert str(loaded.index.tz) == "America/New_York"
+        assert loaded.index.equals(bars.index)
+        np.testing.assert_array_equal(loaded['Close'].to_numpy(), bars['Close'].to_numpy())
+        assert store.load("EUR/USD", "1h") is None
+    
+    print("   ✅ Round trip OK")
+
+def test_incremental_append():
+    """Appending overlapping bars replaces the overlap and adds the rest"""
+    print("🧪 Testing incremental append...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarStore(directory)
+        bars = make_bars("2024-03-01 00:00", 48, tz="UTC")
+        store.append("EUR/USD", "1h", bars.iloc[:40])
+        
+        # New download starts at the last stored (still forming) candle
+        update = bars.iloc[39:].copy()
+        update.loc[update.index[0], 'Close'] = 123.0
+        merged = store.append("EUR/USD", "1h", update)
+        
+        assert len(merged) == 48
+        assert merged.index.is_monotonic_increasing
+        assert merged['Close'].iloc[39] == 123.0
+        assert store.last_timestamp("EUR/USD", "1h") == bars.index[-1]
+    
+    print("   ✅ Incremental append OK")
+
+def test_retention_cap():
+    """The store never keeps more than max_bars rows"""
+    print("🧪 Testing retention cap...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarStore(directory, max_bars=30)
+        bars = make_bars("2024-03-01 00:00", 100, tz="UTC")
+        merged = store.append("GOLD", "1h", bars)
+        
+        assert len(merged) == 30
+        assert merged.index[-1] == bars.index[-1]
+    
+    print("   ✅ Retention cap OK")
+
+def test_slice_period():
+    """Day periods keep trading dates, month periods keep a calendar window"""
+    print("🧪 Testing period slicing...")
+    
+    bars = make_bars("2024-03-01 09:30", 24 * 10, tz="America/New_York")
+    
+    one_day = slice_period(bars, "1d")
+    assert one_day.index.normalize().nunique() == 1
+    assert one_day.index[-1] == bars.index[-1]
+    
+    two_days = slice_period(bars, "2d")
+    assert two_days.index.normalize().nunique() == 2
+    
+    long_bars = make_bars("2024-01-01 00:00", 24 * 70, tz="UTC")
+    one_month = slice_period(long_bars, "1mo")
+    assert one_month.index[0] > long_bars.index[-1] - pd.DateOffset(months=1)
+    assert len(slice_period(long_bars, "max")) == len(long_bars)
+    
+    print("   ✅ Period slicing OK")
+
+def test_covers():
+    """Coverage needs enough history and a recent enough last bar"""
+    print("🧪 Testing coverage check...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarStore(directory)
+        now = pd.Timestamp.now(tz="UTC").floor("h")
+        
+        recent = make_bars(now - pd.Timedelta(days=40), 24 * 40, tz="UTC")
+        assert store.covers(recent, "1mo", "1h")
+        assert not store.covers(recent.iloc[-24 * 5:], "1mo", "1h")
+        
+        stale = make_bars(now - pd.Timedelta(days=30), 24 * 10, freq="1min", tz="UTC")
+        assert not store.covers(stale, "1d", "1m")
+        assert not store.covers(None, "1d", "1m")
+    
+    print("   ✅ Coverage check OK")
+
+def test_failed_top_up():
+    """A failed incremental download returns nothing, an empty one returns the stored bars"""
+    print("🧪 Testing failed top-up...")
+    
+    with tempfile.TemporaryDirectory() as directory:
+        store = BarStore(directory)
+        fetcher = RateLimitedDataFetcher(base_delay=0.0, bar_store=store, use_frame_cache=False,
+                                         scheduler=RequestScheduler(rate=1000.0, burst=1000.0),
+                                         use_adaptive_rate=False)
+        now = pd.Timestamp.now(tz="UTC").floor("h")
+        for symbol in ("EUR/USD", "GBP/USD"):
+            store.append(symbol, "1h", make_bars(now - pd.Timedelta(days=40), 24 * 40, tz="UTC"))
+        empty = make_bars(now, 0, tz="UTC")
+        
+        # No new bars since the last stored candle: the stored series is current
+        fetcher._download_history = lambda *args, **kwargs: empty
+        fetcher._download_batch = lambda symbols, *args, **kwargs: {}
+        assert len(fetcher.get_historical_data("EUR/USD", "1mo", "1h")) > 0
+        assert set(fetcher.get_historical_data_batch(["EUR/USD", "GBP/USD"], "1mo", "1h")) == {"EUR/USD", "GBP/USD"}
+        
+        # Yahoo down: the stored bars may be hours old, so they are not returned
+        fetcher._download_history = lambda *args, **kwargs: None
+        fetcher._download_batch = lambda *args, **kwargs: None
+        assert fetcher.get_historical_data("EUR/USD", "1mo", "1h") is None
+        assert fetcher.get_historical_data_batch(["EUR/USD", "GBP/USD"], "1mo", "1h") == {}
+    
+    print("   ✅ Failed top-up OK")
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_incremental_append()
+    test_retention_cap()
+    test_slice_period()
+    test_covers()
+    test_failed_top_up()
+    print("🎉 All bar store tests passed")
+    sys.exit(0)
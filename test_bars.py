@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Test Compact Bars
+Verifies the read-only bar container gives the same zones, zone book, R:R scores,
+indicators and panel as the yfinance frame it was built from, without copying
+bars on the way and with a smaller footprint
+"""
+
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars, as_bars, field, epoch_ns, to_epoch_ns
+from panel import BarPanel
+from zone_book import ZoneBook
+from zone_engine import find_zones_arrays
+from analysis_cache import last_closed_bar
+from indicators import IndicatorLibrary
+from frame_cache import FrameCache
+from dynamic_rr_optimizer import DynamicRROptimizer
+from yahoo_forex_bot import ZoneDetector
+
+def make_yahoo_frame(periods, seed=0, tz="Europe/London"):
+    """Hourly bars shaped like yfinance output (extra Dividends/Stock Splits columns)"""
+    rng = np.random.default_rng(seed)
+    close = 1.1 * np.exp(np.cumsum(rng.normal(0, 0.002, periods)))
+    spread = np.abs(rng.normal(0, 0.0015, periods)) * close
+    index = pd.date_range("2024-03-04 00:00", periods=periods, freq="1h", tz=tz)
+    return pd.DataFrame({
+        'Open': np.round(close, 5),
+        'High': np.round(close + spread, 5),
+        'Low': np.round(close - spread, 5),
+        'Close': np.round(close, 5),
+        'Volume': rng.integers(0, 1000, periods),
+        'Dividends': 0.0,
+        'Stock Splits': 0.0
+    }, index=index)
+
+def test_container():
+    """Fields, views, read-only arrays, slicing and round trip"""
+    print("🧪 Testing Bars container...")
+    
+    frame = make_yahoo_frame(200)
+    bars = Bars.from_frame(frame)
+    
+    assert len(bars) == 200 and not bars.empty and bars.values.shape == (5, 200)
+    assert not hasattr(bars, "__dict__")  # __slots__ only
+    assert 'Dividends' not in bars and 'Close' in bars
+    np.testing.assert_array_equal(bars.close, frame['Close'].to_numpy())
+    np.testing.assert_array_equal(bars['Volume'], frame['Volume'].to_numpy(dtype="float64"))
+    np.testing.assert_array_equal(epoch_ns(bars), frame.index.as_unit("ns").asi8)
+    
+    # Everything handed out is a read-only view of the one block
+    for array in (bars.epoch, bars.values, bars.high, bars.tail(10).close):
+        assert not array.flags.writeable
+    assert np.shares_memory(bars.tail(10).close, bars.values)
+    assert field(bars, 'High') is not None and np.shares_memory(field(bars, 'High'), bars.values)
+    assert as_bars(bars) is bars
+    
+    tail = bars.tail(10)
+    assert len(tail) == 10 and tail.epoch[0] == bars.epoch[-10]
+    assert len(bars.tail(500)) == 200
+    
+    cutoff = frame.index[49]
+    assert len(bars.until(cutoff)) == 50
+    assert len(bars.until(cutoff.tz_convert("UTC").tz_localize(None))) == 50  # Naive = UTC
+    assert len(bars.until(frame.index[0] - pd.Timedelta(hours=1))) == 0
+    
+    pd.testing.assert_frame_equal(bars.to_frame(), frame[['Open', 'High', 'Low', 'Close', 'Volume']],
+                                  check_dtype=False, check_freq=False, check_index_type=False)
+    assert bars.timestamp(-1) == frame.index[-1]
+    
+    empty = Bars.from_frame(pd.DataFrame())
+    assert empty.empty and len(empty) == 0 and Bars.from_frame(None).empty
+    
+    small = Bars.from_frame(frame, dtype="float32")
+    assert small.values.dtype == np.float32 and small.values.nbytes * 2 == bars.values.nbytes
+    
+    print("   ✅ Container OK")
+
+def test_analysis_equivalence():
+    """Zones, zone book, closed bar, R:R scores and indicators match the frame results"""
+    print("🧪 Testing analysis on Bars against frames...")
+    
+    optimizer = DynamicRROptimizer()
+    detector = ZoneDetector()
+    for seed in range(4):
+        frame = make_yahoo_frame(600, seed=seed, tz=[None, "UTC", "Europe/London", "America/New_York"][seed])
+        original_columns = list(frame.columns)
+        bars = Bars.from_frame(frame)
+        
+        zones = detector.find_zones(frame)
+        assert list(frame.columns) == original_columns  # No pivot columns written back
+        assert detector.find_zones(bars) == zones == find_zones_arrays(frame['High'].to_numpy(), frame['Low'].to_numpy())
+        
+        with tempfile.TemporaryDirectory() as directory:
+            assert ZoneBook(directory, persist=False).update("X", bars) == \
+                ZoneBook(directory, persist=False).update("X", frame)
+        
+        now = bars.epoch[-1] / 1e9 + 1800
+        # Bars give UTC timestamps, naive frame timestamps are taken as UTC
+        assert to_epoch_ns(last_closed_bar(bars, "1h", now=now)) == to_epoch_ns(last_closed_bar(frame, "1h", now=now))
+        
+        assert optimizer.analyze_bars(bars, zones) == optimizer.analyze_bars(frame, zones)
+        price = float(frame['Close'].iloc[-1])
+        assert optimizer.optimize_many(bars, price, zones) == optimizer.optimize_many(frame, price, zones)
+        
+        library = IndicatorLibrary()
+        np.testing.assert_array_equal(library.atr(bars, 14, symbol="X"), library.atr(frame, 14))
+        np.testing.assert_array_equal(library.ema(bars, 20, symbol="X"), library.ema(frame, 20))
+        library.atr(bars.tail(600), 14, symbol="X")  # Same window from another view: memo hit
+        assert library.get_stats()["hits"] == 1
+        
+        panel_from_bars = BarPanel.from_frames({"X": bars})
+        panel_from_frame = BarPanel.from_frames({"X": frame})
+        np.testing.assert_array_equal(panel_from_bars.values, panel_from_frame.values)
+        assert panel_from_bars.index.equals(panel_from_frame.index)
+    
+    print("   ✅ Analysis equivalence OK")
+
+def test_frame_cache_shares_bars():
+    """Cached Bars are handed out as-is (they can't be modified, no copy needed)"""
+    print("🧪 Testing frame cache with Bars...")
+    
+    cache = FrameCache()
+    bars = Bars.from_frame(make_yahoo_frame(100))
+    cache.put(("X", "1mo", "1h", "bars"), bars, "1h")
+    assert cache.get(("X", "1mo", "1h", "bars")) is bars
+    assert cache.get_stats()["bytes"] == bars.nbytes
+    
+    print("   ✅ Frame cache OK")
+
+def test_memory_and_allocations():
+    """Footprint per symbol and time to read the hot-path fields"""
+    print("🧪 Comparing memory and field access...")
+    
+    frame = make_yahoo_frame(24 * 30 * 3)
+    bars = Bars.from_frame(frame)
+    frame_bytes = int(frame.memory_usage(index=True, deep=True).sum())
+    small_bytes = Bars.from_frame(frame, dtype="float32").nbytes
+    print(f"   frame {frame_bytes / 1024:.0f} KiB, Bars {bars.nbytes / 1024:.0f} KiB, "
+          f"float32 Bars {small_bytes / 1024:.0f} KiB")
+    assert bars.nbytes < frame_bytes
+    
+    runs = 2000
+    start = time.perf_counter()
+    for _ in range(runs):
+        frame['High'].to_numpy(dtype="float64"), frame['Low'].to_numpy(dtype="float64"), frame['Close'].iloc[-1]
+    frame_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(runs):
+        field(bars, 'High'), field(bars, 'Low'), field(bars, 'Close')[-1]
+    bars_seconds = time.perf_counter() - start
+    
+    print(f"   field access x{runs}: frame {frame_seconds * 1000:.1f} ms, Bars {bars_seconds * 1000:.1f} ms")
+    print("   ✅ Memory comparison done")
+
+if __name__ == "__main__":
+    test_container()
+    test_analysis_equivalence()
+    test_frame_cache_shares_bars()
+    test_memory_and_allocations()
+    print("🎉 All bars tests passed")
+    sys.exit(0)
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Test Breakout Engine
+Verifies the cross-sectional crossing, volume surge and bias flags match the
+per-symbol ORB checks, that only flagged symbols are dispatched, and how the
+scan scales from 24 to hundreds of symbols
+"""
+
+import sys
+import time
+
+import numpy as np
+
+from panel import BarPanel
+from bar_store import slice_period
+from bar_resampler import resample_timeframes
+from breakout_engine import BreakoutEngine, LONG, SHORT, volume_surge, higher_timeframe_bias
+from test_market_snapshot import make_minute_bars, make_frames, make_bot
+
+def test_crossings_and_ranges():
+    """ORH/ORL arrays against the quote vector, unknown symbols and cleared ranges"""
+    print("🧪 Testing crossings...")
+    
+    engine = BreakoutEngine(['A', 'B', 'C'], min_flags=0)
+    engine.set_range('A', {'orh': 101.0, 'orl': 99.0, 'range_size': 2.0, 'volume_avg': 500.0})
+    engine.set_range('B', {'orh': 51.0, 'orl': 49.0})
+    engine.load({'D': {'orh': 11.0, 'orl': 9.0}})  # New symbol grows the arrays
+    assert engine.symbols == ['A', 'B', 'C', 'D'] and engine.range_size[1] == 2.0
+    assert engine.has_range('D') and not engine.has_range('C') and not engine.has_range('X')
+    
+    symbols = ['D', 'A', 'B', 'C', 'X']
+    signals = engine.evaluate(symbols, np.array([8.0, 101.5, 50.0, 70.0, 1.0]))
+    assert list(signals.direction) == [SHORT, LONG, 0, 0, 0]
+    assert signals.crossings() == signals.flagged() == ['D', 'A']
+    assert signals.get('A')['direction'] == 'LONG' and signals.get('B')['direction'] is None
+    
+    # Prices exactly on the range edge are not breakouts, NaN prices never are
+    signals = engine.evaluate(symbols, np.array([9.0, 101.0, np.nan, 70.0, 1.0]))
+    assert signals.crossings() == []
+    
+    engine.clear(['A'])
+    assert not engine.has_range('A')
+    assert engine.evaluate(['A'], np.array([500.0])).crossings() == []
+    
+    assert BreakoutEngine().evaluate([], np.array([])).flagged() == []
+    
+    print("   ✅ Crossings OK")
+
+def test_flags_match_per_symbol_checks():
+    """Volume surge and 15m bias from the panel equal the bot's per-symbol analysis"""
+    print("🧪 Testing volume surge and bias against the per-symbol path...")
+    
+    frames = make_frames()
+    for seed, symbol in enumerate(['SURGE', 'QUIET'], start=20):
+        frame = make_minute_bars(seed)
+        frame.iloc[-3:, frame.columns.get_loc('Volume')] *= 10 if symbol == 'SURGE' else 0.1
+        frames[symbol] = frame
+    
+    bot = make_bot(frames)
+    bot.us_stocks = bot.us_stocks + ['SURGE', 'QUIET']
+    bot.all_stocks = bot.us_stocks + bot.uk_stocks
+    snapshot = bot.build_market_snapshot(bot.all_stocks)
+    panel = snapshot.panel
+    
+    surge = volume_surge(panel)
+    bias = higher_timeframe_bias(panel)
+    for symbol in panel.symbols:
+        i = panel.position(symbol)
+        frames_for_symbol = snapshot.timeframes(symbol)
+        volume = bot.enhanced_volume_analysis(symbol, slice_period(frames_for_symbol["5m"], "1d"))
+        expected_bias = bot.get_higher_timeframe_bias(symbol, frames_for_symbol)['bias_15m']
+        assert np.isclose(surge[i], volume['volume_surge']), (symbol, surge[i], volume['volume_surge'])
+        assert {LONG: 'BULLISH', SHORT: 'BEARISH'}[bias[i]] == expected_bias, symbol
+    assert surge[panel.position('SURGE')] >= 1.5 > surge[panel.position('QUIET')]
+    
+    print("   ✅ Flags match")
+
+def test_dispatch():
+    """Crossings need a volume surge or an aligned bias before the full confirmation"""
+    print("🧪 Testing dispatch rule...")
+    
+    engine = BreakoutEngine(['A', 'B', 'C', 'D'], min_flags=1)
+    engine.load({symbol: {'orh': 101.0, 'orl': 99.0} for symbol in engine.symbols})
+    prices = np.array([102.0, 102.0, 98.0, 100.0])
+    signals = engine.evaluate(engine.symbols, prices, volume_surge=np.array([2.0, 1.0, 1.0, 3.0]),
+                              bias=np.array([SHORT, SHORT, SHORT, LONG]))
+    
+    assert signals.crossings() == ['A', 'B', 'C']
+    assert signals.flagged() == ['A', 'C']  # A: surge, C: SHORT with bearish bias, B: neither
+    assert signals.get('C')['aligned'] and not signals.get('C')['surge']
+    assert not signals.get('D')['surge']  # Inside the range: no flags at all
+    
+    engine.min_flags = 2
+    assert engine.evaluate(engine.symbols, prices, volume_surge=np.array([2.0, 1.0, 1.0, 3.0]),
+                           bias=np.array([LONG, SHORT, SHORT, LONG])).flagged() == ['A']
+    
+    print("   ✅ Dispatch OK")
+
+def test_benchmark():
+    """Engine pass against per-symbol crossing, volume and bias checks, 24 and 300 symbols"""
+    for count in (24, 300):
+        print(f"🧪 Benchmarking {count} symbols...")
+        frames = {f"SYM{seed}": make_minute_bars(seed) for seed in range(count)}
+        panel = BarPanel.from_frames(frames)
+        ranges = {symbol: {'orh': float(frame['Close'].iloc[-1]) * 0.999, 'orl': float(frame['Close'].iloc[-1]) * 0.99}
+                  for symbol, frame in frames.items()}
+        bot = make_bot(frames)
+        
+        start = time.perf_counter()
+        loop_breakouts = set()
+        for symbol, frame in frames.items():
+            price = float(frame['Close'].iloc[-1])
+            if price > ranges[symbol]['orh'] or price < ranges[symbol]['orl']:
+                timeframes = resample_timeframes(frame, ("5m", "15m", "1h"))
+                bot.enhanced_volume_analysis(symbol, slice_period(timeframes["5m"], "1d"))
+                bot.get_higher_timeframe_bias(symbol, timeframes)
+                loop_breakouts.add(symbol)
+        per_symbol = time.perf_counter() - start
+        
+        engine = BreakoutEngine(frames, min_flags=0)
+        engine.load(ranges)
+        start = time.perf_counter()
+        signals = engine.evaluate_panel(panel)
+        engine_seconds = time.perf_counter() - start
+        
+        assert set(signals.flagged()) == loop_breakouts == set(frames)
+        print(f"   per symbol {per_symbol * 1000:.1f} ms, engine {engine_seconds * 1000:.1f} ms")
+    
+    print("   ✅ Benchmark done")
+
+if __name__ == "__main__":
+    test_crossings_and_ranges()
+    test_flags_match_per_symbol_checks()
+    test_dispatch()
+    test_benchmark()
+    print("🎉 All breakout engine tests passed")
+    sys.exit(0)
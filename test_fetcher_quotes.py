@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Fetcher Quotes
+Verifies batched quotes, the daily-bar fallback and prices derived from fresh bars
+"""
+
+import sys
+
+import pandas as pd
+
+import rate_limited_data_fetcher as fetcher_module
+from rate_limited_data_fetcher import RateLimitedDataFetcher
+from request_scheduler import RequestScheduler
+
+class FakeYfData:
+    """Stands in for yfinance's JSON client and records the requested symbols"""
+    
+    requests = []
+    fail = False
+
+    def __init__(self, session=None):
+        pass
+
+    def get_raw_json(self, url, params=None, timeout=30):
+        FakeYfData.requests.append(params["symbols"])
+        if FakeYfData.fail:
+            raise ValueError("Invalid Crumb")
+        return {"quoteResponse": {"result": [
+            {"symbol": "AAPL", "regularMarketPrice": 190.5, "bid": 190.4, "ask": 190.6,
+             "regularMarketTime": 1700000000},
+            {"symbol": "GC=F", "regularMarketPrice": 1980.0, "bid": 0, "ask": 0},
+            {"symbol": "DEAD", "regularMarketPrice": None}
+        ]}}
+
+def fake_download(tickers, **kwargs):
+    """Grouped daily-bar frame shaped like yf.download(group_by='ticker')"""
+    index = pd.date_range("2024-03-04", periods=3, freq="1D", tz="UTC")
+    frames = {
+        ticker: pd.DataFrame({'Open': 1.0, 'High': 2.0, 'Low': 0.5, 'Close': [10.0, 11.0, 12.0 + i],
+                              'Volume': 100.0}, index=index)
+        for i, ticker in enumerate(tickers)
+    }
+    return pd.concat(frames, axis=1)
+
+def make_fetcher():
+    """Fetcher with no throttling, caches or persistent state"""
+    return RateLimitedDataFetcher(base_delay=0.0, use_bar_store=False, use_frame_cache=False,
+                                  scheduler=RequestScheduler(rate=1000.0, burst=1000.0),
+                                  use_adaptive_rate=False)
+
+def test_quote_endpoint():
+    """One request returns last/bid/ask/timestamp for every symbol"""
+    print("🧪 Testing quote endpoint...")
+    
+    original = fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE
+    fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE = FakeYfData, True
+    FakeYfData.requests, FakeYfData.fail = [], False
+    try:
+        fetcher = make_fetcher()
+        quotes = fetcher.get_quotes(["AAPL", "GOLD", "DEAD", "AAPL"])
+        
+        assert FakeYfData.requests == ["AAPL,GC=F,DEAD"]
+        assert set(quotes) == {"AAPL", "GOLD"}
+        assert quotes["AAPL"]["bid"] == 190.4 and quotes["AAPL"]["ask"] == 190.6
+        assert quotes["AAPL"]["timestamp"] == pd.Timestamp(1700000000, unit="s", tz="UTC")
+        assert quotes["GOLD"]["last"] == 1980.0 and quotes["GOLD"]["bid"] is None
+        assert fetcher.get_current_price("AAPL") == 190.5
+        assert fetcher.get_multiple_prices(["AAPL", "GOLD"]) == {"AAPL": 190.5, "GOLD": 1980.0}
+    finally:
+        fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE = original
+    
+    print("   ✅ Quote endpoint OK")
+
+def test_daily_bar_fallback():
+    """If the endpoint refuses the request, last prices come from one daily-bar download"""
+    print("🧪 Testing daily-bar fallback...")
+    
+    original = fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE, fetcher_module.yf.download
+    fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE = FakeYfData, True
+    fetcher_module.yf.download = fake_download
+    FakeYfData.requests, FakeYfData.fail = [], True
+    try:
+        fetcher = make_fetcher()
+        quotes = fetcher.get_quotes(["AAPL", "MSFT"])
+        
+        assert len(FakeYfData.requests) == 1
+        assert quotes["AAPL"]["last"] == 12.0
+        assert quotes["MSFT"]["last"] == 13.0
+        assert quotes["MSFT"]["ask"] is None
+        assert fetcher.get_status()["quote_stats"]["fallback_requests"] == 1
+    finally:
+        fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE, fetcher_module.yf.download = original
+    
+    print("   ✅ Daily-bar fallback OK")
+
+def test_price_from_fresh_bars():
+    """A recent bar download answers price lookups without another request"""
+    print("🧪 Testing bar-derived prices...")
+    
+    original = fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE, fetcher_module.yf.download
+    fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE = FakeYfData, True
+    fetcher_module.yf.download = fake_download
+    FakeYfData.requests, FakeYfData.fail = [], False
+    try:
+        fetcher = make_fetcher()
+        fetcher.get_historical_data_batch(["AAPL", "MSFT"], period="5d", interval="1d")
+        
+        assert fetcher.get_current_price("MSFT") == 13.0
+        assert FakeYfData.requests == []
+        
+        # Too old for the caller's threshold: ask the quote endpoint
+        assert fetcher.get_current_price("AAPL", max_age=-1) == 190.5
+        assert FakeYfData.requests == ["AAPL"]
+        assert fetcher.get_status()["quote_stats"]["prices_from_bars"] == 1
+    finally:
+        fetcher_module.YfData, fetcher_module.QUOTE_ENDPOINT_AVAILABLE, fetcher_module.yf.download = original
+    
+    print("   ✅ Bar-derived prices OK")
+
+if __name__ == "__main__":
+    test_quote_endpoint()
+    test_daily_bar_fallback()
+    test_price_from_fresh_bars()
+    print("🎉 All fetcher quote tests passed")
+    sys.exit(0)
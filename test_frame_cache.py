@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Frame Cache
+Verifies TTL expiry, LRU eviction and hit/miss accounting
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from frame_cache import FrameCache, get_shared_frame_cache
+
+def make_frame(rows=100):
+    """Small OHLCV frame for cache tests"""
+    index = pd.date_range("2024-01-01", periods=rows, freq="1min", tz="UTC")
+    values = np.arange(rows, dtype=float)
+    return pd.DataFrame({'Open': values, 'High': values, 'Low': values, 'Close': values, 'Volume': values}, index=index)
+
+def test_hit_and_miss():
+    """Second lookup of the same key is a hit and returns the same bars"""
+    print("🧪 Testing cache hit/miss...")
+    
+    cache = FrameCache()
+    key = ("AAPL", "1d", "5m")
+    assert cache.get(key) is None
+    
+    frame = make_frame()
+    cache.put(key, frame, "5m")
+    cached = cache.get(key)
+    assert cached is not None and cached.equals(frame)
+    
+    # Adding a column to the returned frame must not change the cached copy
+    cached['pivot_high'] = True
+    assert 'pivot_high' not in cache.get(key).columns
+    
+    stats = cache.get_stats()
+    assert stats['hits'] == 2 and stats['misses'] == 1
+    print(f"   ✅ Stats: {stats}")
+
+def test_ttl_expiry():
+    """Entries expire after their interval TTL"""
+    print("🧪 Testing TTL expiry...")
+    
+    cache = FrameCache(interval_ttls={"1m": 0.05})
+    cache.put(("EUR/USD", "1d", "1m"), make_frame(), "1m")
+    cache.put(("EUR/USD", "1mo", "1h"), make_frame(), "1h")
+    time.sleep(0.1)
+    
+    assert cache.get(("EUR/USD", "1d", "1m")) is None
+    assert cache.get(("EUR/USD", "1mo", "1h")) is not None
+    assert cache.get_stats()['expirations'] == 1
+    print("   ✅ TTL expiry OK")
+
+def test_lru_eviction():
+    """Least recently used entries are evicted first"""
+    print("🧪 Testing LRU eviction...")
+    
+    cache = FrameCache(max_entries=2)
+    cache.put(("A", "1d", "5m"), make_frame(), "5m")
+    cache.put(("B", "1d", "5m"), make_frame(), "5m")
+    cache.get(("A", "1d", "5m"))  # A is now most recently used
+    cache.put(("C", "1d", "5m"), make_frame(), "5m")
+    
+    assert cache.get(("B", "1d", "5m")) is None
+    assert cache.get(("A", "1d", "5m")) is not None
+    assert cache.get(("C", "1d", "5m")) is not None
+    
+    frame_bytes = int(make_frame().memory_usage(index=True).sum())
+    small = FrameCache(max_bytes=frame_bytes * 2)
+    for symbol in ["A", "B", "C"]:
+        small.put((symbol, "1d", "5m"), make_frame(), "5m")
+    assert small.get_stats()['entries'] == 2
+    assert small.get_stats()['bytes'] <= frame_bytes * 2
+    print("   ✅ LRU eviction OK")
+
+def test_shared_cache():
+    """Every caller in the process gets the same cache"""
+    assert get_shared_frame_cache() is get_shared_frame_cache()
+
+if __name__ == "__main__":
+    test_hit_and_miss()
+    test_ttl_expiry()
+    test_lru_eviction()
+    test_shared_cache()
+    print("🎉 All frame cache tests passed")
+    sys.exit(0)
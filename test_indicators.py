@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Test Indicator Library
+Verifies the NumPy kernels against the pandas formulas the bots used and
+that memoized results are reused only for the same bar window
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from indicators import IndicatorLibrary
+
+def make_bars(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    spread = np.abs(rng.normal(0, 0.005, periods)) * close
+    index = pd.date_range("2024-01-02 14:30", periods=periods, freq="5min", tz="UTC")
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, periods).astype(float)
+    }, index=index)
+
+def pandas_atr(df, period=14):
+    tr = pd.concat([
+        df['High'] - df['Low'],
+        abs(df['High'] - df['Close'].shift(1)),
+        abs(df['Low'] - df['Close'].shift(1))
+    ], axis=1).max(axis=1)
+    return tr.rolling(window=period).mean()
+
+def test_kernels_match_pandas():
+    """ATR, EMA, rolling windows and tail means agree with pandas"""
+    print("🧪 Testing indicator kernels against pandas...")
+    
+    for seed, periods in enumerate((1, 13, 14, 100, 2000)):
+        bars = make_bars(periods, seed=seed)
+        if periods > 50:
+            bars.iloc[30, bars.columns.get_loc('Close')] = np.nan
+        
+        np.testing.assert_allclose(
+            indicators.atr(bars['High'], bars['Low'], bars['Close'], 14), pandas_atr(bars).to_numpy(), rtol=1e-12
+        )
+        for span in (2, 20, 50):
+            np.testing.assert_allclose(
+                indicators.ema(bars['Close'], span), bars['Close'].ewm(span=span).mean().to_numpy(), rtol=1e-12
+            )
+        for how in ("mean", "sum", "max", "min"):
+            expected = getattr(bars['Close'].rolling(20), how)().to_numpy()
+            np.testing.assert_allclose(indicators.rolling_window(bars['Close'], 20, how), expected, rtol=1e-12)
+        for window in (5, 20, 50):
+            assert np.isclose(indicators.tail_mean(bars['Volume'], window), bars['Volume'].tail(window).mean())
+    
+    print("   ✅ Kernels OK")
+
+def test_wilder_and_rsi():
+    """Wilder ATR and RSI follow the textbook recursion"""
+    print("🧪 Testing Wilder smoothing and RSI...")
+    
+    bars = make_bars(500, seed=3)
+    close = bars['Close'].to_numpy()
+    tr = indicators.true_range(bars['High'], bars['Low'], close)
+    
+    expected_atr = np.full(len(tr), np.nan)
+    expected_atr[13] = tr[:14].mean()
+    for i in range(14, len(tr)):
+        expected_atr[i] = (expected_atr[i - 1] * 13 + tr[i]) / 14
+    np.testing.assert_allclose(indicators.atr(bars['High'], bars['Low'], close, 14, method="wilder"),
+                               expected_atr, rtol=1e-12)
+    
+    delta = np.diff(close)
+    gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    avg_gain, avg_loss = gains[:14].mean(), losses[:14].mean()
+    expected_rsi = [100 - 100 / (1 + avg_gain / avg_loss)]
+    for gain, loss in zip(gains[14:], losses[14:]):
+        avg_gain = (avg_gain * 13 + gain) / 14
+        avg_loss = (avg_loss * 13 + loss) / 14
+        expected_rsi.append(100 - 100 / (1 + avg_gain / avg_loss))
+    
+    rsi = indicators.rsi(close, 14)
+    assert np.isnan(rsi[:14]).all()
+    np.testing.assert_allclose(rsi[14:], expected_rsi, rtol=1e-10)
+    
+    print("   ✅ Wilder/RSI OK")
+
+def test_memoization():
+    """Same window -> cached result; a new or revised bar -> recomputed"""
+    print("🧪 Testing per-bar memoization...")
+    
+    library = IndicatorLibrary()
+    bars = make_bars(200, seed=1)
+    
+    first = library.atr(bars, 14, symbol="AAPL", interval="5m")
+    assert library.atr(bars.copy(), 14, symbol="AAPL", interval="5m") is first
+    assert not first.flags.writeable
+    
+    # A different slice ending on the same bar is a different window
+    assert len(library.atr(bars.tail(50), 14, symbol="AAPL", interval="5m")) == 50
+    
+    # Still-forming last bar: same timestamp, new close
+    revised = bars.copy()
+    revised.iloc[-1, revised.columns.get_loc('Close')] *= 1.01
+    assert library.ema(revised, 20, symbol="AAPL", interval="5m")[-1] != \
+        library.ema(bars, 20, symbol="AAPL", interval="5m")[-1]
+    
+    # Without a symbol nothing is cached
+    library.volume_average(bars, 20)
+    
+    stats = library.get_stats()
+    assert stats["hits"] == 1 and stats["misses"] == 4, stats
+    
+    print(f"   Stats: {stats}")
+    print("   ✅ Memoization OK")
+
+if __name__ == "__main__":
+    test_kernels_match_pandas()
+    test_wilder_and_rsi()
+    test_memoization()
+    print("🎉 All indicator tests passed")
+    sys.exit(0)
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Test Market Snapshot
+Verifies one ORB loop gathers its bars and quotes in one batch each, that the
+snapshot can't be modified, and that opening ranges, entry confirmations and
+trade monitoring read from it with the same results as fetching per symbol
+"""
+
+import sys
+
+import numpy as np
+import pandas as pd
+
+from indicators import IndicatorLibrary
+from breakout_engine import BreakoutEngine
+
+def make_minute_bars(seed=0, days=("2024-03-04", "2024-03-05"), open_time="09:30", close_time="15:59",
+                     tz="America/New_York", start_price=100.0):
+    """Regular-session 1-minute random-walk bars"""
+    rng = np.random.default_rng(seed)
+    index = pd.DatetimeIndex([])
+    for day in days:
+        index = index.append(pd.date_range(f"{day} {open_time}", f"{day} {close_time}", freq="1min", tz=tz))
+    close = start_price * np.exp(np.cumsum(rng.normal(0, 0.001, len(index))))
+    spread = np.abs(rng.normal(0, 0.0008, len(index))) * close
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(100, 5000, len(index)).astype(float)
+    }, index=index)
+
+class CountingFetcher:
+    """Stands in for the rate-limited fetcher and counts every request"""
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = {"history": 0, "batch": 0, "quotes": 0}
+
+    def get_historical_data(self, symbol, period="1mo", interval="1h", priority="scan"):
+        self.calls["history"] += 1
+        return self.frames.get(symbol)
+
+    def get_historical_data_batch(self, symbols, period="1mo", interval="1h", priority="scan"):
+        self.calls["batch"] += 1
+        return {symbol: self.frames[symbol] for symbol in symbols if symbol in self.frames}
+
+    def get_quotes(self, symbols, priority="scan"):
+        self.calls["quotes"] += 1
+        return {symbol: {'last': float(self.frames[symbol]['Close'].iloc[-1]) * 1.001, 'bid': None, 'ask': None,
+                         'timestamp': None} for symbol in symbols if symbol in self.frames}
+
+def make_bot(frames):
+    from enhanced_orb_stock_bot import EnhancedORBStockTradingBot
+    bot = object.__new__(EnhancedORBStockTradingBot)  # No Telegram, files or network
+    bot.us_stocks = ['AAPL', 'MSFT', 'NVDA']
+    bot.uk_stocks = ['BP.L', 'VOD.L']
+    bot.all_stocks = bot.us_stocks + bot.uk_stocks
+    bot.active_trades = {}
+    bot.opening_ranges = {}
+    bot.breakout_engine = BreakoutEngine(bot.all_stocks)
+    bot.indicators = IndicatorLibrary()
+    bot.data_fetcher = CountingFetcher(frames)
+    bot.save_trades_data = lambda: None
+    return bot
+
+def make_frames():
+    frames = {symbol: make_minute_bars(seed) for seed, symbol in enumerate(['AAPL', 'MSFT', 'NVDA'])}
+    for seed, symbol in enumerate(['BP.L', 'VOD.L'], start=10):
+        frames[symbol] = make_minute_bars(seed, open_time="08:00", close_time="16:29", tz="Europe/London")
+    return frames
+
+def test_snapshot_is_bulk_and_immutable():
+    """One bar batch and one quote batch per loop, read-only afterwards"""
+    print("🧪 Testing snapshot build...")
+    
+    frames = make_frames()
+    del frames['NVDA']  # Batch returns nothing for it
+    bot = make_bot(frames)
+    bot.active_trades = {'t1': {'symbol': 'AAPL', 'status': 'ACTIVE'}, 't2': {'symbol': 'BP.L', 'status': 'ACTIVE'}}
+    
+    snapshot = bot.build_market_snapshot(bot.all_stocks)
+    assert bot.data_fetcher.calls == {"history": 0, "batch": 1, "quotes": 1}
+    assert snapshot.requests == 2 and snapshot.build_seconds >= 0
+    assert set(snapshot.bars) == {'AAPL', 'MSFT', 'BP.L', 'VOD.L'} and 'NVDA' not in snapshot
+    assert set(snapshot.quotes) == {'AAPL', 'BP.L'}
+    assert snapshot.latest('NVDA') is None and snapshot.timeframes('NVDA') == {}
+    
+    assert snapshot.latest('MSFT') == (float(frames['MSFT']['Close'].iloc[-1]), float(frames['MSFT']['Volume'].iloc[-1]))
+    assert snapshot.price('AAPL') == snapshot.quotes['AAPL']['last']   # Quote wins
+    assert snapshot.price('MSFT') == snapshot.latest('MSFT')[0]         # Else the last 1-minute close
+    
+    for attempt in (lambda: setattr(snapshot, 'quotes', {}),
+                    lambda: snapshot.bars.__setitem__('X', None),
+                    lambda: snapshot.quotes.pop('AAPL')):
+        try:
+            attempt()
+            raise AssertionError("snapshot was modified")
+        except (AttributeError, TypeError):
+            pass
+    
+    # No trades and no stocks: nothing to fetch
+    empty = make_bot({}).build_market_snapshot([])
+    assert empty.requests == 0 and len(empty.panel) == 0
+    
+    print(f"   {snapshot.describe()}")
+    print("   ✅ Snapshot build OK")
+
+def test_timeframes_match_per_symbol_fetch():
+    """Resampled frames, opening ranges and entry checks equal the per-symbol path"""
+    print("🧪 Testing snapshot reads against per-symbol fetches...")
+    
+    frames = make_frames()
+    bot = make_bot(frames)
+    snapshot = bot.build_market_snapshot(bot.all_stocks)
+    
+    for symbol in bot.all_stocks:
+        expected = bot.get_timeframes(symbol)
+        actual = snapshot.timeframes(symbol)
+        assert set(actual) == set(expected)
+        for interval in expected:
+            pd.testing.assert_frame_equal(actual[interval], expected[interval])
+        assert snapshot.timeframes(symbol) is actual  # Resampled once per loop
+        pd.testing.assert_frame_equal(snapshot.frame(symbol, "15m"), expected["15m"])
+        
+        assert bot.calculate_opening_range(symbol, snapshot)['orh'] == bot.calculate_opening_range(symbol)['orh']
+        
+        # Force a breakout and compare the whole confirmation result
+        price, volume = snapshot.latest(symbol)
+        bot.opening_ranges[symbol].update({'orh': price * 0.99, 'orl': price * 0.98})
+        assert bot.enhanced_entry_conditions(symbol, price, volume, snapshot=snapshot) == \
+            bot.enhanced_entry_conditions(symbol, price, volume)
+    
+    calls = dict(bot.data_fetcher.calls)
+    for symbol in bot.all_stocks:
+        bot.enhanced_entry_conditions(symbol, *snapshot.latest(symbol), snapshot=snapshot)
+    assert bot.data_fetcher.calls == calls  # Snapshot reads never fetch
+    
+    print("   ✅ Snapshot reads OK")
+
+def test_monitor_reads_snapshot():
+    """Trade monitoring takes prices from the snapshot instead of its own quote request"""
+    print("🧪 Testing trade monitor on the snapshot...")
+    
+    frames = make_frames()
+    bot = make_bot(frames)
+    last = float(frames['AAPL']['Close'].iloc[-1])
+    bot.active_trades = {'t1': {'symbol': 'AAPL', 'direction': 'LONG', 'status': 'ACTIVE', 'entry_price': last,
+                                'current_stop': last * 1.01, 'target1': last * 2, 'target2': last * 3,
+                                'target3': last * 4, 'tp1_hit': False, 'tp2_hit': False}}
+    closed = []
+    bot.close_trade = lambda trade_id, price, reason: closed.append((trade_id, price, reason))
+    
+    snapshot = bot.build_market_snapshot(['AAPL'])
+    calls = dict(bot.data_fetcher.calls)
+    bot.monitor_active_trades(snapshot)
+    
+    assert bot.data_fetcher.calls == calls
+    assert closed == [('t1', snapshot.quotes['AAPL']['last'], "Stop Loss Hit")]
+    
+    print("   ✅ Monitor OK")
+
+if __name__ == "__main__":
+    test_snapshot_is_bulk_and_immutable()
+    test_timeframes_match_per_symbol_fetch()
+    test_monitor_reads_snapshot()
+    print("🎉 All market snapshot tests passed")
+    sys.exit(0)
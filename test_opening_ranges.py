@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Test Session Opening Ranges
+Verifies the bulk opening-range job computes every stock of a market (not just
+the first), matches the per-symbol calculation, waits for the range to close,
+that a restart reuses the persisted ranges without fetching, and that stocks
+without bars are retried until the ORB cutoff
+"""
+
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from orb_scheduler import ORBScheduler, TradingCalendar
+from panel import BarPanel
+from opening_ranges import OpeningRangeStore, compute_opening_ranges, trading_day, session_open, opening_range_end
+from test_market_snapshot import make_frames, make_bot
+
+def utc(text):
+    return pd.Timestamp(text, tz="UTC").to_pydatetime()
+
+def make_job_bot(frames, path):
+    bot = make_bot(frames)
+    bot.opening_range_store = OpeningRangeStore(path)
+    bot.opening_range_days = {}
+    bot.scheduler = ORBScheduler(calendar=TradingCalendar(calendars={}))  # Weekdays, no calendar lookups
+    return bot
+
+def test_session_clock():
+    """Session open and trading day follow the exchange clock through DST"""
+    print("🧪 Testing session clock...")
+    
+    assert str(session_open("US", "2024-03-05")) == "2024-03-05 14:30:00+00:00"
+    assert str(session_open("US", "2024-07-02")) == "2024-07-02 13:30:00+00:00"
+    assert str(opening_range_end("UK", "2024-07-02")) == "2024-07-02 07:30:00+00:00"
+    assert trading_day("US", utc("2024-03-06 02:00")) == "2024-03-05"  # Still the 5th in New York
+    
+    print("   ✅ Session clock OK")
+
+def test_ranges_match_per_symbol():
+    """One array pass gives the same ranges as calculate_opening_range per symbol"""
+    print("🧪 Testing vectorized opening ranges...")
+    
+    frames = make_frames()
+    frames['LATE'] = frames['MSFT'][frames['MSFT'].index >= "2024-03-05 10:00"]  # No bars in today's range
+    bot = make_bot(frames)
+    
+    for market, stocks in (("US", bot.us_stocks), ("UK", bot.uk_stocks)):
+        panel = BarPanel.from_frames({symbol: frames[symbol] for symbol in stocks + ['LATE']})
+        ranges = compute_opening_ranges(panel, market, "2024-03-05")
+        for symbol in stocks:
+            expected = bot.calculate_opening_range(symbol)
+            five_minute = bot.get_timeframes(symbol, intervals=("5m",))["5m"]
+            opening = five_minute[five_minute.index.normalize() == five_minute.index[-1].normalize()].head(6)
+            assert ranges[symbol]['orh'] == expected['orh'] and ranges[symbol]['orl'] == expected['orl']
+            assert np.isclose(ranges[symbol]['range_size'], expected['range_size'])
+            assert np.isclose(ranges[symbol]['volume_avg'], opening['Volume'].mean())
+            assert ranges[symbol]['bars'] == 30 and ranges[symbol]['date'] == "2024-03-05"
+        assert set(ranges) == set(stocks)  # LATE has no bars in either opening range
+    
+    assert compute_opening_ranges(BarPanel.from_frames({}), "US", "2024-03-05") == {}
+    
+    print("   ✅ Vectorized ranges OK")
+
+def test_job_and_restart():
+    """One request per market, all stocks computed, persisted and reused after a restart"""
+    print("🧪 Testing opening-range job...")
+    
+    frames = make_frames()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "opening_ranges.json")
+        bot = make_job_bot(frames, path)
+        bot.opening_ranges = {'AAPL': {'orh': 1.0, 'orl': 0.5}}  # Yesterday's
+        bot.breakout_engine.load(bot.opening_ranges)
+        
+        # Opening range still forming: stale ranges dropped, nothing fetched
+        bot.update_opening_ranges("US", now=utc("2024-03-05 14:45"))
+        assert bot.opening_ranges == {} and not bot.breakout_engine.has_range('AAPL')
+        assert bot.data_fetcher.calls["batch"] == 0
+        
+        # Range closed: every US stock in one batch (the old date guard stopped after the first)
+        bot.update_opening_ranges("US", now=utc("2024-03-05 15:00:03"))
+        assert bot.data_fetcher.calls == {"history": 0, "batch": 1, "quotes": 0}
+        assert set(bot.opening_ranges) == set(bot.us_stocks)
+        assert all(bot.breakout_engine.has_range(symbol) for symbol in bot.us_stocks)
+        bot.update_opening_ranges("US", now=utc("2024-03-05 16:00"))
+        assert bot.data_fetcher.calls["batch"] == 1  # Once per day
+        
+        # UK from the loop's snapshot: no request of its own
+        snapshot = bot.build_market_snapshot(bot.uk_stocks)
+        calls = dict(bot.data_fetcher.calls)
+        bot.update_opening_ranges("UK", snapshot=snapshot, now=utc("2024-03-05 08:31"))
+        assert bot.data_fetcher.calls == calls and set(bot.opening_ranges) == set(bot.all_stocks)
+        
+        # Restart mid-session: ranges come back from disk
+        restarted = make_job_bot(frames, path)
+        restarted.update_opening_ranges("US", now=utc("2024-03-05 17:00"))
+        restarted.update_opening_ranges("UK", now=utc("2024-03-05 12:00"))
+        assert restarted.data_fetcher.calls["batch"] == 0
+        assert restarted.opening_ranges == bot.opening_ranges
+        
+        # Next day: the stored ranges are stale again
+        assert OpeningRangeStore(path).get("US", "2024-03-06") is None
+    
+    print("   ✅ Job OK")
+
+def test_missing_stocks_retried():
+    """Stocks without bars are retried on later loops, the set is final at the ORB cutoff"""
+    print("🧪 Testing opening-range retries...")
+    
+    frames = make_frames()
+    nvda = frames.pop('NVDA')  # No bars from the first batch
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "opening_ranges.json")
+        bot = make_job_bot(frames, path)
+        
+        bot.update_opening_ranges("US", now=utc("2024-03-05 15:00:03"))
+        assert set(bot.opening_ranges) == {'AAPL', 'MSFT'} and bot.breakout_engine.has_range('AAPL')
+        assert "US" not in bot.opening_range_days and not bot.opening_range_store.is_complete("US", "2024-03-05")
+        
+        # A restart keeps the partial set and keeps retrying
+        restarted = make_job_bot(frames, path)
+        restarted.update_opening_ranges("US", now=utc("2024-03-05 15:10"))
+        assert set(restarted.opening_ranges) == {'AAPL', 'MSFT'} and "US" not in restarted.opening_range_days
+        
+        # NVDA's bars arrive: its range is added and the day is done
+        frames['NVDA'] = nvda
+        bot.update_opening_ranges("US", now=utc("2024-03-05 15:20"))
+        assert set(bot.opening_ranges) == set(bot.us_stocks) and bot.opening_range_days["US"] == "2024-03-05"
+        assert bot.opening_range_store.is_complete("US", "2024-03-05")
+        
+        # Still missing at the ORB cutoff (12:30 PM New York = 17:30 UTC): stop retrying
+        del frames['NVDA']
+        late = make_job_bot(frames, os.path.join(directory, "late.json"))
+        late.update_opening_ranges("US", now=utc("2024-03-05 17:00"))
+        assert "US" not in late.opening_range_days
+        late.update_opening_ranges("US", now=utc("2024-03-05 17:31"))
+        assert late.opening_range_days["US"] == "2024-03-05" and 'NVDA' not in late.opening_ranges
+        calls = late.data_fetcher.calls["batch"]
+        late.update_opening_ranges("US", now=utc("2024-03-05 18:00"))
+        assert late.data_fetcher.calls["batch"] == calls
+    
+    print("   ✅ Retries OK")
+
+if __name__ == "__main__":
+    test_session_clock()
+    test_ranges_match_per_symbol()
+    test_job_and_restart()
+    test_missing_stocks_retried()
+    print("🎉 All opening range tests passed")
+    sys.exit(0)
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Test ORB Scheduler
+Verifies wake-ups land on session events, notification windows and bar closes,
+skip weekends and exchange holidays, follow DST, that a trading day needs
+far fewer wake-ups than fixed 4-minute polling, and that a slow loop still sends
+the notification that woke it
+"""
+
+import sys
+import time
+import threading
+from datetime import datetime, timedelta
+
+import pytz
+
+from opening_ranges import opening_range_end, trading_day
+from orb_scheduler import ORBScheduler, TradingCalendar, ScheduledEvent, Wakeup
+
+DUBAI = pytz.timezone("Asia/Dubai")
+
+def dubai(text):
+    return DUBAI.localize(datetime.strptime(text, "%Y-%m-%d %H:%M:%S")).astimezone(pytz.utc)
+
+def as_dubai(when):
+    return when.astimezone(DUBAI).strftime("%Y-%m-%d %H:%M:%S")
+
+def test_session_events_and_bar_closes():
+    """Next wake-up around the UK and US opening range"""
+    print("🧪 Testing session events and bar closes...")
+    
+    scheduler = ORBScheduler(settle_seconds=3)
+    
+    # Tuesday morning: nothing until the UK open (8:00 London, with its notification)
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 10:00:00"))
+    assert as_dubai(wakeup.at) == "2024-03-05 12:00:03" and sorted(wakeup.reasons) == ["uk_open", "uk_session_open"]
+    assert wakeup.has_kind("notification")
+    
+    # Opening range end is hit exactly, not up to 4 minutes late
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 12:29:59"))
+    assert as_dubai(wakeup.at) == "2024-03-05 12:30:03" and wakeup.has("uk_or_end")
+    
+    # Inside the breakout window: every 1-minute bar close
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 12:31:30"))
+    assert as_dubai(wakeup.at) == "2024-03-05 12:32:03" and wakeup.reasons == ["uk_bar_close"]
+    assert scheduler.in_breakout_window("UK", dubai("2024-03-05 14:59:00"))
+    assert not scheduler.in_breakout_window("UK", dubai("2024-03-05 15:00:00"))
+    
+    # Past the ORB cutoff: only open trades keep 5-minute wake-ups going
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 16:01:00"))
+    assert sorted(wakeup.reasons) == ["us_open", "us_session_open"] and as_dubai(wakeup.at) == "2024-03-05 18:30:03"
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 16:01:00"), trades_open=True)
+    assert as_dubai(wakeup.at) == "2024-03-05 16:05:03" and wakeup.reasons == ["uk_monitor_bar_close"]
+    
+    # UK close warning is on London time (GMT in March), then the end-of-day flatten;
+    # both fall in the US breakout window and share a wake-up with its bar close
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 20:14:30"))
+    assert as_dubai(wakeup.at) == "2024-03-05 20:15:03"
+    assert sorted(wakeup.reasons) == ["uk_close_warning", "us_bar_close"]
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 20:44:30"))
+    assert as_dubai(wakeup.at) == "2024-03-05 20:45:03" and wakeup.has("uk_eod_flatten")
+    
+    # The US flatten at 1 AM Dubai belongs to the New York session of the day before
+    wakeup = scheduler.next_wakeup(dubai("2024-03-06 00:50:00"))
+    assert as_dubai(wakeup.at) == "2024-03-06 01:00:03" and wakeup.has("us_eod_flatten")
+    wakeup = scheduler.next_wakeup(dubai("2024-03-09 00:50:00"))  # Saturday in Dubai, Friday in New York
+    assert wakeup.has("us_eod_flatten")
+    
+    print("   ✅ Session events OK")
+
+def test_calendar_and_dst():
+    """Weekends, exchange holidays and summer time"""
+    print("🧪 Testing trading calendar and DST...")
+    
+    calendar = TradingCalendar()
+    scheduler = ORBScheduler(calendar=calendar, settle_seconds=0)
+    
+    # Christmas and Boxing Day: LSE shut, so the next UK opening range is on the 27th
+    assert not calendar.is_trading_day("UK", dubai("2024-12-25 12:30:00"))
+    assert not calendar.is_trading_day("UK", dubai("2024-12-26 12:30:00"))
+    assert calendar.is_trading_day("US", dubai("2024-12-26 19:00:00"))
+    or_end = scheduler.events["uk_or_end"]
+    assert as_dubai(or_end.occurrences(dubai("2024-12-24 13:00:00"), dubai("2025-01-03 00:00:00"), calendar)[0]) == \
+        "2024-12-27 12:30:00"
+    
+    # Weekend: only the daily holiday notice wakes the loop (plus the 6-hour safety wake-up)
+    wakeup = scheduler.next_wakeup(dubai("2024-03-09 10:00:00"))
+    assert wakeup.reasons == ["max_wait"] and as_dubai(wakeup.at) == "2024-03-09 16:00:00"
+    while wakeup.reasons == ["max_wait"]:
+        wakeup = scheduler.next_wakeup(wakeup.at)
+    assert wakeup.reasons == ["holiday_notice"] and as_dubai(wakeup.at) == "2024-03-10 09:00:00"
+    
+    # British Summer Time: the 16:15 London warning is 19:15 Dubai
+    wakeup = scheduler.next_wakeup(dubai("2024-07-02 19:14:30"))
+    assert as_dubai(wakeup.at) == "2024-07-02 19:15:00" and wakeup.has("uk_close_warning")
+    
+    # Clocks change (US 10 March, UK 31 March 2024): session events stay on the exchange
+    # clock and on the opening ranges they trigger, an hour earlier in Dubai afterwards
+    for market, before, after, dubai_before, dubai_after in (
+            ("US", "2024-03-08", "2024-03-11", "19:00:00", "18:00:00"),
+            ("UK", "2024-03-28", "2024-04-02", "12:30:00", "11:30:00")):
+        name = f"{market.lower()}_or_end"
+        ends = scheduler.events[name].occurrences(dubai(f"{before} 00:00:00"), dubai(f"{after} 23:59:00"), calendar)
+        assert [as_dubai(at) for at in (ends[0], ends[-1])] == [f"{before} {dubai_before}", f"{after} {dubai_after}"]
+        assert all(at == opening_range_end(market, trading_day(market, at)) for at in ends)
+        wakeup = scheduler.next_wakeup(ends[-1] - timedelta(seconds=30))
+        assert wakeup.has(name) and as_dubai(wakeup.at) == f"{after} {dubai_after}"
+    assert scheduler.in_breakout_window("UK", dubai("2024-07-02 11:45:00"))      # 8:45 London in summer
+    assert not scheduler.in_breakout_window("UK", dubai("2024-07-02 14:30:00"))  # Past 11:00 London
+    assert scheduler.session_ended("UK", dubai("2024-07-02 19:46:00"))           # 16:46 London
+    assert not scheduler.session_ended("UK", dubai("2024-07-02 19:44:00"))
+    
+    # Without exchange calendars only weekdays count
+    weekday_calendar = TradingCalendar(calendars={})
+    assert weekday_calendar.is_trading_day("UK", dubai("2024-12-25 12:30:00"))
+    assert not weekday_calendar.is_trading_day("UK", dubai("2024-12-28 12:30:00"))
+    
+    print("   ✅ Calendar and DST OK")
+
+def test_custom_events_and_wait():
+    """Custom event lists, merged reasons and an interruptible wait"""
+    print("🧪 Testing custom events and wait()...")
+    
+    events = [ScheduledEvent("a", "10:00", "Europe/London", "UK"),
+              ScheduledEvent("b", "10:00", "Europe/London", "UK", "notification")]
+    scheduler = ORBScheduler(events=events, breakout_windows={}, session_windows={}, settle_seconds=0)
+    wakeup = scheduler.next_wakeup(dubai("2024-03-05 10:00:00"))
+    assert sorted(wakeup.reasons) == ["a", "b"] and wakeup.has_kind("notification")
+    
+    stopper = threading.Timer(0.2, scheduler.stop)
+    stopper.start()
+    start = time.monotonic()
+    assert scheduler.wait() is None  # Stopped long before 10:00 London
+    assert time.monotonic() - start < 5 and scheduler.stopped
+    
+    print("   ✅ Custom events OK")
+
+def test_wakeups_per_day():
+    """A full Tuesday: event-driven wake-ups against a fixed 240-second poll"""
+    print("🧪 Counting wake-ups over a trading day...")
+    
+    scheduler = ORBScheduler(settle_seconds=3)
+    for trades_open in (False, True):
+        now = dubai("2024-03-05 00:00:00")
+        end = now + timedelta(days=1)
+        wakeups = []
+        while True:
+            wakeup = scheduler.next_wakeup(now, trades_open=trades_open)
+            if wakeup.at >= end:
+                break
+            wakeups.append(wakeup)
+            now = wakeup.at
+        
+        breakout = [w for w in wakeups if "uk_bar_close" in w.reasons or "us_bar_close" in w.reasons]
+        idle = [w for w in wakeups if not any(reason.endswith("bar_close") for reason in w.reasons)]
+        print(f"   trades_open={trades_open}: {len(wakeups)} wake-ups "
+              f"({len(breakout)} in breakout windows, {len(idle)} session events) vs {24 * 3600 // 240} polls")
+        assert len(breakout) == 2 * 150  # Every minute for 2.5 hours per market
+        assert len(wakeups) < 24 * 3600 // 240 + 2 * 150
+    
+    print("   ✅ Wake-up count done")
+
+class ScriptedScheduler:
+    """Hands out the given wake-ups in turn, then stops"""
+
+    def __init__(self, wakeups):
+        self.wakeups = list(wakeups)
+        self.stopped = False
+
+    def wait(self, trades_open=False, min_seconds=0.0):
+        if not self.wakeups:
+            self.stopped = True
+            return None
+        return self.wakeups.pop(0)
+
+def test_slow_loop_sends_notification():
+    """The 16:15 London close summary goes out at its wake-up, however long the loop's data work takes"""
+    print("🧪 Testing notifications on a slow loop...")
+    
+    from daily_summary_system import DailySummarySystem
+    from enhanced_orb_stock_bot import EnhancedORBStockTradingBot
+    
+    sent = []
+    summary = DailySummarySystem("token", "chat")
+    summary.send_telegram_message = lambda message: sent.append(message)
+    summary.get_stock_uk_market_close_summary = lambda: "UK close summary"
+    
+    def slow_snapshot(stocks):
+        sent.append("snapshot")
+        raise TimeoutError("batch download took 90s")  # Well past 16:15
+    
+    bot = object.__new__(EnhancedORBStockTradingBot)  # No Telegram, files or network
+    bot.us_stocks, bot.uk_stocks = [], ['BP.L']
+    bot.all_stocks = bot.uk_stocks
+    bot.active_trades = {}
+    bot.daily_summary = summary
+    bot.send_telegram_message = lambda message: True
+    bot.get_optimal_trading_sessions = lambda: {'uk_session': True, 'us_session': False, 'dubai_time': ''}
+    bot.get_active_stocks_for_session = lambda: ['BP.L']
+    bot.build_market_snapshot = slow_snapshot
+    
+    close_warning = pytz.timezone("Europe/London").localize(datetime(2024, 3, 5, 16, 15, 3)).astimezone(pytz.utc)
+    bot.scheduler = ScriptedScheduler([Wakeup(close_warning, ["uk_close_warning"],
+                                              {"uk_close_warning": "notification"})])
+    bot.run()
+    
+    # Pass 1 (startup, at the real time), then the 16:15 wake-up: summary before the data work
+    assert sent[-2:] == ["UK close summary", "snapshot"]
+    assert summary.should_send_uk_close_notification(close_warning + timedelta(seconds=90)) is False
+    
+    print("   ✅ Slow loop OK")
+
+if __name__ == "__main__":
+    test_session_events_and_bar_closes()
+    test_calendar_and_dst()
+    test_custom_events_and_wait()
+    test_wakeups_per_day()
+    test_slow_loop_sends_notification()
+    print("🎉 All ORB scheduler tests passed")
+    sys.exit(0)
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Test Multi-Symbol Bar Panel
+Verifies symbols with different trading hours line up with NaN gaps and that
+zones, R:R bar scores and breakout checks computed cross-sectionally over the
+panel match the per-symbol results
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from panel import BarPanel
+from synthetic_bars import make_hourly_bars
+from zone_engine import find_zones_arrays, find_zones_panel
+from dynamic_rr_optimizer import DynamicRROptimizer
+
+def make_frames(count=6):
+    frames = {}
+    for seed in range(count):
+        bars = make_hourly_bars([30, 400, 600][seed % 3], seed=seed, start=f"2024-03-0{1 + seed % 3} 00:00",
+                                start_price=1 + seed, random_volume=True, gaps=seed % 2 == 0)
+        bars['Dividends'] = 0.0  # Extra yfinance column, not part of the panel
+        if seed == 4:
+            bars.iloc[100, bars.columns.get_loc('Close')] = np.nan
+        frames[f"SYM{seed}"] = bars
+    return frames
+
+def test_alignment():
+    """Union index, gap mask, end-aligned rows and round trips"""
+    print("🧪 Testing panel alignment...")
+    
+    frames = make_frames()
+    frames["NAIVE"] = make_hourly_bars(50, seed=9, start="2024-03-04", start_price=10.0, random_volume=True).tz_localize(None)
+    frames["EMPTY"] = pd.DataFrame()
+    panel = BarPanel.from_frames(frames)
+    
+    assert "EMPTY" not in panel.symbols and len(panel) == 7
+    assert panel.values.shape == (7, len(panel.index), 5) and panel.values.dtype == np.float64
+    assert panel.index.is_monotonic_increasing and str(panel.index.tz) == "UTC"
+    assert not panel.values.flags.writeable
+    
+    for symbol, frame in frames.items():
+        if frame.empty:
+            continue
+        s = panel.position(symbol)
+        assert panel.lengths[s] == len(frame)
+        packed = panel.packed('Close')[s]
+        np.testing.assert_array_equal(packed[-len(frame):], frame['Close'].to_numpy())
+        assert np.isnan(packed[:-len(frame)]).all()
+        assert np.isnan(panel.field('Close')[s][~panel.present[s]]).all()
+        np.testing.assert_array_equal(panel.frame(symbol)['High'].to_numpy(), frame['High'].to_numpy())
+        last_timestamp = frame.index[-1] if frame.index.tz else frame.index[-1].tz_localize("UTC")
+        assert panel.last_timestamps()[s] == last_timestamp
+        assert np.array_equal(panel.last('Close')[s], frame['Close'].iloc[-1], equal_nan=True)
+    
+    empty = BarPanel.from_frames({})
+    assert len(empty) == 0 and len(empty.last('Close')) == 0
+    
+    print("   ✅ Alignment OK")
+
+def test_cross_sectional_zones_and_scores():
+    """One pass over the panel gives each symbol its own zones and R:R bar scores"""
+    print("🧪 Testing cross-sectional zones and R:R scores...")
+    
+    frames = make_frames()
+    panel = BarPanel.from_frames(frames)
+    optimizer = DynamicRROptimizer()
+    
+    zones_panel = find_zones_panel(panel.packed('High'), panel.packed('Low'))
+    zones_by_symbol = dict(zip(panel.symbols, zones_panel))
+    analyses = optimizer.analyze_panel(panel, zones_by_symbol)
+    
+    for symbol, frame in frames.items():
+        zones = find_zones_arrays(frame['High'].to_numpy(), frame['Low'].to_numpy())
+        assert zones_by_symbol[symbol] == zones, symbol
+        
+        expected = optimizer.analyze_bars(frame, zones)
+        actual = analyses[symbol]
+        assert actual['momentum'] == expected['momentum'] or \
+            (np.isnan(actual['momentum']) and np.isnan(expected['momentum'])), symbol
+        assert (actual['atr'] is None) == (expected['atr'] is None), symbol
+        if expected['atr'] is not None:
+            assert np.isclose(actual['atr'], expected['atr'], rtol=1e-12, equal_nan=True), symbol
+        assert actual['zone_strength'].keys() == expected['zone_strength'].keys()
+        for key, strength in expected['zone_strength'].items():
+            assert np.isclose(actual['zone_strength'][key], strength, rtol=1e-12), (symbol, key)
+        
+        price = float(frame['Close'].dropna().iloc[-1])
+        assert [result[:2] for result in optimizer.optimize_many(None, price, zones, analysis=actual)] == \
+            [result[:2] for result in optimizer.optimize_many(frame, price, zones)], symbol
+    
+    print("   ✅ Cross-sectional zones/scores OK")
+
+def test_breakout_scan():
+    """Latest price/volume per symbol and the ORH/ORL check for all symbols at once"""
+    print("🧪 Testing cross-sectional breakout scan...")
+    
+    from enhanced_orb_stock_bot import EnhancedORBStockTradingBot
+    from breakout_engine import BreakoutEngine
+    bot = object.__new__(EnhancedORBStockTradingBot)  # Only the opening ranges are needed
+    bot.breakout_engine = BreakoutEngine(min_flags=0)  # Every crossing dispatched
+    
+    frames = make_frames()
+    bot.opening_ranges = {}
+    expected = set()
+    for i, (symbol, frame) in enumerate(frames.items()):
+        last = float(frame['Close'].iloc[-1])
+        if i == 5:
+            continue  # No opening range yet
+        orh, orl = [(last * 0.99, last * 0.98), (last * 1.02, last * 1.01), (last * 1.01, last * 0.99)][i % 3]
+        bot.opening_ranges[symbol] = {'orh': orh, 'orl': orl}
+        if last > orh or last < orl:
+            expected.add(symbol)
+    
+    bot.breakout_engine.load(bot.opening_ranges)
+    
+    signals = bot.scan_breakouts(BarPanel.from_frames(frames))
+    assert set(signals.flagged()) == set(signals.crossings()) == expected and len(expected) == 4, signals.flagged()
+    for symbol, frame in frames.items():
+        assert signals.latest(symbol) == (float(frame['Close'].iloc[-1]), float(frame['Volume'].iloc[-1]))
+    
+    empty = bot.scan_breakouts(BarPanel.from_frames({}))
+    assert empty.flagged() == [] and empty.latest('SYM0') is None
+    
+    print("   ✅ Breakout scan OK")
+
+def test_benchmark():
+    """One panel pass against one DataFrame pipeline per symbol"""
+    optimizer = DynamicRROptimizer()
+    
+    for symbols, bars in ((29, 3000), (300, 400)):
+        print(f"🧪 Benchmarking {symbols} symbols x {bars} bars...")
+        frames = {f"SYM{seed}": make_hourly_bars(bars, seed=seed, start="2024-03-04", start_price=1 + seed,
+                                                      random_volume=True)
+                  for seed in range(symbols)}
+        
+        start = time.perf_counter()
+        for frame in frames.values():
+            zones = find_zones_arrays(frame['High'].to_numpy(), frame['Low'].to_numpy())
+            optimizer.analyze_bars(frame, zones)
+        per_symbol = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        panel = BarPanel.from_frames(frames)
+        zones = dict(zip(panel.symbols, find_zones_panel(panel.packed('High'), panel.packed('Low'))))
+        optimizer.analyze_panel(panel, zones)
+        cross_sectional = time.perf_counter() - start
+        
+        print(f"   per symbol {per_symbol * 1000:.1f} ms, panel {cross_sectional * 1000:.1f} ms")
+    
+    print("   ✅ Benchmark done")
+
+if __name__ == "__main__":
+    test_alignment()
+    test_cross_sectional_zones_and_scores()
+    test_breakout_scan()
+    test_benchmark()
+    print("🎉 All panel tests passed")
+    sys.exit(0)
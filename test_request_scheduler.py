@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test Request Scheduler
+Verifies the shared token bucket enforces its rate and serves higher priorities first
+"""
+
+import sys
+import time
+import threading
+
+from request_scheduler import RequestScheduler
+
+def test_burst_then_rate():
+    """A full bucket serves a burst immediately, then requests are paced by the rate"""
+    print("🧪 Testing burst and rate enforcement...")
+    
+    scheduler = RequestScheduler(rate=20.0, burst=2.0)
+    start = time.monotonic()
+    for _ in range(6):
+        scheduler.acquire("scan")
+    elapsed = time.monotonic() - start
+    
+    # 2 tokens up front, the other 4 arrive at 20/s
+    assert elapsed >= 0.18, elapsed
+    assert elapsed < 1.0, elapsed
+    
+    print("   ✅ Burst and rate OK")
+
+def test_priority_order():
+    """With no tokens left, a queued monitor request is served before queued scans"""
+    print("🧪 Testing priority ordering...")
+    
+    scheduler = RequestScheduler(rate=10.0, burst=1.0)
+    scheduler.acquire("scan")  # Drain the bucket
+    
+    order = []
+    order_lock = threading.Lock()
+
+    def worker(priority):
+        scheduler.acquire(priority)
+        with order_lock:
+            order.append(priority)
+    
+    threads = [threading.Thread(target=worker, args=("report",))]
+    threads += [threading.Thread(target=worker, args=("scan",)) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.03)  # Let the low-priority requests queue up first
+    
+    monitor = threading.Thread(target=worker, args=("monitor",))
+    monitor.start()
+    threads.append(monitor)
+    for thread in threads:
+        thread.join(timeout=5)
+    
+    assert order[0] == "monitor", order
+    assert order[-1] == "report", order
+    
+    print("   ✅ Priority ordering OK")
+
+def test_metrics():
+    """Metrics report grants and waits per priority class"""
+    print("🧪 Testing scheduler metrics...")
+    
+    scheduler = RequestScheduler(rate=50.0, burst=1.0)
+    scheduler.acquire("monitor")
+    scheduler.acquire("scan")
+    scheduler.acquire("unknown")  # Unknown classes count as scans
+    scheduler.set_rate(25.0)
+    
+    metrics = scheduler.get_metrics()
+    assert metrics["rate"] == 25.0
+    assert metrics["queue_depth"] == 0
+    assert metrics["priorities"]["monitor"]["granted"] == 1
+    assert metrics["priorities"]["scan"]["granted"] == 2
+    assert metrics["priorities"]["report"]["granted"] == 0
+    assert metrics["priorities"]["scan"]["max_wait"] > 0
+    
+    print("   ✅ Scheduler metrics OK")
+
+if __name__ == "__main__":
+    test_burst_then_rate()
+    test_priority_order()
+    test_metrics()
+    print("🎉 All request scheduler tests passed")
+    sys.exit(0)
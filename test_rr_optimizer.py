@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Test Dynamic R:R Optimizer
+Verifies the vectorized zone strength returns exactly what the original
+bar-by-bar loop returned, and benchmarks both
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from dynamic_rr_optimizer import DynamicRROptimizer
+from synthetic_bars import make_hourly_bars
+
+def legacy_zone_strength(df, zone_price, zone_type):
+    """The original iloc loop, kept as the reference"""
+    if df is None or df.empty:
+        return 0.5
+    
+    touches = 0
+    bounce_strength = []
+    tolerance = zone_price * 0.002
+    
+    for i in range(len(df)):
+        if zone_type == 'demand':
+            if df['Low'].iloc[i] <= zone_price + tolerance:
+                touches += 1
+                if i < len(df) - 1:
+                    bounce = (df['Close'].iloc[i+1] - df['Low'].iloc[i]) / df['Low'].iloc[i]
+                    bounce_strength.append(bounce)
+        else:
+            if df['High'].iloc[i] >= zone_price - tolerance:
+                touches += 1
+                if i < len(df) - 1:
+                    rejection = (df['High'].iloc[i] - df['Close'].iloc[i+1]) / df['High'].iloc[i]
+                    bounce_strength.append(rejection)
+    
+    touch_score = min(touches / 5.0, 1.0)
+    bounce_score = np.mean(bounce_strength) * 100 if bounce_strength else 0.5
+    bounce_score = min(bounce_score, 1.0)
+    strength = (touch_score * 0.6) + (bounce_score * 0.4)
+    return max(0.1, min(strength, 1.0))
+
+def test_zone_strength_equivalence():
+    """Same strength for both zone types, any zone level and odd inputs"""
+    print("🧪 Testing zone strength equivalence...")
+    
+    optimizer = DynamicRROptimizer()
+    for seed in range(20):
+        bars = make_hourly_bars([1, 2, 30, 600][seed % 4], seed=seed)
+        if seed % 5 == 0 and len(bars) > 10:
+            bars.iloc[len(bars) // 2, bars.columns.get_loc('Close')] = np.nan
+        
+        for zone_type in ('demand', 'supply'):
+            for quantile in (0.0, 0.05, 0.5, 0.95, 1.0):
+                zone_price = float(np.nanquantile(bars['Close'], quantile))
+                expected = legacy_zone_strength(bars, zone_price, zone_type)
+                actual = optimizer.calculate_zone_strength(bars, zone_price, zone_type)
+                assert actual == expected or (np.isnan(actual) and np.isnan(expected)), \
+                    f"seed {seed} {zone_type} {quantile}: {actual} != {expected}"
+    
+    assert optimizer.calculate_zone_strength(pd.DataFrame(), 1.1, 'demand') == 0.5
+    assert optimizer.calculate_zone_strength(None, 1.1, 'supply') == 0.5
+    
+    print("   ✅ Zone strength equivalence OK")
+
+def test_benchmark_zone_strength():
+    """Vectorized zone strength is identical and much faster on 600 bars"""
+    print("🧪 Benchmarking zone strength on 600 hourly bars...")
+    
+    optimizer = DynamicRROptimizer()
+    bars = make_hourly_bars(600, seed=9)
+    zone_price = float(bars['Close'].median())
+    
+    start = time.perf_counter()
+    expected = legacy_zone_strength(bars, zone_price, 'demand')
+    legacy_seconds = time.perf_counter() - start
+    
+    runs = 200
+    start = time.perf_counter()
+    for _ in range(runs):
+        actual = optimizer.calculate_zone_strength(bars, zone_price, 'demand')
+    vectorized_seconds = (time.perf_counter() - start) / runs
+    
+    assert actual == expected
+    speedup = legacy_seconds / vectorized_seconds
+    print(f"   legacy {legacy_seconds * 1000:.1f} ms, vectorized {vectorized_seconds * 1000:.3f} ms ({speedup:.0f}x)")
+    assert speedup > 10
+    
+    print("   ✅ Benchmark OK")
+
+def test_optimize_many():
+    """Batch scoring gives each zone what optimize_rr_ratio gives it, best first"""
+    print("🧪 Testing batch R:R optimization...")
+    
+    optimizer = DynamicRROptimizer()
+    for seed in range(10):
+        bars = make_hourly_bars([5, 60, 600][seed % 3], seed=seed)
+        if seed % 4 == 0:
+            bars.iloc[len(bars) // 2, bars.columns.get_loc('Close')] = np.nan
+        current_price = float(bars['Close'].iloc[-1])
+        offsets = np.linspace(-0.012, 0.012, 9)
+        zones = [{'type': 'demand' if offset < 0 else 'supply', 'price': current_price * (1 + offset)}
+                 for offset in offsets]
+        
+        results = optimizer.optimize_many(bars, current_price, zones)
+        assert sorted(id(zone) for *_, zone in results) == sorted(id(zone) for zone in zones)
+        
+        for rr, confidence, explanation, zone in results:
+            expected_rr, expected_confidence, expected_explanation = optimizer.optimize_rr_ratio(
+                bars, current_price, zone['price'], zone['type']
+            )
+            assert rr == expected_rr and explanation == expected_explanation, (seed, zone)
+            assert np.isclose(confidence, expected_confidence, rtol=1e-12)
+        
+        ranking = [(rr, confidence) for rr, confidence, _, _ in results]
+        assert ranking == sorted(ranking, reverse=True)
+    
+    assert optimizer.optimize_many(make_hourly_bars(50), 1.1, []) == []
+    zone = {'type': 'demand', 'price': 1.1}
+    assert optimizer.optimize_many(pd.DataFrame(), 1.1, [zone])[0][:2] == (2.0, 0.5)
+    
+    print("   ✅ Batch R:R optimization OK")
+
+if __name__ == "__main__":
+    test_zone_strength_equivalence()
+    test_benchmark_zone_strength()
+    test_optimize_many()
+    print("🎉 All R:R optimizer tests passed")
+    sys.exit(0)
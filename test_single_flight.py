@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test Single-Flight Coalescing
+Verifies concurrent identical requests share one fetch and one shared fetcher exists
+"""
+
+import sys
+import time
+import threading
+
+from single_flight import SingleFlight
+
+def run_concurrently(count, target):
+    """Start `count` threads on target and wait for them"""
+    threads = [threading.Thread(target=target) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+def test_concurrent_calls_share_one_fetch():
+    """Five threads asking for the same key trigger one fetch"""
+    print("🧪 Testing concurrent coalescing...")
+    
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def slow_fetch():
+        calls.append(1)
+        time.sleep(0.2)
+        return "EUR/USD frame"
+    
+    run_concurrently(5, lambda: results.append(flight.do(("history", "EUR/USD"), slow_fetch)))
+    
+    assert len(calls) == 1
+    assert results == ["EUR/USD frame"] * 5
+    assert flight.get_stats() == {"executed": 1, "coalesced": 4, "in_flight": 0}
+    print("   ✅ One fetch served 5 callers")
+
+def test_errors_reach_every_waiter():
+    """A failed fetch raises in the leader and in every follower"""
+    print("🧪 Testing error propagation...")
+    
+    flight = SingleFlight()
+    errors = []
+
+    def failing_fetch():
+        time.sleep(0.1)
+        raise ValueError("429 Too Many Requests")
+
+    def caller():
+        try:
+            flight.do("AAPL", failing_fetch)
+        except ValueError as e:
+            errors.append(str(e))
+    
+    run_concurrently(3, caller)
+    assert errors == ["429 Too Many Requests"] * 3
+    print("   ✅ Error propagated to all callers")
+
+def test_sequential_calls_are_not_cached():
+    """Once a call finishes the next caller fetches again"""
+    flight = SingleFlight()
+    assert flight.do("GOLD", lambda: 1) == 1
+    assert flight.do("GOLD", lambda: 2) == 2
+
+def test_shared_fetcher_registry():
+    """Every component gets the same fetcher, with the most conservative delays"""
+    print("🧪 Testing shared fetcher registry...")
+    
+    from rate_limited_data_fetcher import get_shared_fetcher
+    
+    forex_fetcher = get_shared_fetcher(base_delay=2.0, max_delay=10.0, name="registry-test")
+    stock_fetcher = get_shared_fetcher(base_delay=3.0, max_delay=15.0, name="registry-test")
+    summary_fetcher = get_shared_fetcher(base_delay=1.0, name="registry-test")
+    
+    assert forex_fetcher is stock_fetcher is summary_fetcher
+    assert forex_fetcher.base_delay == 3.0 and forex_fetcher.max_delay == 15.0
+    print("   ✅ One fetcher shared by all components")
+
+if __name__ == "__main__":
+    test_concurrent_calls_share_one_fetch()
+    test_errors_reach_every_waiter()
+    test_sequential_calls_are_not_cached()
+    test_shared_fetcher_registry()
+    print("🎉 All single-flight tests passed")
+    sys.exit(0)
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Test Streaming Indicators
+Verifies bar-by-bar indicator updates match the batch pandas results,
+including previews of a still-forming bar and BarStream syncing
+"""
+
+import sys
+import math
+import time
+
+import numpy as np
+import pandas as pd
+
+import indicators
+from streaming_indicators import StreamingEMA, StreamingATR, RollingWindow, RollingExtreme, BarStream
+
+def make_bars(periods, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, periods)))
+    spread = np.abs(rng.normal(0, 0.005, periods)) * close
+    index = pd.date_range("2024-01-02 14:30", periods=periods, freq="5min", tz="UTC")
+    return pd.DataFrame({
+        'Open': close,
+        'High': close + spread,
+        'Low': close - spread,
+        'Close': close,
+        'Volume': rng.integers(1000, 5000, periods).astype(float)
+    }, index=index)
+
+def assert_close(actual, expected, label):
+    if math.isnan(expected):
+        assert math.isnan(actual), f"{label}: {actual} != NaN"
+    else:
+        assert math.isclose(actual, expected, rel_tol=1e-9), f"{label}: {actual} != {expected}"
+
+def test_matches_pandas():
+    """Seeded from history, then bar by bar: same values as the batch series"""
+    print("🧪 Testing streaming indicators against pandas...")
+    
+    bars = make_bars(600, seed=2)
+    bars.iloc[250, bars.columns.get_loc('Close')] = np.nan
+    close = bars['Close']
+    seed_bars = 100
+    
+    expected = {
+        "ema": close.ewm(span=20).mean().to_numpy(),
+        "mean": close.rolling(20).mean().to_numpy(),
+        "sum": bars['Volume'].rolling(50).sum().to_numpy(),
+        "max": close.rolling(20).max().to_numpy(),
+        "min": close.rolling(20).min().to_numpy(),
+        "atr": indicators.atr(bars['High'], bars['Low'], close, 14),
+        "wilder": indicators.atr(bars['High'], bars['Low'], close, 14, method="wilder"),
+    }
+    streams = {
+        "ema": StreamingEMA(20),
+        "mean": RollingWindow(20, "mean"),
+        "sum": RollingWindow(50, "sum"),
+        "max": RollingExtreme(20, "max"),
+        "min": RollingExtreme(20, "min"),
+        "atr": StreamingATR(14),
+        "wilder": StreamingATR(14, method="wilder"),
+    }
+    inputs = {name: close.to_numpy() for name in ("ema", "mean", "max", "min")}
+    inputs["sum"] = bars['Volume'].to_numpy()
+    
+    for name, stream in streams.items():
+        if name in ("atr", "wilder"):
+            value = stream.seed(bars.iloc[:seed_bars])
+        else:
+            value = stream.seed(inputs[name][:seed_bars])
+        assert_close(value, expected[name][seed_bars - 1], f"{name} seed")
+    
+    for i in range(seed_bars, len(bars)):
+        bar = bars.iloc[i]
+        for name, stream in streams.items():
+            if name in ("atr", "wilder"):
+                preview = stream.preview(bar['High'], bar['Low'], bar['Close'])
+                value = stream.update(bar['High'], bar['Low'], bar['Close'])
+            else:
+                preview = stream.preview(inputs[name][i])
+                value = stream.update(inputs[name][i])
+            assert_close(preview, expected[name][i], f"{name} preview @ {i}")
+            assert_close(value, expected[name][i], f"{name} @ {i}")
+    
+    print("   ✅ Streaming values OK")
+
+def test_bar_stream_sync():
+    """BarStream feeds only new closed bars and previews the forming one"""
+    print("🧪 Testing BarStream syncing...")
+    
+    bars = make_bars(300, seed=4)
+    stream = BarStream(ema_spans=(20,), atr_period=14, volume_windows=(20,))
+    
+    for end in list(range(30, 300, 7)) + [299, 299, 300]:
+        frame = bars.iloc[:end].copy()
+        frame.iloc[-1, frame.columns.get_loc('Close')] *= 1.001  # Forming bar keeps moving
+        values = stream.sync(frame)
+        assert_close(values["ema"][20], frame['Close'].ewm(span=20).mean().iloc[-1], f"ema @ {end}")
+        assert_close(values["atr"], indicators.atr(frame['High'], frame['Low'], frame['Close'], 14)[-1], f"atr @ {end}")
+        assert_close(values["volume_average"][20], frame['Volume'].rolling(20).mean().iloc[-1], f"volume @ {end}")
+    
+    # A frame that doesn't continue the stream (here: an older history) starts it over
+    other = bars.iloc[:50]
+    values = stream.sync(other)
+    assert stream.reseeds == 1
+    assert_close(values["ema"][20], other['Close'].ewm(span=20).mean().iloc[-1], "ema after reseed")
+    
+    assert stream.sync(pd.DataFrame()) == {}
+    
+    print("   ✅ BarStream OK")
+
+def test_constant_time_updates():
+    """Per-bar cost doesn't grow with the length of history"""
+    print("🧪 Testing update cost against history length...")
+    
+    timings = {}
+    for history in (1_000, 50_000):
+        bars = make_bars(history + 500, seed=6)
+        ema = StreamingEMA(20)
+        atr = StreamingATR(14)
+        ema.seed(bars['Close'].to_numpy()[:history])
+        atr.seed(bars.iloc[:history])
+        
+        closes = bars['Close'].to_numpy()[history:]
+        highs = bars['High'].to_numpy()[history:]
+        lows = bars['Low'].to_numpy()[history:]
+        start = time.perf_counter()
+        for high, low, close in zip(highs, lows, closes):
+            ema.update(close)
+            atr.update(high, low, close)
+        timings[history] = (time.perf_counter() - start) / len(closes)
+    
+    print(f"   Per bar: {timings[1_000] * 1e6:.1f} µs (1k history), {timings[50_000] * 1e6:.1f} µs (50k history)")
+    assert timings[50_000] < timings[1_000] * 3
+    
+    print("   ✅ Constant-time updates OK")
+
+if __name__ == "__main__":
+    test_matches_pandas()
+    test_bar_stream_sync()
+    test_constant_time_updates()
+    print("🎉 All streaming indicator tests passed")
+    sys.exit(0)
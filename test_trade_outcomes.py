@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Test Intrabar Trade Outcomes
+Verifies stop/target touches are found from the high/low path between checks
+(wicks the latest price never shows), that a bar hitting both counts as stopped,
+gaps fill at the open, the breakeven stop starts on the next bar, and that the ORB
+monitor and TradeTracker close trades from the path
+"""
+
+import os
+import sys
+import time
+import tempfile
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars
+from trade_outcomes import first_touch, trade_path_events, checked_epoch_ns, path_period
+from test_market_snapshot import make_bot
+
+def make_path(rows, start="2024-03-05 14:30"):
+    """1-minute bars from (open, high, low, close) rows, UTC"""
+    index = pd.date_range(start, periods=len(rows), freq="1min", tz="UTC")
+    frame = pd.DataFrame(rows, columns=['Open', 'High', 'Low', 'Close'], index=index)
+    frame['Volume'] = 1000.0
+    return frame
+
+def local_iso(timestamp):
+    """How trades store times: naive local datetime.now().isoformat()"""
+    return datetime.fromtimestamp(pd.Timestamp(timestamp).timestamp()).isoformat()
+
+def test_first_touch_and_since():
+    """Single-level scans and which bars count as new since the last check"""
+    print("🧪 Testing first touch...")
+    
+    values = np.array([1.0, 2.0, 3.0, 2.0])
+    assert first_touch(values, 3.0, above=True) == 2 and first_touch(values, 4.0, above=True) == -1
+    assert first_touch(values, 2.0, above=False) == 0 and first_touch(values, 2.0, above=False, start=1) == 1
+    assert first_touch(values, 1.0, above=True, start=9) == -1
+    
+    assert checked_epoch_ns(None) is None and checked_epoch_ns("not a time") is None
+    assert checked_epoch_ns(local_iso("2024-03-05 14:31:00+00:00")) == pd.Timestamp("2024-03-05 14:31", tz="UTC").value
+    
+    # A wick to the stop before the last check is not seen again
+    path = make_path([(100, 100.5, 98.5, 100), (100, 100.5, 99.5, 100), (100, 100.5, 99.5, 100)])
+    assert trade_path_events(path, 'LONG', 99, [103], since=local_iso(path.index[0]))[0]['type'] == 'stop'
+    assert trade_path_events(path, 'LONG', 99, [103], since=local_iso(path.index[1])) == []
+    
+    # Bars fetched reach back to the oldest check, past the exchange-date boundary
+    now = datetime(2024, 3, 5, 0, 20)
+    assert path_period([]) == "5d" and path_period([None, "not a time"], now=now) == "5d"
+    assert path_period([(now - timedelta(minutes=30)).isoformat(), None], now=now) == "5d"
+    assert path_period([(now - timedelta(days=1)).isoformat(), (now - timedelta(days=10)).isoformat()], now=now) == "1mo"
+    
+    print("   ✅ First touch OK")
+
+def test_path_rules():
+    """Wick detection, same-bar conflict, gaps and the breakeven stop"""
+    print("🧪 Testing path rules...")
+    
+    # The latest price (100.2) sits between stop and target, the path touched the target first
+    path = make_path([(100, 100.6, 99.8, 100.2), (100.2, 103.1, 100.0, 102.5), (102.5, 102.6, 98.0, 100.2)])
+    events = trade_path_events(path, 'LONG', 99, [103], price=100.2)
+    assert [(e['type'], e['price'], e['bar']) for e in events] == [('target', 103.0, 1)]
+    assert events[0]['time'] == path.index[1]
+    assert trade_path_events(None, 'LONG', 99, [103], price=100.2) == []  # Price alone misses it
+    
+    # One bar spanning stop and target: stopped out
+    path = make_path([(100, 103.5, 98.5, 101)])
+    assert [e['type'] for e in trade_path_events(path, 'LONG', 99, [103])] == ['stop']
+    
+    # Gaps fill at the open
+    path = make_path([(100, 100.2, 99.9, 100), (97.5, 98.0, 97.0, 97.8)])
+    assert trade_path_events(path, 'LONG', 99, [103])[0]['price'] == 97.5
+    path = make_path([(100, 100.2, 99.9, 100), (96.0, 96.5, 95.5, 96.2)])
+    assert trade_path_events(path, 'SHORT', 101, [97])[0] == {'type': 'target', 'level': 1, 'price': 96.0,
+                                                              'time': path.index[1], 'bar': 1}
+    
+    # TP1, then the breakeven stop from the next bar on (not in the TP1 bar itself)
+    path = make_path([(100, 102.2, 99.9, 102), (102, 102.3, 99.8, 100.5), (100.5, 104.5, 100.4, 104)])
+    events = trade_path_events(path, 'LONG', 99, [102, 104, 106], breakeven=100.0)
+    assert [(e['type'], e['level'], e['bar']) for e in events] == [('target', 1, 0), ('stop', 0, 1)]
+    assert events[1]['price'] == 100.0
+    path = make_path([(100, 102.2, 99.95, 102), (102, 104.1, 101.0, 104)])
+    events = trade_path_events(path, 'LONG', 99, [102, 104, 106], breakeven=100.0)
+    assert [(e['level'], e['bar']) for e in events] == [(1, 0), (2, 1)]
+    
+    # Targets already taken are skipped; the last target closes the trade
+    path = make_path([(101, 106.5, 100.5, 106)])
+    events = trade_path_events(path, 'LONG', 100, [102, 104, 106], hit=[1, 2])
+    assert [(e['level'], e['price']) for e in events] == [(3, 106.0)]
+    
+    # Short mirror with the quote as the newest point of the path
+    path = make_path([(100, 100.5, 99.0, 99.5)])
+    events = trade_path_events(path, 'SHORT', 101, [98, 96, 95], price=101.2)
+    assert [(e['type'], e['price'], e['time']) for e in events] == [('stop', 101.2, None)]
+    
+    print("   ✅ Path rules OK")
+
+def test_orb_monitor():
+    """The ORB bot applies TP1/TP2/stop in path order and moves the stop to breakeven"""
+    print("🧪 Testing ORB trade monitor on the path...")
+    
+    path = make_path([(100, 100.4, 99.8, 100.2),
+                      (100.2, 102.3, 100.1, 102.0),   # TP1
+                      (102.0, 104.2, 101.5, 104.0),   # TP2
+                      (104.0, 104.1, 99.9, 100.1)])   # Back through breakeven
+    bot = make_bot({'AAPL': path})
+    bot.trades_history = []
+    bot.daily_stats = {'daily_pnl': 0.0, 'consecutive_losses': 0, 'win_rate': 0.0, 'avg_rr_achieved': 0.0}
+    bot.send_telegram_message = lambda message: True
+    bot.active_trades = {'t1': {'symbol': 'AAPL', 'direction': 'LONG', 'status': 'ACTIVE', 'entry_price': 100.0,
+                                'stop_loss': 99.0, 'current_stop': 99.0, 'target1': 102.0, 'target2': 104.0,
+                                'target3': 110.0, 'tp1_hit': False, 'tp2_hit': False, 'position_size': 100,
+                                'target_rr': 2.0, 'market_condition': 'NORMAL',
+                                'timestamp': local_iso(path.index[0])}}
+    
+    snapshot = bot.build_market_snapshot(['AAPL'])
+    bot.monitor_active_trades(snapshot)
+    
+    assert bot.active_trades == {}
+    closed = bot.trades_history[0]
+    assert closed['tp1_hit'] and closed['tp2_hit'] and closed['exit_reason'] == "Stop Loss Hit"
+    assert closed['exit_price'] == 100.0  # Breakeven stop, not the original 99
+    
+    print("   ✅ ORB monitor OK")
+
+def test_trade_tracker():
+    """TradeTracker closes a wick-touched trade that the current price alone would keep open"""
+    print("🧪 Testing TradeTracker with bars...")
+    
+    from trade_tracker import TradeTracker
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            tracker = TradeTracker()
+            path = make_path([(1.1000, 1.1010, 1.0990, 1.1000), (1.1000, 1.1060, 1.0995, 1.1020)],
+                             start=pd.Timestamp.now(tz="UTC").floor("min") - pd.Timedelta(minutes=1))
+            for signal_id, symbol in (("a", "EUR/USD"), ("b", "GBP/USD")):
+                tracker.add_active_trade({'signal_id': signal_id, 'symbol': symbol, 'zone_type': 'supply',
+                                          'entry': 1.1000, 'stop': 1.1050, 'target': 1.0900,
+                                          'risk_reward': 2.0, 'timestamp': datetime.now().isoformat()})
+            active = tracker.load_active_trades()
+            for trade in active:
+                trade['last_checked'] = (datetime.now() - timedelta(minutes=5)).isoformat()
+            tracker.save_active_trades(active)
+            
+            # Price-only check: 1.1020 is inside stop/target for both
+            assert tracker.check_trade_outcomes({"GBP/USD": 1.1020}) == 0
+            
+            # Never checked: the path starts at entry, the stop wick before it doesn't count
+            active = tracker.load_active_trades()
+            for trade in active:
+                trade.pop('last_checked')
+                trade['timestamp'] = local_iso(path.index[1])
+            tracker.save_active_trades(active)
+            early = make_path([(1.1000, 1.1060, 1.0995, 1.1020), (1.1000, 1.1010, 1.0990, 1.1000)],
+                              start=path.index[0] - pd.Timedelta(minutes=1))
+            assert tracker.check_trade_outcomes({"EUR/USD": 1.1010}, bars={"EUR/USD": Bars.from_frame(early)}) == 0
+            
+            active = tracker.load_active_trades()
+            for trade in active:
+                trade['last_checked'] = (datetime.now() - timedelta(minutes=5)).isoformat()
+            tracker.save_active_trades(active)
+            
+            closed = tracker.check_trade_outcomes({"EUR/USD": 1.1020, "GBP/USD": 1.1020},
+                                                  bars={"EUR/USD": Bars.from_frame(path)})
+            assert closed == 1
+            assert [trade['symbol'] for trade in tracker.load_active_trades()] == ["GBP/USD"]
+            history = tracker.get_trade_stats()
+            assert history['losses'] == 1 and history['cooldown_symbols'] == ["EUR/USD"]
+        finally:
+            os.chdir(previous)
+    
+    print("   ✅ TradeTracker OK")
+
+def test_benchmark():
+    """Vectorized first-touch scans against a per-bar Python loop"""
+    print("🧪 Benchmarking path scans...")
+    
+    rng = np.random.default_rng(0)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.0005, 390)))
+    spread = np.abs(rng.normal(0, 0.0003, 390)) * close
+    path = make_path(np.column_stack([close, close + spread, close - spread, close]))
+    bars = Bars.from_frame(path)
+    stop, targets = close[0] * 0.9, [close[0] * 1.2, close[0] * 1.3, close[0] * 1.4]  # Never touched: full scan
+    
+    runs = 300
+    start = time.perf_counter()
+    for _ in range(runs):
+        for high, low in zip(path['High'], path['Low']):
+            if low <= stop or any(high >= target for target in targets):
+                break
+    loop_seconds = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    for _ in range(runs):
+        assert trade_path_events(bars, 'LONG', stop, targets) == []
+    scan_seconds = time.perf_counter() - start
+    
+    print(f"   {runs} trades x 390 bars: per-bar loop {loop_seconds * 1000:.1f} ms, scans {scan_seconds * 1000:.1f} ms")
+    print("   ✅ Benchmark done")
+
+if __name__ == "__main__":
+    test_first_touch_and_since()
+    test_path_rules()
+    test_orb_monitor()
+    test_trade_tracker()
+    test_benchmark()
+    print("🎉 All trade outcome tests passed")
+    sys.exit(0)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Test Yahoo Session
+Verifies the pooled session reuses connections and retries transient 5xx responses
+"""
+
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from yahoo_session import build_session, get_connection_stats
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    """Tiny HTTP/1.1 server; /flaky fails once with a 503 before succeeding"""
+    
+    protocol_version = "HTTP/1.1"
+    failures_left = 1
+
+    def do_GET(self):
+        if self.path == "/flaky" and KeepAliveHandler.failures_left > 0:
+            KeepAliveHandler.failures_left -= 1
+            status, body = 503, b"busy"
+        else:
+            status, body = 200, b"ok"
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server():
+    """Run the test server on a free local port"""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def test_connection_reuse():
+    """Sequential requests to one host share a single connection"""
+    print("🧪 Testing connection reuse...")
+    
+    server, base_url = start_server()
+    session = build_session(pool_size=2)
+    try:
+        for _ in range(5):
+            assert session.get(f"{base_url}/quote", timeout=5).text == "ok"
+        
+        stats = get_connection_stats(session)
+        assert stats["requests"] == 5
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 4
+        assert stats["reuse_rate"] == 0.8
+    finally:
+        session.close()
+        server.shutdown()
+    
+    print("   ✅ Connection reuse OK")
+
+def test_retry_on_5xx():
+    """A transient 503 is retried inside the session"""
+    print("🧪 Testing 5xx retry...")
+    
+    server, base_url = start_server()
+    session = build_session(backoff_factor=0)
+    try:
+        response = session.get(f"{base_url}/flaky", timeout=5)
+        assert response.status_code == 200
+        assert get_connection_stats(session)["requests"] == 1
+    finally:
+        session.close()
+        server.shutdown()
+    
+    print("   ✅ 5xx retry OK")
+
+if __name__ == "__main__":
+    test_connection_reuse()
+    test_retry_on_5xx()
+    print("🎉 All Yahoo session tests passed")
+    sys.exit(0)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Test Zone Book
+Verifies incremental zone updates match a from-scratch zone search as the
+window slides, the forming bar changes and the book is reloaded from disk, and
+that an unchanged window is neither re-ranked nor saved again
+"""
+
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from synthetic_bars import make_hourly_bars
+from zone_engine import find_zones_arrays
+from zone_book import ZoneBook
+
+def expected_zones(window):
+    return find_zones_arrays(window['High'].to_numpy(), window['Low'].to_numpy())
+
+def test_sliding_window():
+    """Appends, drops, forming-bar revisions and gaps all match a full recompute"""
+    print("🧪 Testing incremental updates against full recompute...")
+    
+    book = ZoneBook(persist=False)
+    bars = make_hourly_bars(1500, seed=7, decimals=4)
+    rng = np.random.default_rng(1)
+    
+    start, end = 0, 500
+    for step in range(300):
+        window = bars.iloc[start:end].copy()
+        if step % 3 == 0:
+            # Still-forming last bar: its high/low keep moving
+            window.iloc[-1, window.columns.get_loc('High')] += 0.0003
+            window.iloc[-1, window.columns.get_loc('Low')] -= 0.0002
+        if step % 17 == 0:
+            window.iloc[len(window) // 2, window.columns.get_loc('Low')] = np.nan
+        
+        snapshot = window.copy()
+        assert book.update("EUR/USD", window) == expected_zones(window), f"step {step}"
+        assert window.equals(snapshot), "update() must not modify the frame"
+        
+        end += int(rng.integers(0, 4))
+        start += int(rng.integers(0, 4))
+        if step == 150:
+            start += 600  # Gap bigger than the window: forces a rebuild
+            end += 600
+    
+    stats = book.get_stats()
+    assert stats["incremental_updates"] > stats["rebuilds"]
+    
+    assert book.update("EUR/USD", pd.DataFrame()) == []
+    assert book.update("EUR/USD", None) == []
+    
+    print(f"   Updates: {stats}")
+    print("   ✅ Incremental zones OK")
+
+def test_persistence():
+    """A reloaded book continues incrementally from where it left off"""
+    print("🧪 Testing zone book persistence...")
+    
+    bars = make_hourly_bars(800, seed=3, decimals=4)
+    with tempfile.TemporaryDirectory() as directory:
+        first = ZoneBook(directory=directory)
+        first.update("GBP/USD", bars.iloc[:700])
+        
+        second = ZoneBook(directory=directory)
+        window = bars.iloc[5:705]
+        assert second.update("GBP/USD", window) == expected_zones(window)
+        assert second.get_stats()["rebuilds"] == 0
+    
+    print("   ✅ Persistence OK")
+
+def test_unchanged_window():
+    """Repeat scans with no new bar skip ranking and disk writes; throttled saves wait for flush()"""
+    print("🧪 Testing zone book upkeep on unchanged windows...")
+    
+    bars = make_hourly_bars(400, seed=5, decimals=4)
+    with tempfile.TemporaryDirectory() as directory:
+        book = ZoneBook(directory=directory, save_interval=0)
+        zones = book.update("AUD/USD", bars.iloc[:300])
+        zones[0]['price'] = 0.0  # Callers get copies, not the cached ranking
+        for _ in range(5):
+            assert book.update("AUD/USD", bars.iloc[:300]) == expected_zones(bars.iloc[:300])
+        stats = book.get_stats()
+        assert stats["rankings"] == 1 and stats["saves"] == 1 and stats["incremental_updates"] == 0
+        
+        book.update("AUD/USD", bars.iloc[1:301])
+        assert book.get_stats()["saves"] == 2
+        
+        throttled = ZoneBook(directory=directory, save_interval=3600)
+        throttled.update("AUD/USD", bars.iloc[2:302])  # First save of this run goes out
+        throttled.update("AUD/USD", bars.iloc[3:303])  # Too soon: kept in memory
+        assert throttled.get_stats()["saves"] == 1
+        throttled.flush()
+        assert throttled.get_stats()["saves"] == 2
+        
+        reloaded = ZoneBook(directory=directory)
+        assert reloaded.update("AUD/USD", bars.iloc[3:303]) == expected_zones(bars.iloc[3:303])
+        assert reloaded.get_stats()["rebuilds"] == 0 and reloaded.get_stats()["saves"] == 0
+    
+    print("   ✅ Unchanged windows OK")
+
+def test_benchmark_six_months():
+    """Sliding a 6-month book forward one bar at a time stays in step with a full recompute"""
+    print("🧪 Benchmarking incremental update on 6 months of hourly data...")
+    
+    bars = make_hourly_bars(24 * 182 + 50, seed=11, decimals=4)
+    window_size = 24 * 182
+    book = ZoneBook(persist=False)
+    book.update("USD/JPY", bars.iloc[:window_size])
+    
+    runs = 50
+    windows = [bars.iloc[i:window_size + i] for i in range(1, runs + 1)]
+    start = time.perf_counter()
+    for window in windows:
+        zones = book.update("USD/JPY", window)
+    incremental_seconds = (time.perf_counter() - start) / runs
+    
+    start = time.perf_counter()
+    for window in windows:
+        expected = expected_zones(window)
+    full_seconds = (time.perf_counter() - start) / runs
+    
+    assert zones == expected
+    print(f"   {window_size} bars: incremental {incremental_seconds * 1000:.2f} ms/update, "
+          f"full recompute {full_seconds * 1000:.2f} ms")
+    print("   ✅ Benchmark OK")
+
+if __name__ == "__main__":
+    test_sliding_window()
+    test_persistence()
+    test_unchanged_window()
+    test_benchmark_six_months()
+    print("🎉 All zone book tests passed")
+    sys.exit(0)
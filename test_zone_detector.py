@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test Zone Detector
+Verifies the vectorized zone search returns exactly what the original
+row-by-row implementation returned, and benchmarks both on a year of hourly bars
+"""
+
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_bars import make_hourly_bars
+from zone_engine import find_zones_arrays, find_pivots
+from yahoo_forex_bot import ZoneDetector
+
+def legacy_find_zones(df):
+    """The original iterrows/boolean-mask implementation, kept as the reference"""
+    if df is None or df.empty:
+        return []
+    
+    df['pivot_high'] = df['High'].rolling(window=5, center=True).max() == df['High']
+    df['pivot_low'] = df['Low'].rolling(window=5, center=True).min() == df['Low']
+    
+    resistance_levels = []
+    support_levels = []
+    
+    for idx, row in df.iterrows():
+        if row['pivot_high']:
+            level = row['High']
+            tolerance = level * 0.002
+            touches = len(df[(df['High'] >= level - tolerance) & (df['High'] <= level + tolerance)])
+            if touches >= 1:
+                resistance_levels.append({'type': 'supply', 'price': level, 'strength': touches, 'touches': touches})
+    
+    for idx, row in df.iterrows():
+        if row['pivot_low']:
+            level = row['Low']
+            tolerance = level * 0.002
+            touches = len(df[(df['Low'] >= level - tolerance) & (df['Low'] <= level + tolerance)])
+            if touches >= 1:
+                support_levels.append({'type': 'demand', 'price': level, 'strength': touches, 'touches': touches})
+    
+    all_zones = resistance_levels + support_levels
+    all_zones.sort(key=lambda x: x['strength'], reverse=True)
+    
+    filtered_zones = []
+    for zone in all_zones:
+        is_duplicate = False
+        for existing_zone in filtered_zones:
+            if abs(zone['price'] - existing_zone['price']) / existing_zone['price'] < 0.001:
+                is_duplicate = True
+                break
+        if not is_duplicate:
+            filtered_zones.append(zone)
+    
+    return filtered_zones[:10]
+
+def test_equivalence():
+    """Same zones, same order, same values across many random series"""
+    print("🧪 Testing zone equivalence...")
+    
+    detector = ZoneDetector()
+    for seed in range(25):
+        periods = [3, 6, 120, 720][seed % 4]
+        decimals = [5, 3, 2][seed % 3]
+        bars = make_hourly_bars(periods, seed=seed, decimals=decimals)
+        if seed % 5 == 0 and periods > 10:
+            bars.iloc[periods // 2, bars.columns.get_loc('High')] = np.nan
+        
+        expected = legacy_find_zones(bars.copy())
+        actual_frame = bars.copy()
+        actual = detector.find_zones(actual_frame)
+        
+        assert actual == expected, f"seed {seed}: {actual} != {expected}"
+        assert list(actual_frame.columns) == list(bars.columns)  # Caller's frame is left alone
+        expected_pivots = bars['Low'].rolling(window=5, center=True).min() == bars['Low']
+        assert (find_pivots(bars['Low'].to_numpy(), highs=False) == expected_pivots.to_numpy()).all()
+    
+    assert detector.find_zones(pd.DataFrame()) == []
+    assert detector.find_zones(None) == []
+    
+    print("   ✅ Zone equivalence OK")
+
+def test_benchmark_one_year():
+    """A year of hourly bars: vectorized search is identical and much faster"""
+    print("🧪 Benchmarking zone search on 1 year of hourly data...")
+    
+    bars = make_hourly_bars(24 * 365, seed=42, decimals=4)
+    
+    start = time.perf_counter()
+    expected = legacy_find_zones(bars.copy())
+    legacy_seconds = time.perf_counter() - start
+    
+    high = bars['High'].to_numpy()
+    low = bars['Low'].to_numpy()
+    runs = 20
+    start = time.perf_counter()
+    for _ in range(runs):
+        actual = find_zones_arrays(high, low)
+    vectorized_seconds = (time.perf_counter() - start) / runs
+    
+    assert actual == expected
+    speedup = legacy_seconds / vectorized_seconds
+    print(f"   {len(bars)} bars: legacy {legacy_seconds * 1000:.1f} ms, "
+          f"vectorized {vectorized_seconds * 1000:.2f} ms ({speedup:.0f}x)")
+    assert speedup > 10
+    
+    print("   ✅ Benchmark OK")
+
+if __name__ == "__main__":
+    test_equivalence()
+    test_benchmark_one_year()
+    print("🎉 All zone detector tests passed")
+    sys.exit(0)
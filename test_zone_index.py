@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test Zone Proximity Index
+Verifies the bisect trigger bands agree with the linear 0.5% scan and that
+only symbols with a zone in play (or no/stale zones) ask for a full analysis
+"""
+
+import sys
+
+import numpy as np
+
+from zone_index import ZoneProximityIndex, SymbolZoneIndex, is_near_zone
+
+def make_zones(rng, count, center=1.1):
+    prices = np.round(center * (1 + rng.normal(0, 0.01, count)), 4)
+    return [{'type': 'supply' if i % 2 else 'demand', 'price': float(price), 'strength': count - i, 'touches': count - i}
+            for i, price in enumerate(prices)]
+
+def test_matches_linear_scan():
+    """Zones in play are exactly the ones the linear scan finds, in the same order"""
+    print("🧪 Testing trigger bands against the linear scan...")
+    
+    rng = np.random.default_rng(5)
+    for trial in range(50):
+        zones = make_zones(rng, [0, 1, 3, 10][trial % 4])
+        index = SymbolZoneIndex(zones)
+        prices = np.concatenate([
+            1.1 * (1 + rng.normal(0, 0.015, 200)),
+            [zone['price'] / 1.005 for zone in zones],  # Exactly on the band edges
+            [zone['price'] / 0.995 for zone in zones],
+        ])
+        for price in prices:
+            expected = [zone for zone in zones if abs(price - zone['price']) / price < 0.005]
+            assert index.zones_near(price) == expected, (trial, price)
+            assert index.in_play(price) == bool(expected)
+    
+    assert SymbolZoneIndex([]).zones_near(1.1) == []
+    assert not SymbolZoneIndex(make_zones(rng, 3)).in_play(None)
+    assert is_near_zone(1.0, 1.004) and not is_near_zone(1.0, 1.006)
+    
+    print("   ✅ Trigger bands OK")
+
+def test_needs_analysis():
+    """Missing, stale or in-band symbols are analysed; the rest are skipped"""
+    print("🧪 Testing analysis triggers...")
+    
+    index = ZoneProximityIndex(max_age=3600)
+    assert index.needs_analysis("EUR/USD", 1.1)  # No zones yet
+    
+    index.update("EUR/USD", [{'type': 'demand', 'price': 1.1, 'strength': 3, 'touches': 3}])
+    assert index.needs_analysis("EUR/USD", 1.1040)
+    assert not index.needs_analysis("EUR/USD", 1.1100)
+    assert index.needs_analysis("EUR/USD", None)  # No quote: can't rule it out
+    
+    index.get("EUR/USD").built_at -= 7200
+    assert index.is_stale("EUR/USD")
+    assert index.needs_analysis("EUR/USD", 1.1100)
+    
+    stats = index.get_stats()
+    assert stats["checks"] == 5 and stats["skipped"] == 1
+    
+    print(f"   Stats: {stats}")
+    print("   ✅ Analysis triggers OK")
+
+if __name__ == "__main__":
+    test_matches_linear_scan()
+    test_needs_analysis()
+    print("🎉 All zone index tests passed")
+    sys.exit(0)
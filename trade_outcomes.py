@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Intrabar Trade Outcome Engine
+Finds which stop/target a trade touched first from the high/low path of every bar
+since it was last checked, instead of comparing only the latest price
+- First touch of each level is one vectorized scan over the bars (no loop per bar)
+- A bar that reaches both the stop and a target counts as stopped out: the order
+  inside the bar is unknown, so the conservative outcome wins
+- A stop moved after a target (breakeven) only applies from the next bar on
+- A bar that opens beyond a level fills at its open (gap), otherwise at the level
+- The latest quote is checked after the bars, as the old price-only check did
+"""
+
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars, field, epoch_ns
+
+# Yahoo periods for the bars between checks, shortest first, with how many days back each
+# surely reaches whatever the exchange's timezone ('Nd' is N trading dates, so '1d' stops at
+# the exchange-date boundary and can miss a check made before midnight)
+PATH_PERIODS = (("5d", 3), ("1mo", 27))
+
+def checked_epoch_ns(checked: Optional[str]) -> Optional[int]:
+    """
+    Epoch nanoseconds of a stored last_checked/timestamp (ISO text from datetime.now(),
+    so naive values are local time); None if missing or unreadable
+    """
+    if not checked:
+        return None
+    try:
+        return int(datetime.fromisoformat(checked).timestamp() * 1e9)
+    except (TypeError, ValueError):
+        return None
+
+def path_period(checked: Sequence[Optional[str]], now: Optional[datetime] = None) -> str:
+    """Shortest period whose bars reach back to the oldest stored last_checked/entry time"""
+    times = [ns for ns in (checked_epoch_ns(value) for value in checked) if ns is not None]
+    if not times:
+        return PATH_PERIODS[0][0]
+    
+    now_ns = checked_epoch_ns((now or datetime.now()).isoformat())
+    days = (now_ns - min(times)) / (86400 * 1e9)
+    for period, reach in PATH_PERIODS:
+        if days <= reach:
+            return period
+    return PATH_PERIODS[-1][0]  # Older checks: as far back as the bars go
+
+def first_touch(values: np.ndarray, level: float, above: bool, start: int = 0) -> int:
+    """Position of the first bar from `start` reaching level (>= if above, else <=), -1 if none"""
+    if start >= len(values):
+        return -1
+    hits = values[start:] >= level if above else values[start:] <= level
+    position = int(np.argmax(hits))
+    return start + position if hits[position] else -1
+
+def bars_since(bars: Union[Bars, pd.DataFrame, None], since_ns: Optional[int],
+               bar_seconds: int = 60) -> Dict[str, np.ndarray]:
+    """
+    Open/high/low/epoch of the bars that end after `since_ns` (the bar that was still
+    forming at the last check is scanned again, it may have extended since)
+    """
+    if bars is None or len(bars) == 0:
+        empty = np.array([], dtype="float64")
+        return {'open': empty, 'high': empty, 'low': empty, 'epoch': np.array([], dtype="int64")}
+    
+    epoch = epoch_ns(bars)
+    start = 0
+    if since_ns is not None:
+        start = int(np.searchsorted(epoch, since_ns - int(bar_seconds * 1e9), side="right"))
+    return {
+        'open': field(bars, 'Open')[start:],
+        'high': field(bars, 'High')[start:],
+        'low': field(bars, 'Low')[start:],
+        'epoch': epoch[start:]
+    }
+
+def trade_path_events(bars: Union[Bars, pd.DataFrame, None], direction: str, stop: float,
+                      targets: Sequence[float], hit: Sequence[int] = (), since: Optional[str] = None,
+                      price: Optional[float] = None, breakeven: Optional[float] = None,
+                      bar_seconds: int = 60) -> List[Dict]:
+    """
+    Stop/target touches in the order they happened, ending at the stop or the last target
+    targets are TP1..TPn; `hit` holds the target numbers already taken; the stop moves to
+    `breakeven` after TP1 if that tightens it. Events are dicts with type ('stop'/'target'),
+    level (target number, 0 for the stop), price (fill), time (bar UTC Timestamp, None for
+    the quote) and bar (position among the scanned bars).
+    """
+    path = bars_since(bars, checked_epoch_ns(since), bar_seconds)
+    opens, highs, lows, epoch = path['open'], path['high'], path['low'], path['epoch']
+    if price is not None:
+        # The quote is the newest point of the path
+        opens, highs, lows = (np.append(values, price) for values in (opens, highs, lows))
+    
+    def time_at(bar):
+        return pd.Timestamp(int(epoch[bar]), unit="ns", tz="UTC") if bar < len(epoch) else None
+    
+    long = direction == 'LONG'
+    favourable, adverse = (highs, lows) if long else (lows, highs)
+    pending = [number for number in range(1, len(targets) + 1) if number not in hit]
+    events = []
+    stop_from = target_from = 0
+    
+    while True:
+        stop_bar = first_touch(adverse, stop, above=not long, start=stop_from)
+        target_bars = {number: first_touch(favourable, targets[number - 1], above=long, start=target_from)
+                       for number in pending}
+        touched = [position for position in [stop_bar] + list(target_bars.values()) if position >= 0]
+        if not touched:
+            break
+        bar = min(touched)
+        
+        if stop_bar == bar:
+            # Stop first, or in the same bar as a target: the conservative outcome
+            gapped = opens[bar] <= stop if long else opens[bar] >= stop
+            events.append({'type': 'stop', 'level': 0, 'price': float(opens[bar] if gapped else stop),
+                           'time': time_at(bar), 'bar': bar})
+            break
+        
+        closed = False
+        for number in [number for number in pending if target_bars[number] == bar]:
+            target = targets[number - 1]
+            gapped = opens[bar] >= target if long else opens[bar] <= target
+            events.append({'type': 'target', 'level': number, 'price': float(opens[bar] if gapped else target),
+                           'time': time_at(bar), 'bar': bar})
+            pending.remove(number)
+            closed = closed or number == len(targets)
+            if number == 1 and breakeven is not None and (breakeven > stop if long else breakeven < stop):
+                stop = breakeven
+                stop_from = bar + 1
+        if closed:
+            break
+        # Nothing touched before this bar; a moved stop starts on the next one
+        stop_from = max(stop_from, bar)
+        target_from = bar
+    
+    return events
@@ -10,6 +10,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 import logging
 
+from trade_outcomes import trade_path_events
+
 logger = logging.getLogger(__name__)
 
 class TradeTracker:
@@ -125,8 +127,13 @@ class TradeTracker:
         
         return True
     
-    def check_trade_outcomes(self, current_prices):
-        """Check if any active trades have hit stop or target"""
+    def check_trade_outcomes(self, current_prices, bars=None, bar_seconds=60):
+        """
+        Check if any active trades have hit stop or target
+        With bars (symbol -> OHLCV frame or Bars), the high/low path since each trade's
+        last_checked (or entry) is scanned too, so a wick between checks isn't missed; a
+        bar that touched both stop and target counts as a loss.
+        """
         active_trades = self.load_active_trades()
         updated_trades = []
         closed_trades = []
@@ -135,43 +142,37 @@ class TradeTracker:
             symbol = trade['symbol']
             current_price = current_prices.get(symbol)
             
-            if current_price is None:
+            # Bars since the last check (or entry); without either only the current price counts
+            since = trade.get('last_checked') or trade.get('timestamp')
+            path = bars.get(symbol) if bars and since else None
+            
+            if current_price is None and path is None:
                 # Keep trade active if we can't get current price
                 updated_trades.append(trade)
                 continue
             
-            # Check if trade hit stop or target
-            hit_stop = False
-            hit_target = False
-            outcome = None
-            
-            if trade['direction'] == 'LONG':
-                if current_price <= trade['stop']:
-                    hit_stop = True
-                    outcome = 'loss'
-                elif current_price >= trade['target']:
-                    hit_target = True
-                    outcome = 'win'
-            else:  # SHORT
-                if current_price >= trade['stop']:
-                    hit_stop = True
-                    outcome = 'loss'
-                elif current_price <= trade['target']:
-                    hit_target = True
-                    outcome = 'win'
+            # First of stop or target along the path, then at the current price
+            events = trade_path_events(path, trade['direction'], trade['stop'], [trade['target']],
+                                       since=since, price=current_price,
+                                       bar_seconds=bar_seconds)
             
-            if hit_stop or hit_target:
+            if events:
                 # Close the trade
+                event = events[0]
+                outcome = 'loss' if event['type'] == 'stop' else 'win'
+                close_price = event['price']
                 trade['status'] = outcome
                 trade['closed_at'] = datetime.now().isoformat()
-                trade['close_price'] = current_price
+                trade['close_price'] = close_price
                 trade['last_checked'] = datetime.now().isoformat()
+                if event['time'] is not None:
+                    trade['touched_at'] = event['time'].isoformat()  # Bar that hit the level (UTC)
                 
                 # Calculate P&L
                 if trade['direction'] == 'LONG':
-                    pnl = (current_price - trade['entry']) * 10000  # Assuming 1 lot = $10,000
+                    pnl = (close_price - trade['entry']) * 10000  # Assuming 1 lot = $10,000
                 else:
-                    pnl = (trade['entry'] - current_price) * 10000
+                    pnl = (trade['entry'] - close_price) * 10000
                 
                 trade['pnl'] = pnl
                 closed_trades.append(trade)
@@ -179,7 +180,7 @@ class TradeTracker:
                 # Add to cooldown
                 self._add_to_cooldown(trade)
                 
-                logger.info(f"🎯 {symbol} {trade['direction']}: {outcome.upper()} at {current_price} (P&L: ${pnl:.2f})")
+                logger.info(f"🎯 {symbol} {trade['direction']}: {outcome.upper()} at {close_price} (P&L: ${pnl:.2f})")
             else:
                 # Keep trade active
                 trade['last_checked'] = datetime.now().isoformat()
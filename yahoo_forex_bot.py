@@ -54,13 +54,22 @@ except ImportError:
 
 # Import Rate-Limited Data Fetcher
 try:
-    from rate_limited_data_fetcher import RateLimitedDataFetcher
+    from rate_limited_data_fetcher import RateLimitedDataFetcher, get_shared_fetcher
     RATE_LIMITED_FETCHER_AVAILABLE = True
     logger.info("✅ Rate-Limited Data Fetcher loaded - Railway optimized!")
 except ImportError:
     RATE_LIMITED_FETCHER_AVAILABLE = False
     logger.error("❌ Rate-Limited Data Fetcher not available")
 
+# Vectorized zone search
+from zone_engine import find_zones_arrays, find_zones_panel
+from zone_book import ZoneBook
+from zone_index import ZoneProximityIndex
+from analysis_cache import AnalysisCache, SymbolAnalysis, last_closed_bar
+from panel import BarPanel
+from bars import Bars, as_bars, field
+from trade_outcomes import path_period
+
 # Import Dynamic R:R Optimizer
 try:
     from dynamic_rr_optimizer import DynamicRROptimizer
@@ -145,7 +154,8 @@ class YahooDataFetcher:
     def __init__(self):
         # Use rate-limited fetcher if available, otherwise fallback to basic
         if RATE_LIMITED_FETCHER_AVAILABLE:
-            self.fetcher = RateLimitedDataFetcher(base_delay=2.0, max_delay=10.0)
+            # Shared with the stock bot and summaries so they coalesce requests
+            self.fetcher = get_shared_fetcher(base_delay=2.0, max_delay=10.0)
             logger.info("✅ Using Rate-Limited Data Fetcher for Railway deployment")
         else:
             self.fetcher = None
@@ -178,11 +188,11 @@ class YahooDataFetcher:
             "ETHEREUM": "ETH-USD"
         }
     
-    def get_current_price(self, symbol):
+    def get_current_price(self, symbol, priority="scan"):
         """Get current price from Yahoo Finance with rate limiting"""
         # Use rate-limited fetcher if available
         if self.fetcher:
-            price = self.fetcher.get_current_price(symbol)
+            price = self.fetcher.get_current_price(symbol, priority=priority)
             if price:
                 logger.info(f"✅ Yahoo Finance: {symbol} = {price:.5f} (RATE LIMITED)")
                 return price
@@ -195,18 +205,8 @@ class YahooDataFetcher:
             yahoo_symbol = self.symbol_mapping.get(symbol, f"{symbol.replace('/', '')}=X")
             ticker = yf.Ticker(yahoo_symbol)
             
-            # Try multiple methods to get price
-            info = ticker.info
-            if 'regularMarketPrice' in info:
-                price = info['regularMarketPrice']
-            elif 'currentPrice' in info:
-                price = info['currentPrice']
-            elif 'ask' in info:
-                price = info['ask']
-            else:
-                # Fallback to fast_info
-                fast_info = ticker.fast_info
-                price = fast_info.get('lastPrice', None)
+            # fast_info is far lighter than ticker.info (no quoteSummary scrape)
+            price = ticker.fast_info.get('lastPrice', None)
             
             if price:
                 logger.info(f"✅ Yahoo Finance: {symbol} = {price:.5f} (FREE)")
@@ -219,11 +219,26 @@ class YahooDataFetcher:
             logger.error(f"❌ Yahoo Finance error for {symbol}: {e}")
             return None
     
+    def get_quotes(self, symbols, priority="scan"):
+        """Get last/bid/ask/timestamp for several symbols in one batched request"""
+        if self.fetcher:
+            quotes = self.fetcher.get_quotes(symbols, priority=priority)
+            logger.info(f"✅ Quotes: {len(quotes)}/{len(symbols)} symbols (RATE LIMITED)")
+            return quotes
+        
+        # Fallback to one price lookup per symbol
+        quotes = {}
+        for symbol in symbols:
+            price = self.get_current_price(symbol, priority=priority)
+            if price:
+                quotes[symbol] = {'last': price, 'bid': None, 'ask': None, 'timestamp': None}
+        return quotes
+    
     def get_historical_data(self, symbol, period="1mo"):
-        """Get historical data for analysis with rate limiting"""
+        """Get historical data for analysis with rate limiting (compact read-only Bars)"""
         # Use rate-limited fetcher if available
         if self.fetcher:
-            data = self.fetcher.get_historical_data(symbol, period=period, interval="1h")
+            data = self.fetcher.get_bars(symbol, period=period, interval="1h")
             if data is not None and not data.empty:
                 logger.info(f"✅ Historical data: {symbol} ({len(data)} candles) (RATE LIMITED)")
                 return data
@@ -241,7 +256,7 @@ class YahooDataFetcher:
             
             if not hist.empty:
                 logger.info(f"✅ Historical data: {symbol} ({len(hist)} candles)")
-                return hist
+                return Bars.from_frame(hist)
             else:
                 logger.warning(f"⚠️  No historical data for {symbol}")
                 return None
@@ -250,6 +265,22 @@ class YahooDataFetcher:
             logger.error(f"❌ Historical data error for {symbol}: {e}")
             return None
 
+    def get_historical_data_batch(self, symbols, period="1mo"):
+        """Get historical data for a whole rotation in one grouped request"""
+        if not self.fetcher or not symbols:
+            return {}
+        
+        frames = self.fetcher.get_bars_batch(symbols, period=period, interval="1h")
+        logger.info(f"✅ Batch historical data: {len(frames)}/{len(symbols)} symbols (RATE LIMITED)")
+        return frames
+
+    def get_recent_bars(self, symbols, period="1d", interval="5m", priority="monitor"):
+        """Recent intraday bars for open trades in one grouped request (empty without the fetcher)"""
+        if not self.fetcher or not symbols:
+            return {}
+        
+        return self.fetcher.get_bars_batch(symbols, period=period, interval=interval, priority=priority)
+
 class MarketHoursChecker:
     """Check if markets are open for trading"""
     
@@ -333,67 +364,20 @@ class ZoneDetector:
     """Detect support/resistance zones"""
     
     def find_zones(self, df):
-        """Find support and resistance zones - IMPROVED VERSION"""
+        """Find support and resistance zones - IMPROVED VERSION (frame or Bars, never modified)"""
         if df is None or df.empty:
             return []
         
-        # Use a more robust zone detection method
         # Look for significant price levels that have been tested multiple times
-        
-        # Find pivot highs and lows with larger window for better accuracy
-        df['pivot_high'] = df['High'].rolling(window=5, center=True).max() == df['High']
-        df['pivot_low'] = df['Low'].rolling(window=5, center=True).min() == df['Low']
-        
-        # Get significant levels (more than 1 touch)
-        resistance_levels = []
-        support_levels = []
-        
-        # Find resistance zones (supply) - look for levels that were tested multiple times
-        for idx, row in df.iterrows():
-            if row['pivot_high']:
-                level = row['High']
-                # Count how many times this level was tested (within 0.2% tolerance)
-                tolerance = level * 0.002  # 0.2% tolerance (more flexible)
-                touches = len(df[(df['High'] >= level - tolerance) & (df['High'] <= level + tolerance)])
-                if touches >= 1:  # At least 1 touch for significance (more sensitive)
-                    resistance_levels.append({
-                        'type': 'supply',
-                        'price': level,
-                        'strength': touches,
-                        'touches': touches
-                    })
-        
-        # Find support zones (demand) - look for levels that were tested multiple times
-        for idx, row in df.iterrows():
-            if row['pivot_low']:
-                level = row['Low']
-                # Count how many times this level was tested (within 0.2% tolerance)
-                tolerance = level * 0.002  # 0.2% tolerance (more flexible)
-                touches = len(df[(df['Low'] >= level - tolerance) & (df['Low'] <= level + tolerance)])
-                if touches >= 1:  # At least 1 touch for significance (more sensitive)
-                    support_levels.append({
-                        'type': 'demand',
-                        'price': level,
-                        'strength': touches,
-                        'touches': touches
-                    })
-        
-        # Combine and sort by strength (number of touches)
-        all_zones = resistance_levels + support_levels
-        all_zones.sort(key=lambda x: x['strength'], reverse=True)
-        
-        # Remove duplicate zones (within 0.1% of each other)
-        filtered_zones = []
-        for zone in all_zones:
-            is_duplicate = False
-            for existing_zone in filtered_zones:
-                if abs(zone['price'] - existing_zone['price']) / existing_zone['price'] < 0.001:
-                    is_duplicate = True
-                    break
-            if not is_duplicate:
-                filtered_zones.append(zone)
-        
-        return filtered_zones[:10]  # Return top 10 strongest zones
+        # (pivots, touch counts and de-duplication run on NumPy arrays in zone_engine)
+        return find_zones_arrays(field(df, 'High'), field(df, 'Low'))  # Top 10 strongest zones
+    
+    def find_zones_panel(self, panel):
+        """Zones for every symbol of a BarPanel in one pass -> {symbol: zones}"""
+        if len(panel) == 0:
+            return {}
+        zones = find_zones_panel(panel.packed('High'), panel.packed('Low'))
+        return dict(zip(panel.symbols, zones))
 
 class YahooTradingBot:
     """Main trading bot using Yahoo Finance"""
@@ -401,6 +385,13 @@ class YahooTradingBot:
     def __init__(self):
         self.data_fetcher = YahooDataFetcher()
         self.zone_detector = ZoneDetector()
+        
+        # Zones are maintained incrementally per symbol (and survive restarts), so a
+        # longer lookback (e.g. FOREX_HISTORY_PERIOD=6mo) no longer slows scans
+        self.history_period = os.getenv("FOREX_HISTORY_PERIOD", "1mo")
+        self.zone_book = ZoneBook()
+        self.zone_index = ZoneProximityIndex()  # Trigger bands: which symbols need a full analysis
+        self.analysis_cache = AnalysisCache(interval="1h")  # Zones/scores reused until the next 1h bar closes
         self.notifier = TelegramNotifier()
         self.market_checker = MarketHoursChecker()
         
@@ -480,8 +471,8 @@ class YahooTradingBot:
         self.scan_count += 1
         return symbols
     
-    def analyze_symbol(self, symbol):
-        """Analyze a single symbol for trading opportunities"""
+    def analyze_symbol(self, symbol, hist_data=None, analysis=None, current_price=None):
+        """Analyze a single symbol for trading opportunities (current_price: the scan's batch quote)"""
         logger.info(f"🔍 Analyzing {symbol}...")
         
         # Check if we can generate a signal for this symbol (trade tracking)
@@ -494,98 +485,160 @@ class YahooTradingBot:
             logger.info(f"⏰ Markets closed for {symbol}: {market_status}")
             return None
         
-        # Get current price
-        current_price = self.data_fetcher.get_current_price(symbol)
+        # Zones and bar scores are reused until the next 1h bar closes; a symbol
+        # analysed since then needs no history download at all
+        if analysis is None and (hist_data is None or hist_data.empty):
+            analysis = self.analysis_cache.get(symbol)
+            if analysis is None:
+                hist_data = self.data_fetcher.get_historical_data(symbol, period=self.history_period)
+                if hist_data is None:
+                    return None
+        
+        # Get current price: the cycle's batch quote, otherwise the bars just downloaded
+        # while they're fresh, otherwise a quote request of its own
+        if not current_price:
+            current_price = self.data_fetcher.get_current_price(symbol)
         if not current_price:
             return None
         
-        # Get historical data
-        hist_data = self.data_fetcher.get_historical_data(symbol)
-        if hist_data is None:
-            return None
+        if analysis is None:
+            analysis = self.get_bar_analysis(symbol, hist_data)
+            if analysis is None:
+                return None
         
-        # Find zones
-        zones = self.zone_detector.find_zones(hist_data)
+        # Cheap part, every scan: the zones in play (within 0.5%) at the current price
+        near_zones = analysis.zone_index.zones_near(current_price)
         
-        # Log zone detection for debugging
-        if zones:
-            demand_zones = [z for z in zones if z['type'] == 'demand']
-            supply_zones = [z for z in zones if z['type'] == 'supply']
-            logger.info(f"🔍 {symbol}: Found {len(demand_zones)} demand zones, {len(supply_zones)} supply zones")
+        # AI-powered R:R optimization (2:1 to 5:1) scores every zone in play at once,
+        # so the best-ranked zone is tried first rather than the first one found
+        if self.rr_optimizer:
+            candidates = self.rr_optimizer.optimize_many(hist_data, current_price, near_zones,
+                                                         analysis=analysis.scores)
+        else:
+            candidates = [(None, None, None, zone) for zone in near_zones]
         
-        # Look for trading opportunities
-        for zone in zones:
+        for optimal_rr, confidence, rr_explanation, zone in candidates:
             zone_price = zone['price']
             zone_type = zone['type']
             
-            # Check if price is near zone
-            distance = abs(current_price - zone_price) / current_price
+            # Calculate entry
+            entry = current_price
             
-            if distance < 0.005:  # Within 0.5%
-                # Calculate entry
-                entry = current_price
+            # Use Dynamic R:R Optimizer if available
+            if self.rr_optimizer:
+                # Calculate stop and target based on optimized R:R
+                stop, target = self.rr_optimizer.calculate_stop_and_target(
+                    entry, zone_type, optimal_rr
+                )
                 
-                # Use Dynamic R:R Optimizer if available
-                if self.rr_optimizer:
-                    # AI-powered R:R optimization (2:1 to 5:1)
-                    optimal_rr, confidence, rr_explanation = self.rr_optimizer.optimize_rr_ratio(
-                        hist_data, current_price, zone_price, zone_type
-                    )
-                    
-                    # Calculate stop and target based on optimized R:R
-                    stop, target = self.rr_optimizer.calculate_stop_and_target(
-                        entry, zone_type, optimal_rr
-                    )
-                    
-                    risk_reward = optimal_rr
-                    bias_info = f"Price near {zone_type} zone. {'LONG' if zone_type == 'demand' else 'SHORT'} signal with {risk_reward:.1f}:1 R:R (AI-optimized: {rr_explanation})"
-                    
+                risk_reward = optimal_rr
+                bias_info = f"Price near {zone_type} zone. {'LONG' if zone_type == 'demand' else 'SHORT'} signal with {risk_reward:.1f}:1 R:R (AI-optimized: {rr_explanation})"
+            
+            else:
+                # Fallback to fixed 2:1 R:R if optimizer not available
+                if zone_type == 'demand':
+                    # For demand zones (support), we go LONG
+                    stop = entry * 0.995  # 0.5% below entry for stop loss
+                    target = entry * 1.010  # 1.0% above entry for take profit (2:1 R:R)
+                else:  # supply
+                    # For supply zones (resistance), we go SHORT
+                    stop = entry * 1.005  # 0.5% above entry for stop loss
+                    target = entry * 0.990  # 1.0% below entry for take profit (2:1 R:R)
+                
+                # Calculate risk/reward ratio properly
+                risk = abs(entry - stop)
+                reward = abs(target - entry)
+                
+                if risk > 0:
+                    risk_reward = reward / risk
                 else:
-                    # Fallback to fixed 2:1 R:R if optimizer not available
-                    if zone_type == 'demand':
-                        # For demand zones (support), we go LONG
-                        stop = entry * 0.995  # 0.5% below entry for stop loss
-                        target = entry * 1.010  # 1.0% above entry for take profit (2:1 R:R)
-                    else:  # supply
-                        # For supply zones (resistance), we go SHORT
-                        stop = entry * 1.005  # 0.5% above entry for stop loss
-                        target = entry * 0.990  # 1.0% below entry for take profit (2:1 R:R)
-                    
-                    # Calculate risk/reward ratio properly
-                    risk = abs(entry - stop)
-                    reward = abs(target - entry)
-                    
-                    if risk > 0:
-                        risk_reward = reward / risk
-                    else:
-                        risk_reward = 0
-                    
-                    bias_info = f"Price near {zone_type} zone. {'LONG' if zone_type == 'demand' else 'SHORT'} signal with {risk_reward:.1f}:1 R:R"
+                    risk_reward = 0
                 
-                if risk_reward >= 2.0:  # Minimum 2:1 R:R
-                    signal = {
-                        'signal_id': f"{symbol}_{zone_type}_{int(time.time())}",
-                        'timestamp': datetime.now().isoformat(),
-                        'symbol': symbol,
-                        'zone_type': zone_type,
-                        'entry': entry,
-                        'stop': stop,
-                        'target': target,
-                        'risk_reward': risk_reward,
-                        'current_price': current_price,
-                        'bias_info': bias_info,
-                        'status': 'active'
-                    }
-                    
-                    # Add to trade tracker to prevent contradictory signals
-                    if self.trade_tracker:
-                        self.trade_tracker.add_active_trade(signal)
-                        logger.info(f"📊 Added {symbol} to active trades - No contradictory signals allowed")
-                    
-                    return signal
+                bias_info = f"Price near {zone_type} zone. {'LONG' if zone_type == 'demand' else 'SHORT'} signal with {risk_reward:.1f}:1 R:R"
+            
+            if risk_reward >= 2.0:  # Minimum 2:1 R:R
+                signal = {
+                    'signal_id': f"{symbol}_{zone_type}_{int(time.time())}",
+                    'timestamp': datetime.now().isoformat(),
+                    'symbol': symbol,
+                    'zone_type': zone_type,
+                    'entry': entry,
+                    'stop': stop,
+                    'target': target,
+                    'risk_reward': risk_reward,
+                    'current_price': current_price,
+                    'bias_info': bias_info,
+                    'status': 'active'
+                }
+                
+                # Add to trade tracker to prevent contradictory signals
+                if self.trade_tracker:
+                    self.trade_tracker.add_active_trade(signal)
+                    logger.info(f"📊 Added {symbol} to active trades - No contradictory signals allowed")
+                
+                return signal
         
         return None
     
+    def get_bar_analysis(self, symbol, hist_data):
+        """Zones and R:R bar scores as of the last closed bar (cached until the next one closes)"""
+        return self.get_bar_analyses({symbol: hist_data}).get(symbol)
+    
+    def get_bar_analyses(self, frames):
+        """
+        Bar analyses for several symbols -> {symbol: SymbolAnalysis}
+        Symbols with a new closed bar are scored together over one aligned BarPanel.
+        """
+        analyses = {}
+        closed_frames = {}
+        last_closed = {}
+        for symbol, hist_data in frames.items():
+            hist_data = as_bars(hist_data)  # No-op for the fetcher's Bars
+            last_closed[symbol] = last_closed_bar(hist_data, "1h")
+            if last_closed[symbol] is None:
+                logger.warning(f"⚠️ No closed bars for {symbol}")
+                continue
+            
+            analysis = self.analysis_cache.get(symbol, last_closed[symbol])
+            if analysis is not None:
+                analyses[symbol] = analysis
+            else:
+                # Only closed bars go in, so the result holds until the next bar closes
+                closed_frames[symbol] = hist_data.until(last_closed[symbol])
+        
+        if not closed_frames:
+            return analyses
+        
+        zones_by_symbol = {}
+        for symbol, closed_bars in closed_frames.items():
+            # Find zones (only the bars that changed since the last scan are processed)
+            try:
+                zones = self.zone_book.update(symbol, closed_bars)
+            except Exception as e:
+                logger.warning(f"⚠️ Zone book update failed for {symbol}, recomputing: {e}")
+                zones = self.zone_detector.find_zones(closed_bars)
+            zones_by_symbol[symbol] = zones
+            
+            # Log zone detection for debugging
+            if zones:
+                demand_zones = [z for z in zones if z['type'] == 'demand']
+                supply_zones = [z for z in zones if z['type'] == 'supply']
+                logger.info(f"🔍 {symbol}: Found {len(demand_zones)} demand zones, {len(supply_zones)} supply zones")
+        
+        # ATR, momentum and every zone's strength only change when a bar closes;
+        # all symbols are scored in one cross-sectional pass
+        scores = {}
+        if self.rr_optimizer:
+            scores = self.rr_optimizer.analyze_panel(BarPanel.from_frames(closed_frames), zones_by_symbol)
+        
+        for symbol, zones in zones_by_symbol.items():
+            # Refresh the symbol's trigger bands
+            zone_index = self.zone_index.update(symbol, zones)
+            analyses[symbol] = self.analysis_cache.put(
+                SymbolAnalysis(symbol, last_closed[symbol], zones, zone_index, scores.get(symbol))
+            )
+        return analyses
+    
     def save_signal(self, signal):
         """Save signal to file for dashboard"""
         try:
@@ -615,9 +668,31 @@ class YahooTradingBot:
         symbols = self.get_symbols_for_current_scan()
         signals_found = 0
         
-        for symbol in symbols:
+        # One batched quote decides which symbols have a zone in play; only those
+        # (plus symbols with no/stale zones) get the full fetch + analysis
+        tradeable = [s for s in symbols if self.market_checker.should_trade_symbol(s)[0]]
+        quotes = self.data_fetcher.get_quotes(tradeable, priority="scan") if tradeable else {}
+        triggered = [
+            s for s in tradeable
+            if self.zone_index.needs_analysis(s, (quotes.get(s) or {}).get('last'))
+        ]
+        logger.info(f"🎯 Zone triggers: {len(triggered)}/{len(tradeable)} symbols need analysis")
+        
+        # Pull the triggered symbols' history in one grouped request, skipping
+        # symbols already analysed since the last 1h bar closed
+        to_fetch = [s for s in triggered if not self.analysis_cache.is_current(s)]
+        batch_data = self.data_fetcher.get_historical_data_batch(to_fetch, period=self.history_period)
+        try:
+            analyses = self.get_bar_analyses(batch_data)
+        except Exception as e:
+            logger.error(f"❌ Batch analysis failed, analysing symbols one by one: {e}")
+            analyses = {}
+        
+        for symbol in triggered:
             try:
-                signal = self.analyze_symbol(symbol)
+                signal = self.analyze_symbol(symbol, hist_data=batch_data.get(symbol),
+                                             analysis=analyses.get(symbol),
+                                             current_price=(quotes.get(symbol) or {}).get('last'))
                 if signal:
                     # Save to dashboard
                     self.save_signal(signal)
@@ -636,14 +711,12 @@ class YahooTradingBot:
                     
                     signals_found += 1
                     logger.info(f"🎯 Signal found: {symbol}")
-                
-                # Small delay between symbols
-                time.sleep(1)
-                
+            
             except Exception as e:
                 logger.error(f"❌ Error analyzing {symbol}: {e}")
         
         logger.info(f"✅ Scan complete: {signals_found} signals found")
+        self.analysis_cache.log_stats()
         return signals_found
 
 def main():
@@ -683,18 +756,18 @@ def main():
             # Check active trades for stop/target hits (live monitoring)
             if bot.trade_tracker:
                 logger.info("🔍 Checking active trades for stop/target hits...")
-                current_prices = {}
                 
-                # Get current prices for all active trades
-                active_trades = bot.trade_tracker.load_active_trades()
-                for trade in active_trades:
-                    if trade['status'] == 'active':
-                        price = bot.data_fetcher.get_current_price(trade['symbol'])
-                        if price:
-                            current_prices[trade['symbol']] = price
+                # Get current prices and the 5-minute bars back to the oldest check for all
+                # active trades, one request each
+                active_trades = [trade for trade in bot.trade_tracker.load_active_trades() if trade['status'] == 'active']
+                symbols = [trade['symbol'] for trade in active_trades]
+                quotes = bot.data_fetcher.get_quotes(symbols, priority="monitor") if symbols else {}
+                current_prices = {symbol: quote['last'] for symbol, quote in quotes.items()}
+                period = path_period([trade.get('last_checked') or trade.get('timestamp') for trade in active_trades])
+                bars = bot.data_fetcher.get_recent_bars(symbols, period=period, interval="5m")
                 
-                # Check for trade outcomes
-                closed_count = bot.trade_tracker.check_trade_outcomes(current_prices)
+                # Check for trade outcomes (stop/target wicks since the last check count too)
+                closed_count = bot.trade_tracker.check_trade_outcomes(current_prices, bars=bars, bar_seconds=300)
                 if closed_count > 0:
                     logger.info(f"🎯 {closed_count} trades closed - New signals allowed for those pairs")
                 
@@ -723,6 +796,8 @@ def main():
         logger.info("🛑 Bot stopped by user")
     except Exception as e:
         logger.error(f"❌ Bot error: {e}")
+    finally:
+        bot.zone_book.flush()
 
 if __name__ == "__main__":
     main()
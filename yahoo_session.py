@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Pooled Yahoo Finance HTTP Session
+One keep-alive requests.Session for all Yahoo traffic in the process
+- Connections (and their TLS handshakes) are reused across symbols and threads
+- Transient 5xx responses are retried with backoff at the HTTP layer
+- Request/connection counters show how well connections are being reused
+"""
+
+import os
+import threading
+import logging
+from typing import Dict, Any
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# 429s are deliberately not retried here: they go back to the fetcher so the
+# adaptive rate controller sees them and slows the whole process down
+RETRY_STATUSES = (500, 502, 503, 504)
+
+class PooledAdapter(HTTPAdapter):
+    """HTTPAdapter that counts traffic so connection reuse can be reported"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.requests_sent = 0
+        self.request_errors = 0
+
+    def send(self, request, **kwargs):
+        with self._stats_lock:
+            self.requests_sent += 1
+        try:
+            return super().send(request, **kwargs)
+        except Exception:
+            with self._stats_lock:
+                self.request_errors += 1
+            raise
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """Connections opened vs. requests served by the live host pools"""
+        pools = self.poolmanager.pools
+        connections_opened = 0
+        pool_requests = 0
+        hosts = 0
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            hosts += 1
+            connections_opened += pool.num_connections
+            pool_requests += pool.num_requests
+        
+        with self._stats_lock:
+            requests_sent = self.requests_sent
+            request_errors = self.request_errors
+        
+        reused = max(pool_requests - connections_opened, 0)
+        return {
+            "hosts": hosts,
+            "requests": requests_sent,
+            "request_errors": request_errors,
+            "connections_opened": connections_opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / pool_requests, 3) if pool_requests else 0.0
+        }
+
+def build_session(pool_size: int = 10, retries: int = 3, backoff_factor: float = 0.5) -> requests.Session:
+    """Create a keep-alive session with a sized connection pool and retry policy"""
+    retry_strategy = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset(["GET", "HEAD", "POST"]),
+        respect_retry_after_header=True,
+        raise_on_status=False
+    )
+    adapter = PooledAdapter(
+        pool_connections=10,     # Distinct hosts kept (query1/query2/fc.yahoo.com...)
+        pool_maxsize=pool_size,  # Connections per host, >= yf.download worker threads
+        max_retries=retry_strategy
+    )
+    
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update({"Connection": "keep-alive"})
+    return session
+
+def get_connection_stats(session: requests.Session) -> Dict[str, Any]:
+    """Connection reuse statistics for a session built by build_session()"""
+    adapter = session.get_adapter("https://")
+    if isinstance(adapter, PooledAdapter):
+        return adapter.get_connection_stats()
+    return {}
+
+_shared_session = None
+_shared_session_lock = threading.Lock()
+
+def get_yahoo_session() -> requests.Session:
+    """Process-wide Yahoo session (pool size from YAHOO_POOL_SIZE)"""
+    global _shared_session
+    with _shared_session_lock:
+        if _shared_session is None:
+            pool_size = int(os.getenv("YAHOO_POOL_SIZE", "10"))
+            _shared_session = build_session(pool_size=pool_size)
+            logger.info(f"✅ Shared Yahoo HTTP session initialized (pool size {pool_size})")
+        return _shared_session
@@ -0,0 +1,493 @@
+#!/usr/bin/env python3
+"""
+Incremental Zone Book
+Per-symbol supply/demand zone state that is updated bar by bar instead of recomputed
+- Bars live in growable buffers: sliding the window appends and drops in place
+- Pivots are re-checked only around bars that were appended, changed or dropped
+- Touch counts are adjusted per bar via bucketed sorted indexes of values and pivot levels
+- Zones are re-ranked only when a pivot or touch count changed
+- State is saved to disk when it changed (optionally throttled), so a restart picks up
+  where the last run left off
+- Zones are identical to ZoneDetector.find_zones on the same window of bars
+"""
+
+import os
+import re
+import time
+import bisect
+import threading
+import logging
+from pathlib import Path
+from typing import Optional, List, Dict, Any, Union
+
+import numpy as np
+import pandas as pd
+
+from bars import Bars, epoch_ns, field
+from zone_engine import PIVOT_WINDOW, TOUCH_TOLERANCE, MAX_ZONES, find_pivots, count_touches, rank_zones
+
+logger = logging.getLogger(__name__)
+
+# Rebuild from scratch when more than this share of the overlapping bars changed
+REBUILD_CHANGE_RATIO = 0.25
+
+# Items per bucket of a _SortedBuckets before it is split
+BUCKET_SIZE = 256
+
+# Smallest bar buffer allocated for a symbol
+MIN_CAPACITY = 64
+
+class _SortedBuckets:
+    """
+    Sorted multiset kept as a list of small sorted lists
+    Insert and delete shift one bucket instead of the whole list.
+    """
+
+    def __init__(self, items=()):
+        items = list(items)
+        self._buckets = [items[i:i + BUCKET_SIZE] for i in range(0, len(items), BUCKET_SIZE)]
+        self._maxes = [bucket[-1] for bucket in self._buckets]
+
+    def __len__(self):
+        return sum(len(bucket) for bucket in self._buckets)
+
+    def add(self, item):
+        if not self._buckets:
+            self._buckets.append([item])
+            self._maxes.append(item)
+            return
+        
+        index = min(bisect.bisect_left(self._maxes, item), len(self._buckets) - 1)
+        bucket = self._buckets[index]
+        bisect.insort(bucket, item)
+        self._maxes[index] = bucket[-1]
+        if len(bucket) > 2 * BUCKET_SIZE:
+            self._buckets[index:index + 1] = [bucket[:BUCKET_SIZE], bucket[BUCKET_SIZE:]]
+            self._maxes[index:index + 1] = [bucket[BUCKET_SIZE - 1], bucket[-1]]
+
+    def remove(self, item):
+        """Remove one occurrence (the item must be present)"""
+        index = bisect.bisect_left(self._maxes, item)
+        bucket = self._buckets[index]
+        del bucket[bisect.bisect_left(bucket, item)]
+        if bucket:
+            self._maxes[index] = bucket[-1]
+        else:
+            del self._buckets[index]
+            del self._maxes[index]
+
+    def irange(self, lower, upper):
+        """Items with lower <= item <= upper, in order"""
+        index = bisect.bisect_left(self._maxes, lower)
+        while index < len(self._buckets):
+            bucket = self._buckets[index]
+            for position in range(bisect.bisect_left(bucket, lower), len(bucket)):
+                if bucket[position] > upper:
+                    return
+                yield bucket[position]
+            index += 1
+
+    def count(self, lower, upper) -> int:
+        """Number of items with lower <= item <= upper"""
+        total = 0
+        index = bisect.bisect_left(self._maxes, lower)
+        while index < len(self._buckets):
+            bucket = self._buckets[index]
+            end = bisect.bisect_right(bucket, upper)
+            total += end - bisect.bisect_left(bucket, lower)
+            if end < len(bucket):
+                break
+            index += 1
+        return total
+
+class _ZoneSide:
+    """Pivot levels and touch counts for one side (supply = highs, demand = lows)"""
+
+    def __init__(self, highs: bool, values=(), levels=()):
+        self.highs = highs
+        self.sorted_values = _SortedBuckets(values)  # Every non-NaN bar value in the window (sorted)
+        self.levels = _SortedBuckets(levels)         # (level, seq) for every pivot (sorted)
+        self.touches = {}        # Pivot seq -> bars touching its level
+        self.pivot_levels = {}   # Pivot seq -> level
+        self.changes = 0         # Bumped whenever a pivot or touch count changes
+
+    def _band(self, level: float):
+        """Inclusive touch band around a pivot level (same arithmetic as zone_engine)"""
+        tolerance = level * TOUCH_TOLERANCE
+        return level - tolerance, level + tolerance
+
+    def _pivots_touched_by(self, value: float):
+        """Seqs of pivots whose touch band contains value"""
+        # Candidate levels first (slightly widened), then the exact band test
+        low_bound = value / (1 + TOUCH_TOLERANCE) * (1 - 1e-9)
+        high_bound = value / (1 - TOUCH_TOLERANCE) * (1 + 1e-9)
+        for level, seq in self.levels.irange((low_bound,), (high_bound, float("inf"))):
+            lower, upper = self._band(level)
+            if lower <= value <= upper:
+                yield seq
+
+    def add_value(self, value: float):
+        """A bar entered the window"""
+        if value != value:  # NaN never touches anything
+            return
+        self.sorted_values.add(value)
+        for seq in self._pivots_touched_by(value):
+            self.touches[seq] += 1
+            self.changes += 1
+
+    def remove_value(self, value: float):
+        """A bar left the window (or is about to be replaced)"""
+        if value != value:
+            return
+        self.sorted_values.remove(value)
+        for seq in self._pivots_touched_by(value):
+            self.touches[seq] -= 1
+            self.changes += 1
+
+    def add_pivot(self, seq: int, level: float):
+        """Register a pivot and count the bars already touching it"""
+        lower, upper = self._band(level)
+        self.levels.add((level, seq))
+        self.touches[seq] = self.sorted_values.count(lower, upper)
+        self.pivot_levels[seq] = level
+        self.changes += 1
+
+    def remove_pivot(self, seq: int):
+        """Forget a pivot"""
+        del self.touches[seq]
+        self.levels.remove((self.pivot_levels.pop(seq), seq))
+        self.changes += 1
+
+class SymbolZones:
+    """Bar window plus incrementally maintained pivots/touches for one symbol"""
+
+    def __init__(self):
+        self.first_seq = 0  # Sequence number of the first bar in the window
+        # Window is _start:_end of the buffers; spare capacity sits after _end
+        self._epoch = np.empty(0, dtype="int64")  # Bar timestamps (ns since epoch, UTC)
+        self._high = np.empty(0, dtype="float64")
+        self._low = np.empty(0, dtype="float64")
+        self._start = 0
+        self._end = 0
+        self.supply = _ZoneSide(highs=True)
+        self.demand = _ZoneSide(highs=False)
+        self._ranked = None  # (change key, max_zones, zones) from the last zones() call
+        self.dirty = False   # Changed since the last save
+        self.rebuilds = 0
+        self.incremental_updates = 0
+        self.rankings = 0
+
+    @property
+    def epoch(self) -> np.ndarray:
+        return self._epoch[self._start:self._end]
+
+    @property
+    def high(self) -> np.ndarray:
+        return self._high[self._start:self._end]
+
+    @property
+    def low(self) -> np.ndarray:
+        return self._low[self._start:self._end]
+
+    def _side_values(self, side: _ZoneSide) -> np.ndarray:
+        return self.high if side.highs else self.low
+
+    def _is_pivot(self, side: _ZoneSide, position: int) -> bool:
+        """Same rule as the centred rolling window: the bar is the extreme of its 5-bar window"""
+        half = PIVOT_WINDOW // 2
+        if position < half or position > len(self.epoch) - 1 - half:
+            return False
+        window = self._side_values(side)[position - half:position + half + 1].tolist()
+        if any(value != value for value in window):
+            return False
+        extreme = max(window) if side.highs else min(window)
+        return extreme == window[half]
+
+    def _reserve(self, size: int):
+        """Move the window to the front of buffers with room for size bars"""
+        capacity = max(MIN_CAPACITY, 2 * size)
+        buffers = []
+        for buffer in (self._epoch, self._high, self._low):
+            grown = np.empty(capacity, dtype=buffer.dtype)
+            grown[:self._end - self._start] = buffer[self._start:self._end]
+            buffers.append(grown)
+        self._epoch, self._high, self._low = buffers
+        self._end -= self._start
+        self._start = 0
+
+    def _append(self, epoch: np.ndarray, high: np.ndarray, low: np.ndarray):
+        """Add bars after the window (amortized O(1) per bar)"""
+        end = self._end + len(epoch)
+        if end > len(self._epoch):
+            self._reserve(end - self._start)
+            end = self._end + len(epoch)
+        self._epoch[self._end:end] = epoch
+        self._high[self._end:end] = high
+        self._low[self._end:end] = low
+        self._end = end
+
+    def _set_window(self, epoch: np.ndarray, high: np.ndarray, low: np.ndarray):
+        self._start = self._end = 0
+        self._reserve(len(epoch))
+        self._append(epoch, high, low)
+
+    def rebuild(self, epoch: np.ndarray, high: np.ndarray, low: np.ndarray):
+        """Recompute everything from a full window (vectorized)"""
+        self.first_seq += len(self.epoch)  # Fresh seqs so nothing stale can collide
+        self._set_window(epoch, high, low)
+        
+        for highs in (True, False):
+            values = self.high if highs else self.low
+            sorted_values = np.sort(values[~np.isnan(values)])
+            positions = np.flatnonzero(find_pivots(values, highs=highs))
+            levels = values[positions]
+            touches = count_touches(sorted_values, levels)
+            seqs = (self.first_seq + positions).tolist()
+            side = _ZoneSide(highs, sorted_values.tolist(), sorted(zip(levels.tolist(), seqs)))
+            side.touches = dict(zip(seqs, touches.tolist()))
+            side.pivot_levels = dict(zip(seqs, levels.tolist()))
+            if highs:
+                self.supply = side
+            else:
+                self.demand = side
+        
+        self._ranked = None
+        self.dirty = True
+        self.rebuilds += 1
+
+    def update(self, epoch: np.ndarray, high: np.ndarray, low: np.ndarray):
+        """
+        Bring the book in line with the latest window of bars
+        Apart from one vectorized comparison of the overlapping bars, work is
+        proportional to the bars that were dropped, changed or appended; an
+        unchanged window costs nothing more. Anything that doesn't look like a
+        sliding window (gaps, backfills, reordering) falls back to a full rebuild.
+        """
+        n_old = len(self.epoch)
+        if n_old == 0 or len(epoch) == 0:
+            self.rebuild(epoch, high, low)
+            return
+        
+        dropped = int(np.searchsorted(self.epoch, epoch[0], side="left"))
+        overlap = n_old - dropped
+        if overlap <= 0 or overlap > len(epoch) or not np.array_equal(self.epoch[dropped:], epoch[:overlap]):
+            self.rebuild(epoch, high, low)
+            return
+        
+        old_high = self.high[dropped:]
+        old_low = self.low[dropped:]
+        changed = np.flatnonzero(
+            ~((old_high == high[:overlap]) | (np.isnan(old_high) & np.isnan(high[:overlap])))
+            | ~((old_low == low[:overlap]) | (np.isnan(old_low) & np.isnan(low[:overlap])))
+        )
+        if len(changed) > max(PIVOT_WINDOW, overlap * REBUILD_CHANGE_RATIO):
+            self.rebuild(epoch, high, low)
+            return
+        if not dropped and not len(changed) and overlap == len(epoch):
+            return  # Same bars as last time
+        
+        # 1. Bars that slid out of the front of the window
+        for offset in range(dropped):
+            seq = self.first_seq + offset
+            for side in (self.supply, self.demand):
+                side.remove_value(float(self._side_values(side)[offset]))
+                if seq in side.touches:
+                    side.remove_pivot(seq)
+        
+        # 2. Bars whose values changed (typically the still-forming last candle)
+        for position in changed.tolist():
+            for side, new_values in ((self.supply, high), (self.demand, low)):
+                side.remove_value(float(self._side_values(side)[dropped + position]))
+                side.add_value(float(new_values[position]))
+        
+        # 3. New bars
+        for position in range(overlap, len(epoch)):
+            self.supply.add_value(float(high[position]))
+            self.demand.add_value(float(low[position]))
+        
+        # Slide the buffers: drop from the front, overwrite changed bars, append new ones
+        self.first_seq += dropped
+        self._start += dropped
+        self._high[self._start + changed] = high[changed]
+        self._low[self._start + changed] = low[changed]
+        self._append(epoch[overlap:], high[overlap:], low[overlap:])
+        
+        # 4. Re-check pivots around everything that moved
+        half = PIVOT_WINDOW // 2
+        dirty = set(range(half)) if dropped else set()  # New front bars can't be pivots any more
+        for position in changed.tolist():
+            dirty.update(range(position - half, position + half + 1))
+        dirty.update(range(overlap - half, len(epoch)))
+        
+        for position in sorted(dirty):
+            if position < 0 or position >= len(self.epoch):
+                continue
+            seq = self.first_seq + position
+            for side in (self.supply, self.demand):
+                level = float(self._side_values(side)[position])
+                existing = side.pivot_levels.get(seq)
+                is_pivot = self._is_pivot(side, position)
+                if existing is not None and (not is_pivot or existing != level):
+                    side.remove_pivot(seq)
+                    existing = None
+                if is_pivot and existing is None:
+                    side.add_pivot(seq, level)
+        
+        self.dirty = True
+        self.incremental_updates += 1
+
+    def _side_arrays(self, side: _ZoneSide):
+        """Pivot levels and touches for one side, in bar order"""
+        count = len(side.touches)
+        seqs = np.fromiter(side.touches.keys(), dtype="int64", count=count)
+        touches = np.fromiter(side.touches.values(), dtype="int64", count=count)
+        order = np.argsort(seqs)
+        seqs = seqs[order]
+        return seqs, self._side_values(side)[seqs - self.first_seq], touches[order]
+
+    def zones(self, max_zones: int = MAX_ZONES) -> List[Dict[str, Any]]:
+        """
+        Ranked, de-duplicated zones for the current window
+        Pivots are only re-ranked after a pivot or touch count changed;
+        otherwise the last ranking is handed out again (as fresh copies).
+        """
+        key = (self.supply.changes, self.demand.changes)
+        if self._ranked is None or self._ranked[:2] != (key, max_zones):
+            _, supply_levels, supply_touches = self._side_arrays(self.supply)
+            _, demand_levels, demand_touches = self._side_arrays(self.demand)
+            
+            prices = np.concatenate([supply_levels, demand_levels])
+            touches = np.concatenate([supply_touches, demand_touches])
+            is_supply = np.arange(len(prices)) < len(supply_levels)
+            self._ranked = (key, max_zones, rank_zones(prices, touches, is_supply, max_zones))
+            self.rankings += 1
+        return [dict(zone) for zone in self._ranked[2]]
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        """Snapshot for persistence"""
+        arrays = {
+            "first_seq": np.array(self.first_seq, dtype="int64"),
+            "epoch": self.epoch,
+            "high": self.high,
+            "low": self.low,
+        }
+        for name, side in (("supply", self.supply), ("demand", self.demand)):
+            seqs, _, touches = self._side_arrays(side)
+            arrays[f"{name}_seqs"] = seqs
+            arrays[f"{name}_touches"] = touches
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays) -> "SymbolZones":
+        """Restore a snapshot written by to_arrays()"""
+        book = cls()
+        book.first_seq = int(arrays["first_seq"])
+        book._set_window(arrays["epoch"], arrays["high"], arrays["low"])
+        
+        for name in ("supply", "demand"):
+            highs = name == "supply"
+            values = book.high if highs else book.low
+            seqs = arrays[f"{name}_seqs"].tolist()
+            levels = values[arrays[f"{name}_seqs"] - book.first_seq].tolist()
+            side = _ZoneSide(highs, np.sort(values[~np.isnan(values)]).tolist(), sorted(zip(levels, seqs)))
+            side.touches = dict(zip(seqs, arrays[f"{name}_touches"].tolist()))
+            side.pivot_levels = dict(zip(seqs, levels))
+            setattr(book, name, side)
+        return book
+
+class ZoneBook:
+    """Thread-safe collection of per-symbol zone state, persisted to disk"""
+
+    def __init__(self, directory: Optional[str] = None, persist: bool = True,
+                 save_interval: Optional[float] = None):
+        self.directory = Path(directory or os.getenv("ZONE_BOOK_DIR", "zone_book"))
+        self.persist = persist
+        # Minimum seconds between snapshots of one symbol (0 = whenever it changed); flush() writes the rest
+        if save_interval is None:
+            save_interval = float(os.getenv("ZONE_BOOK_SAVE_SECONDS", "0"))
+        self.save_interval = save_interval
+        self._books: Dict[str, SymbolZones] = {}
+        self._saved_at: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.saves = 0
+        
+        if self.persist:
+            self.directory.mkdir(parents=True, exist_ok=True)
+        logger.info(f"✅ Zone Book initialized ({self.directory if persist else 'in memory'})")
+
+    def _path(self, symbol: str) -> Path:
+        safe_symbol = re.sub(r"[^A-Za-z0-9._-]", "_", symbol)
+        return self.directory / f"{safe_symbol}.npz"
+
+    def _load(self, symbol: str) -> SymbolZones:
+        """Book from disk, or an empty one"""
+        path = self._path(symbol)
+        if self.persist and path.exists():
+            try:
+                with np.load(path, allow_pickle=False) as data:
+                    return SymbolZones.from_arrays(data)
+            except Exception as e:
+                logger.warning(f"⚠️ Could not read zone book {path}: {e}")
+        return SymbolZones()
+
+    def _save(self, symbol: str, book: SymbolZones, force: bool = False):
+        """Atomic snapshot write, skipped when nothing changed or the last one is too recent"""
+        if not self.persist or not book.dirty:
+            return
+        now = time.monotonic()
+        saved_at = self._saved_at.get(symbol)
+        if not force and saved_at is not None and now - saved_at < self.save_interval:
+            return
+        
+        path = self._path(symbol)
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                np.savez(f, **book.to_arrays())
+            os.replace(tmp_path, path)
+            book.dirty = False
+            self._saved_at[symbol] = now
+            self.saves += 1
+        except Exception as e:
+            logger.error(f"❌ Error saving zone book {path}: {e}")
+
+    def flush(self):
+        """Write every book with unsaved changes (e.g. on shutdown)"""
+        with self._lock:
+            for symbol, book in self._books.items():
+                self._save(symbol, book, force=True)
+
+    def update(self, symbol: str, df: Union[Bars, pd.DataFrame]) -> List[Dict[str, Any]]:
+        """Apply the latest bars (frame or Bars) for a symbol and return its zones"""
+        if df is None or df.empty:
+            return []
+        
+        # Naive timestamps are taken as UTC
+        epoch = epoch_ns(df)
+        high = field(df, 'High')
+        low = field(df, 'Low')
+        
+        with self._lock:
+            book = self._books.get(symbol)
+            if book is None:
+                book = self._load(symbol)
+                self._books[symbol] = book
+            
+            if len(epoch) > 1 and not (np.diff(epoch) > 0).all():
+                book.rebuild(epoch, high, low)  # Unsorted/duplicate index: no incremental shortcut
+            else:
+                book.update(epoch, high, low)
+            
+            self._save(symbol, book)
+            return book.zones()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Update counters for monitoring"""
+        with self._lock:
+            return {
+                "symbols": len(self._books),
+                "rebuilds": sum(book.rebuilds for book in self._books.values()),
+                "incremental_updates": sum(book.incremental_updates for book in self._books.values()),
+                "rankings": sum(book.rankings for book in self._books.values()),
+                "saves": self.saves
+            }
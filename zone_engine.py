@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Vectorized Zone Engine
+NumPy implementation of the supply/demand zone search used by ZoneDetector
+- Pivots from a 5-bar centred window (same rule as the rolling-window version)
+- Touches counted with searchsorted on sorted highs/lows instead of a mask per pivot
+- Duplicate zones removed in one pass over the strength-ranked candidates
+"""
+
+import bisect
+from typing import List, Dict, Any
+
+import numpy as np
+
+PIVOT_WINDOW = 5           # Bars in the centred pivot window
+TOUCH_TOLERANCE = 0.002    # A touch is within 0.2% of the pivot level
+DUPLICATE_DISTANCE = 0.001 # Zones within 0.1% of a stronger zone are dropped
+MAX_ZONES = 10             # Strongest zones returned
+
+def find_pivots(values: np.ndarray, highs: bool) -> np.ndarray:
+    """
+    Boolean mask of bars that are the max (highs) / min (lows) of their centred window
+    Works along the last axis, so a [symbol, bar] matrix is handled in one pass.
+    """
+    n = values.shape[-1]
+    mask = np.zeros(values.shape, dtype=bool)
+    if n < PIVOT_WINDOW:
+        return mask
+    
+    # Window extremes from shifted slices (np.maximum/minimum propagate NaN, so any
+    # NaN in a window makes its extreme NaN, which never equals the bar, like pandas rolling)
+    combine = np.maximum if highs else np.minimum
+    width = n - PIVOT_WINDOW + 1
+    extremes = values[..., :width]
+    for offset in range(1, PIVOT_WINDOW):
+        extremes = combine(extremes, values[..., offset:offset + width])
+    half = PIVOT_WINDOW // 2
+    mask[..., half:n - half] = extremes == values[..., half:n - half]
+    return mask
+
+def count_touches(sorted_values: np.ndarray, levels: np.ndarray) -> np.ndarray:
+    """Bars whose value lies within TOUCH_TOLERANCE of each level (inclusive band)"""
+    tolerance = levels * TOUCH_TOLERANCE
+    lower = np.searchsorted(sorted_values, levels - tolerance, side="left")
+    upper = np.searchsorted(sorted_values, levels + tolerance, side="right")
+    return upper - lower
+
+def _is_duplicate(price: float, kept_prices: List[float]) -> bool:
+    """Check a candidate against the nearest kept zones on either side"""
+    position = bisect.bisect_left(kept_prices, price)
+    for neighbour in kept_prices[max(position - 1, 0):position + 1]:
+        if abs(price - neighbour) / neighbour < DUPLICATE_DISTANCE:
+            return True
+    return False
+
+def find_zones_arrays(high: np.ndarray, low: np.ndarray, max_zones: int = MAX_ZONES) -> List[Dict[str, Any]]:
+    """
+    Find supply/demand zones from high/low arrays
+    Supply zones come from pivot highs and demand zones from pivot lows; each is
+    scored by how many bars touched its level. Zones are ranked by strength
+    (ties keep supply-before-demand, then bar order) and near-duplicates of a
+    stronger zone are dropped.
+    """
+    high = np.asarray(high, dtype="float64")
+    low = np.asarray(low, dtype="float64")
+    
+    supply_levels = high[find_pivots(high, highs=True)]
+    demand_levels = low[find_pivots(low, highs=False)]
+    
+    sorted_highs = np.sort(high[~np.isnan(high)])
+    sorted_lows = np.sort(low[~np.isnan(low)])
+    
+    prices = np.concatenate([supply_levels, demand_levels])
+    touches = np.concatenate([
+        count_touches(sorted_highs, supply_levels),
+        count_touches(sorted_lows, demand_levels)
+    ])
+    is_supply = np.arange(len(prices)) < len(supply_levels)
+    
+    return rank_zones(prices, touches, is_supply, max_zones)
+
+def find_zones_panel(high: np.ndarray, low: np.ndarray, max_zones: int = MAX_ZONES) -> List[List[Dict[str, Any]]]:
+    """
+    Zones for many symbols at once from [symbol, bar] high/low matrices
+    Rows should be end-aligned (BarPanel.packed) with NaN padding in front; each
+    row gets the zones find_zones_arrays would return for that symbol's bars.
+    Pivots and sorting run over the whole matrix; touch counts and ranking per row.
+    """
+    high = np.asarray(high, dtype="float64")
+    low = np.asarray(low, dtype="float64")
+    
+    supply_pivots = find_pivots(high, highs=True)
+    demand_pivots = find_pivots(low, highs=False)
+    sorted_highs = np.sort(high, axis=1)  # NaN sorts to the end of each row
+    sorted_lows = np.sort(low, axis=1)
+    high_counts = np.count_nonzero(~np.isnan(high), axis=1)
+    low_counts = np.count_nonzero(~np.isnan(low), axis=1)
+    
+    results = []
+    for s in range(high.shape[0]):
+        supply_levels = high[s][supply_pivots[s]]
+        demand_levels = low[s][demand_pivots[s]]
+        prices = np.concatenate([supply_levels, demand_levels])
+        touches = np.concatenate([
+            count_touches(sorted_highs[s, :high_counts[s]], supply_levels),
+            count_touches(sorted_lows[s, :low_counts[s]], demand_levels)
+        ])
+        is_supply = np.arange(len(prices)) < len(supply_levels)
+        results.append(rank_zones(prices, touches, is_supply, max_zones))
+    return results
+
+def rank_zones(prices: np.ndarray, touches: np.ndarray, is_supply: np.ndarray,
+               max_zones: int = MAX_ZONES) -> List[Dict[str, Any]]:
+    """
+    Rank candidate zones by strength and drop near-duplicates of stronger ones
+    Candidates must be ordered supply pivots first, then demand, each in bar order.
+    """
+    # Stable sort keeps candidate order among equal strengths
+    order = np.argsort(-np.asarray(touches), kind="stable")
+    
+    zones = []
+    kept_prices = []
+    for i in order:
+        if touches[i] < 1:
+            continue
+        price = float(prices[i])
+        if _is_duplicate(price, kept_prices):
+            continue
+        
+        bisect.insort(kept_prices, price)
+        zones.append({
+            'type': 'supply' if is_supply[i] else 'demand',
+            'price': price,
+            'strength': int(touches[i]),
+            'touches': int(touches[i])
+        })
+        if len(zones) >= max_zones:
+            break
+    
+    return zones
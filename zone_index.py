@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Zone Proximity Index
+Sorted per-symbol zone levels with precomputed price trigger bands
+- A zone is "in play" when the price is within ZONE_PROXIMITY of it (same rule as analyze_symbol)
+- Bands are stored as sorted lower/upper price arrays, so a quote is checked with two bisects
+- Symbols whose price is outside every band can skip the full fetch + analysis
+"""
+
+import os
+import time
+import bisect
+import threading
+import logging
+from typing import Optional, List, Dict, Any
+
+logger = logging.getLogger(__name__)
+
+ZONE_PROXIMITY = 0.005  # Price within 0.5% of a zone
+
+# Relative slack on the bisect bounds; candidates are confirmed with the exact rule
+BAND_SLACK = 1e-9
+
+def is_near_zone(price: float, zone_price: float, proximity: float = ZONE_PROXIMITY) -> bool:
+    """The proximity rule: distance relative to the current price"""
+    return abs(price - zone_price) / price < proximity
+
+class SymbolZoneIndex:
+    """Immutable trigger bands for one symbol's zones"""
+
+    def __init__(self, zones: List[Dict[str, Any]], proximity: float = ZONE_PROXIMITY):
+        self.proximity = proximity
+        self.built_at = time.time()
+        
+        # |p - z| / p < proximity  <=>  z / (1 + proximity) < p < z / (1 - proximity)
+        ranked = [(zone['price'], rank, zone) for rank, zone in enumerate(zones) if zone['price'] > 0]
+        ranked.sort(key=lambda item: (item[0], item[1]))
+        self.prices = [price for price, _, _ in ranked]
+        self.ranks = [rank for _, rank, _ in ranked]
+        self.zones = [zone for _, _, zone in ranked]
+        self.lower = [price / (1 + proximity) * (1 - BAND_SLACK) for price in self.prices]
+        self.upper = [price / (1 - proximity) * (1 + BAND_SLACK) for price in self.prices]
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+    def _candidates(self, price: float) -> range:
+        """Positions whose (slightly widened) band contains price"""
+        # Both band edges grow with the zone price, so the hits are one contiguous run
+        first = bisect.bisect_right(self.upper, price)
+        last = bisect.bisect_left(self.lower, price)
+        return range(first, last)
+
+    def in_play(self, price: Optional[float]) -> bool:
+        """True if any zone is within the proximity band of price"""
+        if not price or price <= 0:
+            return False
+        return any(is_near_zone(price, self.prices[i], self.proximity) for i in self._candidates(price))
+
+    def zones_near(self, price: Optional[float]) -> List[Dict[str, Any]]:
+        """Zones within the proximity band of price, in their original (strength) order"""
+        if not price or price <= 0:
+            return []
+        hits = [i for i in self._candidates(price) if is_near_zone(price, self.prices[i], self.proximity)]
+        hits.sort(key=lambda i: self.ranks[i])
+        return [self.zones[i] for i in hits]
+
+    def nearest_distance(self, price: float) -> Optional[float]:
+        """Relative distance from price to the closest zone (for logging)"""
+        if not self.prices or not price:
+            return None
+        position = bisect.bisect_left(self.prices, price)
+        neighbours = self.prices[max(position - 1, 0):position + 1]
+        return min(abs(price - zone_price) / price for zone_price in neighbours)
+
+class ZoneProximityIndex:
+    """Thread-safe per-symbol zone indexes used to decide which symbols need a full analysis"""
+
+    def __init__(self, proximity: float = ZONE_PROXIMITY, max_age: Optional[float] = None):
+        self.proximity = proximity
+        # Zones drift as new bars arrive; after this long the symbol is re-analysed regardless
+        self.max_age = max_age if max_age is not None else float(os.getenv("ZONE_INDEX_MAX_AGE", "3600"))
+        self._indexes: Dict[str, SymbolZoneIndex] = {}
+        self._lock = threading.Lock()
+        
+        self.checks = 0
+        self.triggered = 0
+        self.skipped = 0
+
+    def update(self, symbol: str, zones: List[Dict[str, Any]]) -> SymbolZoneIndex:
+        """Replace a symbol's index after a full analysis"""
+        index = SymbolZoneIndex(zones, self.proximity)
+        with self._lock:
+            self._indexes[symbol] = index
+        return index
+
+    def get(self, symbol: str) -> Optional[SymbolZoneIndex]:
+        with self._lock:
+            return self._indexes.get(symbol)
+
+    def is_stale(self, symbol: str) -> bool:
+        index = self.get(symbol)
+        return index is None or time.time() - index.built_at > self.max_age
+
+    def needs_analysis(self, symbol: str, price: Optional[float]) -> bool:
+        """Full analysis is needed if the index is missing/stale, the price is unknown, or a zone is in play"""
+        index = self.get(symbol)
+        if index is None or time.time() - index.built_at > self.max_age or not price:
+            needed = True
+        else:
+            needed = index.in_play(price)
+        
+        with self._lock:
+            self.checks += 1
+            if needed:
+                self.triggered += 1
+            else:
+                self.skipped += 1
+        return needed
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Trigger counters for monitoring"""
+        with self._lock:
+            return {
+                "symbols": len(self._indexes),
+                "checks": self.checks,
+                "triggered": self.triggered,
+                "skipped": self.skipped,
+                "skip_rate": round(self.skipped / self.checks, 3) if self.checks else 0.0
+            }